@@ -0,0 +1,60 @@
+"""
+Scrapes N pages from the local fixture server sequentially (sync HomePage)
+and concurrently (AsyncHomePage), one headless Chrome per page.
+
+Usage:
+    python -m benchmarks.bench_async [--pages N] [--concurrency C]
+"""
+import argparse
+import asyncio
+import time
+
+from webscraper.fixture_server import serve_directory
+from webscraper.pages.async_homepage import scrape_pages
+from webscraper.pages.homepage import HomePage
+from .common import make_headless_driver
+
+
+def make_pages(drivers, url):
+    pages = []
+    for driver in drivers:
+        page = HomePage(driver)
+        page.url = url
+        pages.append(page)
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=4, help='number of pages (and browsers)')
+    parser.add_argument('--concurrency', type=int, default=4, help='async semaphore size')
+    args = parser.parse_args()
+
+    drivers = [make_headless_driver() for _ in range(args.pages)]
+    try:
+        with serve_directory() as base_url:
+            url = f"{base_url}/temperature.html"
+
+            start = time.perf_counter()
+            for page in make_pages(drivers, url):
+                page.load()
+                page.extract_table_data()
+            sync_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = asyncio.run(scrape_pages(make_pages(drivers, url), concurrency=args.concurrency))
+            async_time = time.perf_counter() - start
+    finally:
+        for driver in drivers:
+            driver.quit()
+
+    errors = [result for result in results if isinstance(result, Exception)]
+    print(f"Pages: {args.pages}, concurrency: {args.concurrency}, errors: {len(errors)}")
+    print(f"{'sync':<8}{sync_time:>10.3f}s")
+    print(f"{'async':<8}{async_time:>10.3f}s")
+    if async_time:
+        print(f"Speedup: {sync_time / async_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Compares the single execute_script extraction against the per-element path.
+
+Usage:
+    python -m benchmarks.bench_extract_table [--repeat N]
+"""
+import argparse
+
+from webscraper.pages.homepage import HomePage
+from .common import CommandCounter, fixture_url, make_headless_driver, measure
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per mode (best time is reported)')
+    args = parser.parse_args()
+
+    driver = make_headless_driver()
+    try:
+        driver.get(fixture_url('temperature.html'))
+        home_page = HomePage(driver)
+        counter = CommandCounter(driver)
+
+        script_rows, script_time, script_commands = measure(
+            counter, lambda: home_page.extract_table_data(use_script=True), args.repeat)
+        element_rows, element_time, element_commands = measure(
+            counter, lambda: home_page.extract_table_data(use_script=False), args.repeat)
+    finally:
+        driver.quit()
+
+    assert script_rows == element_rows, "Script and per-element extraction returned different rows."
+
+    print(f"Rows extracted: {len(script_rows)}")
+    print(f"{'mode':<14}{'commands':>10}{'wall time (s)':>16}")
+    print(f"{'per-element':<14}{element_commands:>10}{element_time:>16.3f}")
+    print(f"{'script':<14}{script_commands:>10}{script_time:>16.3f}")
+    if script_time:
+        print(f"Speedup: {element_time / script_time:.1f}x, "
+              f"{element_commands - script_commands} fewer WebDriver commands")
+
+
+if __name__ == '__main__':
+    main()
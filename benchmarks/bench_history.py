@@ -0,0 +1,70 @@
+"""
+Query latency of the SQLite history store at a million-plus observations.
+
+Builds a synthetic history (every country in REGION_MAP, one scrape every
+few hours) in a temporary database, then times typical queries.
+
+Usage:
+    python -m benchmarks.bench_history [--scrapes N] [--repeat N]
+"""
+import argparse
+from datetime import datetime, timedelta
+import os
+import random
+import tempfile
+import time
+
+from webscraper.constants import REGION_MAP
+from webscraper.history import HistoryStore
+
+
+def synthetic_records(scrapes, start):
+    rnd = random.Random(0)
+    countries = [(country, region) for region, names in REGION_MAP.items() for country in names]
+    for i in range(scrapes):
+        scrape_time = (start + timedelta(hours=4 * i)).isoformat(timespec='seconds')
+        for country, region in countries:
+            last = round(rnd.uniform(-20, 30), 2)
+            yield ('temperature', country, region, scrape_time, last, last - 0.3, 'celsius')
+
+
+def best_of(repeat, fn):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scrapes', type=int, default=5100, help='scrape runs to simulate (x199 countries)')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per query (best time is reported)')
+    args = parser.parse_args()
+
+    start = datetime(2022, 1, 1)
+    end = start + timedelta(hours=4 * args.scrapes)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with HistoryStore(os.path.join(tmp_dir, 'history.sqlite3')) as store:
+            load_start = time.perf_counter()
+            rows = store.write_records(synthetic_records(args.scrapes, start))
+            load_time = time.perf_counter() - load_start
+            print(f"Loaded {rows:,} observations in {load_time:.1f}s ({rows / load_time:,.0f} rows/s)")
+
+            queries = {
+                'EMEA, last 90 days': lambda: store.query(start=end - timedelta(days=90), region='EMEA'),
+                'one country, all time': lambda: store.query(countries=['Germany']),
+                'five countries, last 30 days': lambda: store.query(
+                    start=end - timedelta(days=30),
+                    countries=['Germany', 'Japan', 'Peru', 'Kenya', 'Canada']),
+            }
+            print(f"{'query':<32}{'rows':>10}{'best (ms)':>12}")
+            for name, query in queries.items():
+                elapsed, frame = best_of(args.repeat, query)
+                print(f"{name:<32}{len(frame):>10,}{elapsed * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Offline performance suite for HomePage.
+
+Serves synthetic temperature pages of several sizes from the local fixture
+site and times each HomePage step separately (load, sort clicks,
+extract_table_data, lookup_countries, search_country, export_to_csv),
+counting the WebDriver commands each one sends. Results are written as
+JSON; with --baseline the run fails (exit code 1) if any step got slower
+than the threshold allows or sends more commands than before.
+
+Usage:
+    python -m benchmarks.bench_homepage --rows 200 2000 10000 --output results.json
+    python -m benchmarks.bench_homepage --baseline results.json --threshold 0.25
+"""
+import argparse
+from datetime import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+from webscraper.fixture_server import fixture_page_url, serve_fixture_site
+from webscraper.pages.homepage import HomePage
+from .common import CommandCounter, make_headless_driver
+
+# Differences below this are timer noise, whatever the relative change
+MIN_REGRESSION_SECONDS = 0.005
+
+
+def time_step(counter, fn):
+    counter.reset()
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start, counter.count
+
+
+def run_size(driver, counter, base_url, rows, repeat, output_dir):
+    """Best-of-`repeat` timings and command counts for every step at one table size."""
+    steps = {}
+
+    def record(name, seconds, commands):
+        best = steps.get(name)
+        if best is None or seconds < best['seconds']:
+            steps[name] = {'seconds': seconds, 'commands': commands}
+
+    for _ in range(repeat):
+        home_page = HomePage(driver)
+        home_page.url = fixture_page_url(base_url, rows)
+
+        _, seconds, commands = time_step(counter, home_page.load)
+        record('load', seconds, commands)
+        data, seconds, commands = time_step(counter, home_page.extract_table_data)
+        record('extract_table_data', seconds, commands)
+        _, seconds, commands = time_step(counter, home_page.click_country_header)
+        record('click_country_header', seconds, commands)
+        _, seconds, commands = time_step(counter, home_page.click_last_temperature_header)
+        record('click_last_temperature_header', seconds, commands)
+        countries = [row['Country'] for row in data[:200]] + ["NoCountryHere123"]
+        _, seconds, commands = time_step(counter, lambda: home_page.lookup_countries(countries))
+        record('lookup_countries', seconds, commands)
+        _, seconds, commands = time_step(counter, lambda: home_page.search_country("NoCountryHere123"))
+        record('search_country', seconds, commands)
+
+        filename = os.path.join(output_dir, f"bench_{rows}.csv")
+        _, seconds, commands = time_step(counter, lambda: home_page.export_to_csv(data, filename))
+        record('export_to_csv', seconds, commands)
+
+        assert len(data) == rows, f"Expected {rows} rows, extracted {len(data)}."
+    return steps
+
+
+def find_regressions(results, baseline, threshold):
+    """Returns human-readable regressions of `results` against `baseline`."""
+    regressions = []
+    for rows, steps in results['sizes'].items():
+        for step, current in steps.items():
+            previous = baseline.get('sizes', {}).get(rows, {}).get(step)
+            if previous is None:
+                continue
+            allowed = previous['seconds'] * (1 + threshold)
+            if current['seconds'] > allowed and current['seconds'] - previous['seconds'] > MIN_REGRESSION_SECONDS:
+                regressions.append(f"{step} @ {rows} rows: {current['seconds']:.3f}s vs {previous['seconds']:.3f}s "
+                                   f"(+{(current['seconds'] / previous['seconds'] - 1) * 100:.0f}%)")
+            if current['commands'] > previous['commands']:
+                regressions.append(f"{step} @ {rows} rows: {current['commands']} WebDriver commands "
+                                   f"vs {previous['commands']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[200, 2000, 10000], help='table sizes to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per size (best time is kept)')
+    parser.add_argument('--output', default=None, help='where to write the JSON results')
+    parser.add_argument('--baseline', default=None, help='earlier JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown, e.g. 0.2 = 20%%')
+    args = parser.parse_args()
+
+    results = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': {},
+    }
+    driver = make_headless_driver()
+    counter = CommandCounter(driver)
+    try:
+        with serve_fixture_site() as base_url, tempfile.TemporaryDirectory() as output_dir:
+            for rows in args.rows:
+                results['sizes'][str(rows)] = run_size(driver, counter, base_url, rows, args.repeat, output_dir)
+    finally:
+        driver.quit()
+
+    print(f"{'rows':>8}  {'step':<32}{'seconds':>10}{'commands':>10}")
+    for rows, steps in results['sizes'].items():
+        for step, measurement in steps.items():
+            print(f"{rows:>8}  {step:<32}{measurement['seconds']:>10.3f}{measurement['commands']:>10}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print("REGRESSIONS:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == '__main__':
+    main()
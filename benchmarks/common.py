@@ -0,0 +1,54 @@
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+FIXTURES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'webscraper', 'fixtures'))
+
+
+def fixture_url(name):
+    """Returns a file:// URL for one of the saved pages in webscraper/fixtures."""
+    return 'file://' + os.path.join(FIXTURES_DIR, name)
+
+
+def make_headless_driver():
+    """Starts the same headless Chrome the test suite uses."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless=new")
+    return webdriver.Chrome(options=chrome_options)
+
+
+class CommandCounter:
+    """Counts WebDriver commands sent by a driver (and by its WebElements)."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self._original_execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return self._original_execute(driver_command, params)
+
+        # WebElement calls go through driver.execute as well, so patching the
+        # instance attribute catches every command on the wire.
+        driver.execute = counting_execute
+
+    def reset(self):
+        self.count = 0
+
+
+def measure(counter, fn, repeat=5):
+    """Runs fn `repeat` times; returns (result, best wall time in seconds, commands per run)."""
+    best = None
+    result = None
+    commands = 0
+    for _ in range(repeat):
+        counter.reset()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        commands = counter.count
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best, commands
@@ -1,27 +1,89 @@
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import os
 from datetime import datetime
 import pytest_html
+from webscraper.browser_pool import BrowserPool
+from webscraper.cache import PageCache
+from webscraper.browser_profile import create_scraping_driver
+from webscraper.pages.homepage import HomePage
+from webscraper.replay_proxy import run_proxy
+from webscraper.instrumentation import TRACER, format_summary, instrument_driver, summarize
+from webscraper.watchdog import BrowserWatchdog, ResourceLimits
 
-@pytest.fixture(scope="function")
-def driver(request):
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36")
-    
-    driver = webdriver.Chrome(options=chrome_options)
+def pytest_addoption(parser):
+    parser.addoption("--page-cache-ttl", type=float, default=600,
+                     help="Seconds a cached page snapshot stays valid for the whole run (default: 600).")
+    parser.addoption("--page-cache-size", type=int, default=16,
+                     help="Maximum number of cached (url, state) snapshots (default: 16).")
+    parser.addoption("--no-page-cache", action="store_true",
+                     help="Load and scrape the live page in every test.")
+    parser.addoption("--record-archive", default=None,
+                     help="Record every response the browser receives into this archive directory.")
+    parser.addoption("--replay-archive", default=None,
+                     help="Serve responses from this archive only; unrecorded requests are reported, not fetched.")
+    parser.addoption("--trace-file", default=None,
+                     help="Append every trace span of the run to this JSON-lines file.")
+    parser.addoption("--max-browser-rss-mb", type=float, default=1500,
+                     help="Replace a pooled browser whose processes use more memory than this (default: 1500).")
+    parser.addoption("--max-browser-pages", type=int, default=500,
+                     help="Replace a pooled browser after this many page loads (default: 500).")
+
+def create_driver(proxy=None):
+    """Starts a new headless Chrome session for the browser pool."""
+    # Lean profile and resource blocking tuned for HomePage
+    driver = create_scraping_driver(HomePage, proxy=proxy)
     driver.maximize_window()
+    # Count WebDriver commands per traced step and per test
+    return instrument_driver(driver)
+
+@pytest.fixture(scope="session")
+def network_proxy(request):
+    # Record/replay proxy for the whole run, or None to use the live network directly
+    record = request.config.getoption("--record-archive")
+    replay = request.config.getoption("--replay-archive")
+    if record and replay:
+        raise pytest.UsageError("Use either --record-archive or --replay-archive, not both.")
+    if not (record or replay):
+        yield None
+        return
+    with run_proxy(record or replay, mode='record' if record else 'replay') as proxy:
+        request.config.network_proxy = proxy
+        yield proxy
+
+@pytest.fixture(scope="session")
+def browser_pool(request, network_proxy):
+    # One pool per pytest process; under pytest-xdist every worker gets its own warm drivers
+    proxy = network_proxy.address if network_proxy else None
+    # Sampled after every test; a bloated browser is swapped for a fresh one before the next
+    watchdog = BrowserWatchdog(ResourceLimits(max_rss_mb=request.config.getoption("--max-browser-rss-mb"),
+                                              max_pages=request.config.getoption("--max-browser-pages")))
+    request.config.browser_watchdog = watchdog
+    pool = BrowserPool(lambda: create_driver(proxy), watchdog=watchdog)
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="session")
+def page_cache(request):
+    # Shared by read-only tests so the unsorted table is downloaded and parsed once per run
+    if request.config.getoption("--no-page-cache"):
+        return None
+    return PageCache(ttl=request.config.getoption("--page-cache-ttl"),
+                     max_entries=request.config.getoption("--page-cache-size"))
+
+@pytest.fixture(scope="function")
+def driver(request, browser_pool):
+    driver = browser_pool.lease()
     
     yield driver
     
-    # Teardown: Take screenshot if test failed, then quit driver
+    # Teardown: Take screenshot if test failed, then hand the driver back to the pool
     if request.node.rep_call.failed:
         today_str = datetime.now().strftime("%Y-%m-%d")
         # Ensure output_dir is within the temporary project directory
         # The project's temporary directory is: /Users/anupam/.gemini/tmp/882169829f907d18fa526fa851175a3e0e0a73474be48e0eb0eae7d14b6c9c6b
-        output_dir = os.path.join('/Users/anupam/.gemini/tmp/882169829f907d18fa526fa851175a3e0e0a73474be48e0eb0eae7d14b6c9c6b', today_str)
+        # Parallel workers (run_pytest.py --workers) each get their own directory instead
+        output_dir = os.environ.get("SCRAPER_OUTPUT_DIR") or \
+            os.path.join('/Users/anupam/.gemini/tmp/882169829f907d18fa526fa851175a3e0e0a73474be48e0eb0eae7d14b6c9c6b', today_str)
         os.makedirs(output_dir, exist_ok=True)
         
         test_method_name = request.node.name
@@ -37,7 +99,33 @@ def driver(request):
         except Exception as e:
             print(f"\nCould not take screenshot: {e}")
             
-    driver.quit()
+    # The pool resets the driver (cookies, about:blank, window size) before the next lease
+    resources = browser_pool.release(driver)
+    if resources:
+        for key in ('rss_mb', 'cpu_percent', 'handles', 'pages'):
+            if resources[key] is not None:
+                request.node.user_properties.append((f"browser_{key}", resources[key]))
+        if resources['recycle']:
+            request.node.user_properties.append(("browser_recycled", resources['recycle']))
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    # One root span per test body; HomePage steps nest below it
+    mark = TRACER.mark()
+    with TRACER.span(item.name):
+        yield
+    summary = summarize(TRACER.spans_since(mark))
+    item.trace_summary = summary
+    # user_properties end up as <property> elements in the JUnit XML
+    for key in ('duration', 'wait', 'active'):
+        item.user_properties.append((f"trace_{key}", f"{summary[key]:.3f}"))
+    item.user_properties.append(("trace_commands", summary['commands']))
+    item.user_properties.append(("trace_bytes_written", summary['bytes_written']))
+    # Write spans out after every test, so none fall out of the tracer's bounded buffer
+    trace_file = item.config.getoption("--trace-file")
+    if trace_file and TRACER.enabled:
+        os.makedirs(os.path.dirname(os.path.abspath(trace_file)), exist_ok=True)
+        TRACER.flush_jsonl(trace_file)
 
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -45,4 +133,28 @@ def pytest_runtest_makereport(item, call):
     # We store the call result in the item for access in the fixture teardown
     outcome = yield
     rep = outcome.get_result()
-    setattr(item, "rep_" + rep.when, rep)
\ No newline at end of file
+    setattr(item, "rep_" + rep.when, rep)
+    if rep.when == "call" and getattr(item, "trace_summary", None):
+        rep.sections.append(("timings", format_summary(item.trace_summary)))
+
+def pytest_terminal_summary(terminalreporter, config):
+    watchdog = getattr(config, "browser_watchdog", None)
+    if watchdog is not None and watchdog.reports:
+        peak = max((report['rss_mb'] or 0) for report in watchdog.reports)
+        terminalreporter.write_line(f"Browser watchdog: peak RSS {peak} MB, "
+                                    f"{watchdog.recycled} browser(s) replaced over limits")
+    proxy = getattr(config, "network_proxy", None)
+    if proxy is None:
+        return
+    if proxy.mode == "record":
+        terminalreporter.write_line(f"Recorded {len(proxy.archive)} responses into {proxy.archive.path}")
+    elif proxy.missing:
+        terminalreporter.write_sep("-", f"{len(proxy.missing)} requests not in the replay archive")
+        for key in proxy.missing:
+            terminalreporter.write_line(key)
+
+def pytest_sessionfinish(session):
+    trace_file = session.config.getoption("--trace-file")
+    if trace_file and TRACER.enabled:
+        os.makedirs(os.path.dirname(os.path.abspath(trace_file)), exist_ok=True)
+        TRACER.flush_jsonl(trace_file)
\ No newline at end of file
@@ -1,23 +1,56 @@
 import pytest
+import argparse
+import glob
 import os
 from datetime import datetime
 import sys
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Runs the scraper test suite and writes reports to test_results/<date>.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help='parallel pytest processes, one browser each (default: 1, i.e. serial)')
+    args, extra_pytest_args = parser.parse_known_args()
+
     today = datetime.now().strftime("%Y-%m-%d")
     test_results_dir = os.path.join('test_results', today)
     os.makedirs(test_results_dir, exist_ok=True)
 
     report_path = os.path.join(test_results_dir, 'test_report.html')
+    # Per-test timings and WebDriver command counts end up in the JUnit XML and the trace file
+    junit_path = os.path.join(test_results_dir, 'test_report.xml')
+    trace_path = os.path.join(test_results_dir, 'trace.jsonl')
 
     # We need to add the webscraper directory to the python path
     # so that pytest can find the tests.
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Selenium-webscraper', 'webscraper')))
 
-    pytest_args = [
-        'Selenium-webscraper/webscraper/test_scraper.py',
-        f'--html={report_path}',
-        '--self-contained-html',
-    ]
+    test_path = 'Selenium-webscraper/webscraper/test_scraper.py'
+
+    if args.workers <= 1:
+        pytest_args = [
+            test_path,
+            f'--html={report_path}',
+            '--self-contained-html',
+            f'--junitxml={junit_path}',
+            f'--trace-file={trace_path}',
+            *extra_pytest_args,
+        ]
+
+        pytest.main(pytest_args)
+    else:
+        from webscraper.generate_html_report import generate_html_report
+        from webscraper.sharding import collect_tests, load_durations, merge_worker_outputs, run_shards, shard_tests
+
+        # Workers run from the repository root (where conftest.py is), whatever the current directory
+        rootdir = os.path.dirname(os.path.abspath(__file__))
+        worker_test_path = os.path.join(rootdir, 'webscraper', 'test_scraper.py')
+
+        # Balance shards with the durations of earlier runs
+        durations = load_durations(glob.glob(os.path.join('test_results', '*', 'test_report.xml')))
+        shards = shard_tests(collect_tests([worker_test_path], rootdir=rootdir), args.workers, durations)
+        exit_codes = run_shards(shards, test_results_dir, extra_pytest_args, rootdir=rootdir)
 
-    pytest.main(pytest_args)
\ No newline at end of file
+        merged_junit = merge_worker_outputs(test_results_dir, list(exit_codes))
+        if merged_junit:
+            generate_html_report([merged_junit], report_path)
+        sys.exit(max(exit_codes.values(), default=0))
@@ -0,0 +1,255 @@
+"""
+Pluggable extraction backends for the country-list tables (temperature by default).
+
+The table is server-rendered, so a plain HTTP fetch plus an HTML parser can
+read it without starting Chrome. The Selenium backend (HomePage) is only
+needed when the table is missing from the raw HTML or when a JS-only
+interaction such as sorting or searching is requested.
+
+Backends take an optional `timeout` (seconds for the whole call) and stop
+working once it has passed, so a caller that gives up on a slow page also
+frees the connection or browser it was using.
+"""
+from html.parser import HTMLParser
+import time
+import urllib.request
+
+from .constants import USER_AGENT, indicator_label
+
+# Same table the HomePage.TABLE_BODY_ROWS locator targets
+TABLE_CLASS = "table table-hover table-striped table-heatmap"
+
+
+class BackendUnavailable(Exception):
+    """Raised when a backend cannot answer a request and the next one should be tried."""
+
+
+class TemperatureTableParser(HTMLParser):
+    """Collects the <h1> text and the data rows of a country-list table from raw HTML."""
+
+    def __init__(self, value_label='Temperature'):
+        super().__init__(convert_charrefs=True)
+        self.value_label = value_label
+        self.header_text = None
+        self.table_found = False
+        self.rows = []
+        self._in_h1 = False
+        self._h1_parts = []
+        self._table_depth = 0   # >0 while inside the target table (counts nested tables)
+        self._in_tbody = False
+        self._row = None        # list of cell texts for the current <tr>
+        self._cell = None       # text parts of the current <td>
+        self._link = None       # text parts of the first <a> in the first <td>
+        self._in_link = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'h1' and self.header_text is None:
+            self._in_h1 = True
+            return
+
+        if tag == 'table':
+            if self._table_depth:
+                self._table_depth += 1
+            elif dict(attrs).get('class') == TABLE_CLASS and not self.table_found:
+                self.table_found = True
+                self._table_depth = 1
+            return
+
+        # Only rows of the target table itself, not of nested tables
+        if self._table_depth != 1:
+            return
+        if tag == 'tbody':
+            self._in_tbody = True
+        elif tag == 'tr' and self._in_tbody:
+            self._row = []
+            self._link = None
+        elif tag == 'td' and self._row is not None:
+            self._cell = []
+        elif tag == 'a' and self._cell is not None and not self._row and self._link is None:
+            self._link = []
+            self._in_link = True
+
+    def handle_endtag(self, tag):
+        if tag == 'h1' and self._in_h1:
+            self._in_h1 = False
+            self.header_text = _clean(''.join(self._h1_parts))
+            return
+
+        if tag == 'table' and self._table_depth:
+            self._table_depth -= 1
+            return
+
+        if self._table_depth != 1:
+            return
+        if tag == 'tbody':
+            self._in_tbody = False
+        elif tag == 'a':
+            self._in_link = False
+        elif tag == 'td' and self._cell is not None:
+            self._row.append(_clean(''.join(self._cell)))
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            self._finish_row()
+
+    def handle_data(self, data):
+        if self._in_h1:
+            self._h1_parts.append(data)
+        if self._cell is not None:
+            self._cell.append(data)
+            if self._in_link:
+                self._link.append(data)
+
+    def _finish_row(self):
+        # Same rules as HomePage.extract_table_data: at least 5 cells and a country link
+        cols, link = self._row, self._link
+        self._row = None
+        self._link = None
+        if len(cols) < 5 or link is None:
+            return
+        self.rows.append({
+            'Country': _clean(''.join(link)),
+            f'Last_{self.value_label}': cols[1],
+            f'Previous_{self.value_label}': cols[2],
+            'Unit': cols[4]
+        })
+
+
+def _clean(text):
+    """Collapses whitespace the way WebElement.text does."""
+    return ' '.join(text.split())
+
+
+def parse_temperature_table(html, value_label='Temperature'):
+    """Parses raw page HTML; returns the list of row dicts, or None if the table is missing."""
+    parser = TemperatureTableParser(value_label)
+    parser.feed(html)
+    parser.close()
+    return parser.rows if parser.table_found else None
+
+
+def fetch_html(url, timeout=10):
+    """Downloads a page with the same user agent the browser uses."""
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or 'utf-8'
+        return response.read().decode(charset, errors='replace')
+
+
+class HttpBackend:
+    """Fetches the page over plain HTTP and parses the table from the raw HTML."""
+
+    name = 'http'
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+
+    def extract(self, url, sort=None, search=None, indicator='temperature', timeout=None):
+        if sort or search:
+            raise BackendUnavailable("sorting and search need a browser")
+        try:
+            html = fetch_html(url, timeout=self.timeout if timeout is None else min(self.timeout, timeout))
+        except OSError as e:
+            raise BackendUnavailable(f"could not fetch {url}: {e}")
+        rows = parse_temperature_table(html, indicator_label(indicator))
+        if not rows:
+            raise BackendUnavailable("table not found in server-rendered HTML")
+        return rows
+
+
+class SeleniumBackend:
+    """
+    Drives HomePage in a real browser; handles sorting and search.
+
+    Uses a fixed `driver`, leases one from a BrowserPool `pool`, or starts
+    (and quits) a fresh one from `driver_factory` for every call.
+    """
+
+    name = 'selenium'
+
+    def __init__(self, driver=None, driver_factory=None, pool=None, tracer=None, lease_timeout=None):
+        if driver is None and driver_factory is None and pool is None:
+            raise ValueError("SeleniumBackend needs a driver, a driver_factory or a pool.")
+        self.driver = driver
+        self.driver_factory = driver_factory
+        self.pool = pool
+        # Tracer for the HomePage steps (default: the global TRACER)
+        self.tracer = tracer
+        # Seconds to wait for a pooled driver when the call itself has no timeout
+        self.lease_timeout = lease_timeout
+        # Watchdog report of the pooled driver after the last call (None without a watchdog)
+        self.resources = None
+
+    def extract(self, url, sort=None, search=None, indicator='temperature', timeout=None):
+        if self.driver is not None:
+            return self._extract(self.driver, url, sort, search, indicator, timeout)
+        if self.pool is not None:
+            try:
+                driver = self.pool.lease(self.lease_timeout if timeout is None else timeout)
+            except TimeoutError as e:
+                # All local browsers are busy: nothing the host did, so not a host failure
+                raise BackendUnavailable(str(e))
+            try:
+                return self._extract(driver, url, sort, search, indicator, timeout)
+            finally:
+                self.resources = self.pool.release(driver)
+        driver = self.driver_factory()
+        try:
+            return self._extract(driver, url, sort, search, indicator, timeout)
+        finally:
+            driver.quit()
+
+    def _extract(self, driver, url, sort, search, indicator, timeout=None):
+        # Imported here so the HTTP path never pays for selenium/pandas imports
+        from selenium.common.exceptions import WebDriverException
+        from .pages.homepage import HomePage
+
+        home_page = HomePage(driver, indicator=indicator, tracer=self.tracer)
+        home_page.url = url
+        previous_timeouts = None
+        if timeout is not None:
+            # Page loads and scripts are stopped by the browser, explicit waits by HomePage
+            home_page.deadline = time.monotonic() + timeout
+            previous_timeouts = driver.timeouts
+            driver.set_page_load_timeout(timeout)
+            driver.set_script_timeout(timeout)
+        try:
+            home_page.load()
+            if sort == 'country':
+                home_page.click_country_header()
+            elif sort == 'last':
+                home_page.click_last_temperature_header()
+            elif sort is not None:
+                raise ValueError(f"Unknown sort column: {sort!r}")
+            if search:
+                home_page.search_country(search)
+            return home_page.extract_table_data()
+        finally:
+            if previous_timeouts is not None:
+                # Pooled drivers go back with the timeouts they came with
+                try:
+                    driver.timeouts = previous_timeouts
+                except WebDriverException:
+                    pass
+
+
+def scrape_table(url, backends, sort=None, search=None, indicator='temperature', timeout=None):
+    """
+    Tries each backend in order and returns (rows, backend_name) from the first
+    one that can answer. Raises BackendUnavailable if none of them can.
+    `timeout` covers all backends together; each gets the time that is left.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    reasons = []
+    for backend in backends:
+        kwargs = {}
+        if deadline is not None:
+            kwargs['timeout'] = deadline - time.monotonic()
+            if kwargs['timeout'] <= 0:
+                reasons.append(f"{backend.name}: no time left after {timeout}s")
+                break
+        try:
+            return backend.extract(url, sort=sort, search=search, indicator=indicator, **kwargs), backend.name
+        except BackendUnavailable as e:
+            print(f"Backend '{backend.name}' skipped: {e}")
+            reasons.append(f"{backend.name}: {e}")
+    raise BackendUnavailable("no backend could extract the table (" + "; ".join(reasons) + ")")
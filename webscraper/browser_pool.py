@@ -0,0 +1,162 @@
+"""
+Pool of warm WebDriver sessions that are reused across tests or jobs.
+
+Starting Chrome is the most expensive thing a test does, so drivers are kept
+alive and handed out again after a reset (cookies and storage cleared,
+about:blank, original window size). A driver that crashed or fails its
+health check is quit and replaced with a fresh one. With a BrowserWatchdog
+(see watchdog.py) every release also samples the browser's processes, and a
+driver over its memory, handle or page limits is replaced the same way.
+"""
+from contextlib import contextmanager
+import os
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+
+def worker_id():
+    """Name of the current test worker: set by run_pytest.py shards or pytest-xdist, else 'main'."""
+    return os.environ.get('SCRAPER_WORKER') or os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+
+def is_healthy(driver):
+    """Returns True if the browser still answers a trivial script."""
+    try:
+        return driver.execute_script("return 1;") == 1
+    except Exception:
+        return False
+
+
+def reset_driver(driver, window_size=None):
+    """Brings a used driver back to a clean state for the next lease."""
+    # Keep only the first window/tab
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+
+    # Storage is per origin, so clear it while we are still on the last page
+    driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+
+    # Chrome can clear cookies for every domain at once; other browsers only the current one
+    try:
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    except (AttributeError, WebDriverException):
+        driver.delete_all_cookies()
+
+    driver.get('about:blank')
+    if window_size:
+        driver.set_window_size(window_size['width'], window_size['height'])
+
+
+class BrowserPool:
+    """Thread-safe pool of at most `max_size` drivers created by `driver_factory`."""
+
+    def __init__(self, driver_factory, max_size=1, watchdog=None):
+        self.driver_factory = driver_factory
+        self.max_size = max_size
+        self.watchdog = watchdog
+        self.worker = worker_id()
+        self.created = 0
+        self.recycled = 0
+        self._idle = []
+        self._in_use = 0
+        self._closed = False
+        self._window_sizes = {}
+        self._condition = threading.Condition()
+
+    def _create(self):
+        driver = self.driver_factory()
+        self.created += 1
+        if self.watchdog is not None:
+            self.watchdog.watch(driver)
+        try:
+            self._window_sizes[id(driver)] = driver.get_window_size()
+        except WebDriverException:
+            self._window_sizes[id(driver)] = None
+        return driver
+
+    def _discard(self, driver):
+        self._window_sizes.pop(id(driver), None)
+        if self.watchdog is not None:
+            self.watchdog.forget(driver)
+        self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def lease(self, timeout=None):
+        """Hands out a healthy driver, waiting if all `max_size` drivers are in use."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed.")
+            while not self._idle and self._in_use >= self.max_size:
+                if not self._condition.wait(timeout):
+                    raise TimeoutError(f"No driver became available in worker '{self.worker}'.")
+            driver = self._idle.pop() if self._idle else None
+            # Reserve the slot before doing slow work outside the lock
+            self._in_use += 1
+
+        try:
+            if driver is not None and not is_healthy(driver):
+                print(f"[{self.worker}] Recycling unhealthy driver.")
+                self._discard(driver)
+                driver = None
+            if driver is None:
+                driver = self._create()
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        return driver
+
+    def release(self, driver, recycle=False):
+        """
+        Returns a driver to the pool after resetting it; broken drivers are replaced later.
+        Returns the watchdog's resource report for the driver, or None without a watchdog.
+        """
+        report = None
+        if self.watchdog is not None and not recycle and not self._closed:
+            report = self.watchdog.check(driver)
+            if report['recycle']:
+                print(f"[{self.worker}] Recycling driver: {report['recycle']}.")
+                recycle = True
+
+        if not recycle and not self._closed:
+            try:
+                reset_driver(driver, self._window_sizes.get(id(driver)))
+            except Exception as e:
+                print(f"[{self.worker}] Could not reset driver, recycling it: {e}")
+                recycle = True
+
+        with self._condition:
+            self._in_use -= 1
+            keep = not recycle and not self._closed
+            if keep:
+                self._idle.append(driver)
+            self._condition.notify()
+
+        if not keep:
+            self._discard(driver)
+        return report
+
+    @contextmanager
+    def leased(self, timeout=None):
+        """Context manager form of lease()/release()."""
+        driver = self.lease(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quits every idle driver. Leased drivers are quit when they are released afterwards."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._closed = True
+        for driver in idle:
+            self._discard(driver)
@@ -0,0 +1,186 @@
+"""
+Lean Chrome profile for scraping sessions.
+
+Page objects declare what they need through three class attributes:
+
+    BLOCKED_URL_PATTERNS   - URL patterns never worth downloading (ads, analytics, charts)
+    BLOCKED_RESOURCE_TYPES - whole resource types to drop, e.g. ('image', 'font', 'media')
+    ALLOWED_URL_PATTERNS   - URLs that must keep working even if a deny rule would match
+
+Patterns use Chrome's '*' wildcard. Write host-scoped deny rules
+('*://*doubleclick.net/*'): a rule that could match an allowlisted URL is
+dropped, and a rule without a host (e.g. '*charts*') applies to the whole
+URL, so it usually overlaps a first-party pattern such as '*.js*'. Resource
+types are matched by file extension and always apply, allowlist or not: the
+allowlist keeps the page and its scripts working, not its images or fonts.
+
+Blocking goes through Chrome's DevTools protocol (Network.setBlockedURLs) and
+the page-load strategy is 'eager', so driver.get() returns at DOMContentLoaded
+instead of waiting for every subresource.
+"""
+from fnmatch import fnmatchcase
+from functools import lru_cache
+import json
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+from .constants import USER_AGENT
+
+# Network.setBlockedURLs only understands URL patterns, so resource types are
+# expressed as the file extensions that carry them.
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*', '*.avif*'],
+    'font': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*'],
+    'stylesheet': ['*.css*'],
+}
+
+
+def globs_overlap(first, second):
+    """True if some string matches both wildcard patterns ('*' any run, '?' one character)."""
+    @lru_cache(maxsize=None)
+    def overlap(i, j):
+        if i == len(first) and j == len(second):
+            return True
+        if i < len(first) and first[i] == '*':
+            # The star matches nothing, or swallows one more character of the other pattern
+            if overlap(i + 1, j) or (j < len(second) and overlap(i, j + 1)):
+                return True
+        if j < len(second) and second[j] == '*':
+            if overlap(i, j + 1) or (i < len(first) and overlap(i + 1, j)):
+                return True
+        if i < len(first) and j < len(second) and '*' not in (first[i], second[j]):
+            if first[i] == second[j] or '?' in (first[i], second[j]):
+                return overlap(i + 1, j + 1)
+        return False
+
+    return overlap(0, 0)
+
+
+def _host_and_path(pattern):
+    """Splits a 'scheme://host/path' pattern into host and path globs; the scheme is ignored."""
+    host, slash, path = pattern.split('://', 1)[1].partition('/')
+    return host, (slash + path) if slash else '*'
+
+
+def url_patterns_overlap(deny, allow):
+    """
+    True if a URL could match both patterns. Patterns with a scheme are compared host
+    against host and path against path; anything else is matched against the whole URL.
+    """
+    if '://' not in deny or '://' not in allow:
+        return globs_overlap(deny, allow)
+    deny_host, deny_path = _host_and_path(deny)
+    allow_host, allow_path = _host_and_path(allow)
+    return globs_overlap(deny_host, allow_host) and globs_overlap(deny_path, allow_path)
+
+
+def blocked_url_patterns(page_cls):
+    """
+    Effective blocklist for a page object: its deny patterns minus any that could
+    match one of its allowlisted URLs (Chrome's blocklist has no exceptions, so
+    they are resolved here), plus the patterns for its blocked resource types.
+    """
+    allowed = getattr(page_cls, 'ALLOWED_URL_PATTERNS', ())
+    patterns = []
+    for pattern in getattr(page_cls, 'BLOCKED_URL_PATTERNS', ()):
+        if any(url_patterns_overlap(pattern, allow) for allow in allowed):
+            print(f"Not blocking '{pattern}': it overlaps the allowlist of {page_cls.__name__}.")
+        else:
+            patterns.append(pattern)
+    for resource_type in getattr(page_cls, 'BLOCKED_RESOURCE_TYPES', ()):
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, ()))
+    return list(dict.fromkeys(patterns))
+
+
+def apply_scraping_profile(chrome_options, page_cls):
+    """Adds the eager load strategy and the DevTools logging the blocking report needs."""
+    chrome_options.page_load_strategy = 'eager'
+    if 'image' in getattr(page_cls, 'BLOCKED_RESOURCE_TYPES', ()):
+        # Also stops images that are inlined or served without an extension
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def apply_resource_blocking(driver, page_cls):
+    """Installs the page object's blocklist on a running Chrome session; returns the patterns used."""
+    patterns = blocked_url_patterns(page_cls)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except (AttributeError, WebDriverException) as e:
+        print(f"Resource blocking not available for this browser: {e}")
+        return []
+    return patterns
+
+
+def create_scraping_driver(page_cls, headless=True, proxy=None):
+    """
+    Starts Chrome with the user agent, lean profile and blocklist used for scraping `page_cls`.
+    `proxy` ('host:port') routes all traffic through e.g. the record/replay proxy, whose
+    self-signed HTTPS certificate Chrome is told to accept.
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    if proxy:
+        chrome_options.add_argument(f"--proxy-server=http://{proxy}")
+        chrome_options.add_argument("--ignore-certificate-errors")
+    # Eager page loads and DevTools logging for the blocked-request report
+    apply_scraping_profile(chrome_options, page_cls)
+
+    driver = webdriver.Chrome(options=chrome_options)
+    # Skip ads, analytics, fonts and images the page object never reads
+    apply_resource_blocking(driver, page_cls)
+    return driver
+
+
+def summarize_network_events(events, allowed_url_patterns=()):
+    """
+    Counts requests, blocked requests (by resource type) and bytes transferred
+    from DevTools Network events. Blocked requests never reach the network, so
+    there are no bytes to count for them; bytes_loaded is what the page still
+    downloaded.
+    """
+    requests = {}
+    report = {
+        'requests': 0,
+        'blocked_requests': 0,
+        'blocked_by_type': {},
+        'bytes_loaded': 0,
+        'blocked_allowed_urls': [],
+    }
+    for event in events:
+        method, params = event.get('method'), event.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            report['requests'] += 1
+            requests[params.get('requestId')] = params.get('request', {}).get('url', '')
+        elif method == 'Network.loadingFinished':
+            report['bytes_loaded'] += int(params.get('encodedDataLength') or 0)
+        elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+            report['blocked_requests'] += 1
+            resource_type = params.get('type', 'Other')
+            report['blocked_by_type'][resource_type] = report['blocked_by_type'].get(resource_type, 0) + 1
+            url = requests.get(params.get('requestId'), '')
+            if any(fnmatchcase(url, pattern) for pattern in allowed_url_patterns):
+                report['blocked_allowed_urls'].append(url)
+    return report
+
+
+def collect_network_report(driver, page_cls):
+    """Drains Chrome's performance log and summarizes it; None if the log is not enabled."""
+    try:
+        entries = driver.get_log('performance')
+    except (AttributeError, WebDriverException):
+        return None
+    events = []
+    for entry in entries:
+        try:
+            events.append(json.loads(entry['message'])['message'])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return summarize_network_events(events, getattr(page_cls, 'ALLOWED_URL_PATTERNS', ()))
@@ -0,0 +1,74 @@
+"""
+Run-level cache of page snapshots and scraped rows.
+
+Entries are keyed by (url, state), where state is the tuple of interactions
+applied after load(), e.g. () for the unsorted table or ('sort:country',)
+after one click on the Country header. Each entry holds the DOM snapshot
+(page source) and the parsed rows, expires after `ttl` seconds and the least
+recently used entry is evicted once `max_entries` is reached.
+"""
+from collections import OrderedDict
+import threading
+import time
+
+
+class CacheEntry:
+    """A DOM snapshot and the rows parsed from it."""
+
+    __slots__ = ('snapshot', 'rows', 'created_at')
+
+    def __init__(self, snapshot, rows, created_at):
+        self.snapshot = snapshot
+        self.rows = rows
+        self.created_at = created_at
+
+
+class PageCache:
+    """Thread-safe TTL + LRU cache shared by every HomePage in a run."""
+
+    def __init__(self, ttl=600, max_entries=16, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url, state=()):
+        """Returns the live CacheEntry for (url, state), or None."""
+        key = (url, tuple(state))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry.created_at > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, url, state, snapshot, rows):
+        """Stores a snapshot and its rows, evicting the least recently used entries if full."""
+        key = (url, tuple(state))
+        with self._lock:
+            self._entries[key] = CacheEntry(snapshot, [dict(row) for row in rows], self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, url=None, state=None):
+        """Drops one (url, state) entry, every state of `url`, or everything when url is None."""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            elif state is not None:
+                self._entries.pop((url, tuple(state)), None)
+            else:
+                for key in [key for key in self._entries if key[0] == url]:
+                    del self._entries[key]
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,3 +1,6 @@
+import re
+import unicodedata
+
 REGION_MAP = {
     'Americas': [
         'Aruba', 'St Kitts and Nevis', 'Cayman Islands', 'Antigua and Barbuda', 'Samoa', 'American Samoa', 'St Lucia', 'Virgin Islands',
@@ -27,3 +30,97 @@ REGION_MAP = {
         'Azerbaijan', 'South Korea', 'Japan', 'New Zealand', 'Bhutan', 'Georgia', 'China', 'North Korea', 'Mongolia', 'Iceland'
     ]
 }
+
+# Desktop Chrome user agent shared by the Selenium driver and the HTTP backend
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.0.0 Safari/537.36"
+
+# Every country-list indicator page shares the temperature table's layout
+COUNTRY_LIST_URL = "https://tradingeconomics.com/country-list/{indicator}"
+
+
+def indicator_label(indicator):
+    """Column label for an indicator slug, e.g. 'temperature' -> 'Temperature', 'inflation-rate' -> 'Inflation_Rate'."""
+    return '_'.join(word.capitalize() for word in indicator.replace('_', '-').split('-'))
+
+
+# Other spellings of countries in REGION_MAP, mapped to the REGION_MAP name
+COUNTRY_ALIASES = {
+    "Côte d'Ivoire": 'Ivory Coast',
+    'Cabo Verde': 'Cape Verde',
+    'Eswatini': 'Swaziland',
+    'North Macedonia': 'Macedonia',
+    'Republic of Congo': 'Republic of the Congo',
+    'Congo, Rep.': 'Republic of the Congo',
+    'Democratic Republic of the Congo': 'Congo',
+    'Congo, Dem. Rep.': 'Congo',
+    'DR Congo': 'Congo',
+    'Saint Kitts and Nevis': 'St Kitts and Nevis',
+    'Saint Lucia': 'St Lucia',
+    'Saint Vincent and the Grenadines': 'St Vincent and the Grenadines',
+    'US Virgin Islands': 'Virgin Islands',
+    'The Bahamas': 'Bahamas',
+    'The Gambia': 'Gambia',
+    'USA': 'United States',
+    'United States of America': 'United States',
+    'UK': 'United Kingdom',
+    'Great Britain': 'United Kingdom',
+    'Russian Federation': 'Russia',
+    'Türkiye': 'Turkey',
+    'Syrian Arab Republic': 'Syria',
+    'Iran, Islamic Rep.': 'Iran',
+    'Moldova, Republic of': 'Moldova',
+    'Palestinian Territories': 'Palestine',
+    'State of Palestine': 'Palestine',
+    'Korea, Republic of': 'South Korea',
+    'Republic of Korea': 'South Korea',
+    "Korea, Dem. People's Rep.": 'North Korea',
+    'Viet Nam': 'Vietnam',
+    'Lao PDR': 'Laos',
+    'Burma': 'Myanmar',
+    'Macao': 'Macau',
+    'Hong Kong SAR': 'Hong Kong',
+    'Micronesia, Fed. Sts.': 'Micronesia',
+    'Federated States of Micronesia': 'Micronesia',
+    'Kyrgyz Republic': 'Kyrgyzstan',
+    'Slovak Republic': 'Slovakia',
+    'Bosnia & Herzegovina': 'Bosnia and Herzegovina',
+    'Trinidad & Tobago': 'Trinidad and Tobago',
+    'Antigua & Barbuda': 'Antigua and Barbuda',
+}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_country_name(name):
+    """Lookup key for a country name: accents, case, punctuation and extra whitespace removed."""
+    ascii_name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    words = _NON_ALNUM.sub(' ', ascii_name.casefold().replace('&', ' and ')).split()
+    return ' '.join('st' if word == 'saint' else word for word in words)
+
+
+def _build_country_index():
+    index = {}
+    for region, countries in REGION_MAP.items():
+        for country in countries:
+            index[normalize_country_name(country)] = region
+    for alias, country in COUNTRY_ALIASES.items():
+        index.setdefault(normalize_country_name(alias), index[normalize_country_name(country)])
+    return index
+
+
+# Normalized country name (or alias) -> region, built once at import
+COUNTRY_TO_REGION = _build_country_index()
+# Normalized alias -> normalized REGION_MAP name, e.g. 'usa' -> 'united states'
+COUNTRY_ALIAS_KEYS = {normalize_country_name(alias): normalize_country_name(country)
+                      for alias, country in COUNTRY_ALIASES.items()}
+
+
+def country_lookup_key(name):
+    """Key that matches a country across spellings: normalized, with known aliases resolved."""
+    key = normalize_country_name(name)
+    return COUNTRY_ALIAS_KEYS.get(key, key)
+
+
+def region_for_country(name):
+    """Region of a scraped country name, or None if it is not in REGION_MAP."""
+    return COUNTRY_TO_REGION.get(normalize_country_name(name))
@@ -0,0 +1,158 @@
+"""
+Crawls many country-list indicators concurrently and merges the tables.
+
+Each indicator is one job. Jobs run on a bounded thread pool, at most
+`per_host_limit` of them talk to the same host at once, and every job tries
+the given backends in order (HTTP first, browser as fallback). A job that
+fails or runs past `job_timeout` is reported and skipped; it never holds up
+the rest of the batch. The timeout is passed down to the backends, which
+stop the fetch or browser work, so a stuck job also gives back its host slot.
+
+Usage:
+    result = crawl_indicators(['temperature', 'gdp', 'inflation-rate'],
+                              backends=[HttpBackend(), SeleniumBackend(pool=pool)])
+    result.data[('gdp', 'Germany')]   # {'Indicator': 'gdp', 'Country': 'Germany', 'Last': ..., ...}
+    result.print_report()
+"""
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import threading
+import time
+from urllib.parse import urlparse
+
+from .backends import HttpBackend, scrape_table
+from .constants import COUNTRY_LIST_URL, indicator_label
+
+
+class CrawlJob:
+    """Outcome and timing of one indicator."""
+
+    def __init__(self, indicator, url):
+        self.indicator = indicator
+        self.url = url
+        self.status = 'pending'   # pending | running | ok | failed | timeout
+        self.backend = None
+        self.rows = []
+        self.error = None
+        self.started_at = None
+        self.seconds = None
+
+    def as_dict(self):
+        return {
+            'indicator': self.indicator,
+            'status': self.status,
+            'backend': self.backend,
+            'rows': len(self.rows),
+            'seconds': self.seconds,
+            'error': self.error,
+        }
+
+
+class CrawlResult:
+    """Merged rows keyed by (indicator, country), plus per-job timings."""
+
+    def __init__(self, jobs, seconds):
+        self.jobs = jobs
+        self.seconds = seconds
+        self.data = {}
+        for job in jobs:
+            if job.status != 'ok':
+                continue
+            label = indicator_label(job.indicator)
+            for row in job.rows:
+                self.data[(job.indicator, row['Country'])] = {
+                    'Indicator': job.indicator,
+                    'Country': row['Country'],
+                    'Last': row[f'Last_{label}'],
+                    'Previous': row[f'Previous_{label}'],
+                    'Unit': row['Unit'],
+                }
+
+    @property
+    def failed(self):
+        return [job for job in self.jobs if job.status != 'ok']
+
+    def timings(self):
+        return [job.as_dict() for job in self.jobs]
+
+    def to_dataframe(self):
+        """Merged dataset as a DataFrame indexed by (Indicator, Country)."""
+        import pandas as pd
+
+        columns = ['Indicator', 'Country', 'Last', 'Previous', 'Unit']
+        return pd.DataFrame(list(self.data.values()), columns=columns).set_index(['Indicator', 'Country'])
+
+    def print_report(self):
+        print(f"Crawled {len(self.jobs)} indicators in {self.seconds:.2f}s, {len(self.data)} rows merged.")
+        for job in self.jobs:
+            seconds = f"{job.seconds:.2f}s" if job.seconds is not None else '-'
+            detail = f" ({job.error})" if job.error else ''
+            print(f"  {job.indicator:<30}{job.status:<9}{job.backend or '-':<10}{len(job.rows):>6} rows {seconds:>8}{detail}")
+
+
+def crawl_indicators(indicators, backends=None, max_workers=4, per_host_limit=2,
+                     job_timeout=60, url_template=COUNTRY_LIST_URL, scheduler=None):
+    """
+    Scrapes every indicator with bounded concurrency and returns a CrawlResult.
+    With a RequestScheduler, its per-host rate limit, adaptive concurrency,
+    retries and circuit breaker replace the fixed `per_host_limit`.
+    """
+    backends = backends if backends is not None else [HttpBackend()]
+    jobs = [CrawlJob(indicator, url_template.format(indicator=indicator)) for indicator in indicators]
+
+    host_slots = {}
+    host_slots_lock = threading.Lock()
+
+    def host_slot(url):
+        host = urlparse(url).netloc
+        with host_slots_lock:
+            if host not in host_slots:
+                host_slots[host] = threading.BoundedSemaphore(per_host_limit)
+            return host_slots[host]
+
+    def attempt(job):
+        # The timeout clock starts when the request really goes out, not while queued
+        job.status = 'running'
+        job.started_at = time.perf_counter()
+        return scrape_table(job.url, backends, indicator=job.indicator, timeout=job_timeout)
+
+    def run(job):
+        if scheduler is not None:
+            # The attempt also gets the job timeout, so a hung request cannot hold the host's slot.
+            # BackendUnavailable (a 404 or no table for this indicator) is not retried and is
+            # no verdict on the host, so a bad slug does not trip the breaker for everyone else.
+            return scheduler.run(job.url, attempt, job, timeout=job_timeout)
+        with host_slot(job.url):
+            return attempt(job)
+
+    start = time.perf_counter()
+    # Not a `with` block: shutting down must not wait for jobs that timed out
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='crawler')
+    futures = {executor.submit(run, job): job for job in jobs}
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            now = time.perf_counter()
+            for future in done:
+                job = futures[future]
+                job.seconds = now - (job.started_at or now)
+                try:
+                    job.rows, job.backend = future.result()
+                    job.status = 'ok'
+                except Exception as e:
+                    # Backends that gave up at the deadline count as timed out, not broken
+                    job.status = 'timeout' if job.started_at and job.seconds >= job_timeout else 'failed'
+                    job.error = str(e)
+            for future in list(pending):
+                job = futures[future]
+                if job.started_at is not None and now - job.started_at > job_timeout:
+                    # Backstop for backends that ignore their timeout: the result is just ignored
+                    job.status = 'timeout'
+                    job.seconds = now - job.started_at
+                    job.error = f"no result after {job_timeout}s"
+                    future.cancel()
+                    pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return CrawlResult(jobs, time.perf_counter() - start)
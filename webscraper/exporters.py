@@ -0,0 +1,99 @@
+"""
+Typed exports of scraped country tables.
+
+CSV keeps the scraped strings as they are. The Parquet dataset stores typed
+columns (float values, categorical unit and region) and is appended to, one
+directory per scrape date and indicator:
+
+    <dataset_dir>/scrape_date=2024-12-01/indicator=temperature/<uuid>.parquet
+
+so months of history can be read back selectively, e.g.
+read_dataset(path, columns=['Country', 'Last'], filters=[('Region', '==', 'EMEA')]).
+Parquet support needs the optional pyarrow package.
+"""
+import csv
+from datetime import date
+
+import pandas as pd
+
+from .constants import indicator_label
+from .normalize import normalize_batch
+from .regions import assign_regions
+
+PARTITION_COLUMNS = ['scrape_date', 'indicator']
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet export needs the optional 'pyarrow' package: pip install pyarrow")
+
+
+def write_csv_chunks(rows, filename, chunk_size=1000):
+    """
+    Writes an iterable of row dicts to CSV, holding at most `chunk_size` rows
+    in memory. The header comes from the first row. Returns the number of rows written.
+    """
+    count = 0
+    writer = None
+    chunk = []
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row))
+                writer.writeheader()
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                writer.writerows(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def to_typed_frame(data, indicator='temperature', scrape_date=None):
+    """
+    Scraped rows as a DataFrame with typed columns and the partition columns filled in.
+    Values are normalized (see normalize.py), so temperatures are always stored in Celsius.
+    """
+    label = indicator_label(indicator)
+    df = assign_regions(data)
+    if df.empty:
+        df = pd.DataFrame(columns=['Country', f'Last_{label}', f'Previous_{label}', 'Unit', 'Region'])
+    batch = normalize_batch(df, indicator)
+    typed = pd.DataFrame({
+        'Country': df['Country'].astype('string'),
+        'Last': batch.values['Last'],
+        'Previous': batch.values['Previous'],
+        'Unit': pd.Categorical(batch.units),
+        'Region': df['Region'].astype('category'),
+    }, index=df.index)
+    typed['scrape_date'] = (scrape_date or date.today()).isoformat()
+    typed['indicator'] = indicator
+    return typed
+
+
+def write_parquet_dataset(data, dataset_dir, indicator='temperature', scrape_date=None):
+    """Appends the rows to the partitioned Parquet dataset; returns the number of rows written."""
+    _require_pyarrow()
+    typed = to_typed_frame(data, indicator, scrape_date)
+    if typed.empty:
+        print("No data to export.")
+        return 0
+    # pyarrow names every new file with a fresh uuid, so earlier runs are never overwritten
+    typed.to_parquet(dataset_dir, engine='pyarrow', partition_cols=PARTITION_COLUMNS, index=False)
+    print(f"Appended {len(typed)} rows to the dataset at: {dataset_dir}")
+    return len(typed)
+
+
+def read_dataset(dataset_dir, columns=None, filters=None):
+    """
+    Reads the Parquet dataset back. `columns` projects, `filters` are pyarrow
+    predicates such as [('scrape_date', '>=', '2024-11-01'), ('indicator', '==', 'temperature')];
+    filters on the partition columns skip whole directories.
+    """
+    _require_pyarrow()
+    return pd.read_parquet(dataset_dir, engine='pyarrow', columns=columns, filters=filters)
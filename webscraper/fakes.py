@@ -0,0 +1,25 @@
+"""
+Test doubles shared by the test modules.
+"""
+
+
+class FakeClock:
+    """Clock for time-based code: call it for the time, sleep() just moves time forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class NoNavigationDriver:
+    """Fails the test if the page object navigates the browser."""
+
+    def get(self, url):
+        raise AssertionError(f"Unexpected navigation to {url}")
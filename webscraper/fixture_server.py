@@ -0,0 +1,192 @@
+"""
+Local HTTP server for saved and synthetic pages, so scraping code can be
+exercised and benchmarked offline.
+
+Besides the files in webscraper/fixtures, the fixture site serves a
+synthetic temperature page at /country-list/temperature?rows=N (any N, e.g.
+200 to 50000) with the same table markup as the live site, sortable
+Country/Last/Previous headers and a search box that shows suggestions
+(or 'No result found') without filtering the table.
+
+Usage:
+    python -m webscraper.fixture_server --port 8000
+"""
+import argparse
+from contextlib import contextmanager
+from functools import lru_cache, partial
+import html
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import os
+import random
+import threading
+from urllib.parse import parse_qs, urlparse
+
+from .constants import REGION_MAP
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SYNTHETIC_PAGE_PATH = '/country-list/temperature'
+DEFAULT_ROWS = 200
+MAX_ROWS = 200000
+
+# Client-side behaviour of the synthetic page: header sorting (Country
+# ascending first, numbers descending first, toggling on each click) and a
+# search box that only lists matching countries.
+PAGE_SCRIPT = """
+(function () {
+    var table = document.querySelector('table.table-heatmap');
+    var body = table.tBodies[0];
+    var directions = {};
+    function cellValue(row, index, numeric) {
+        var text = row.cells[index].textContent.trim();
+        return numeric ? parseFloat(text.replace(/,/g, '')) : text;
+    }
+    Array.prototype.forEach.call(table.tHead.rows[0].cells, function (th, index) {
+        var numeric = index === 1 || index === 2;
+        if (index > 2) { return; }
+        th.style.cursor = 'pointer';
+        th.addEventListener('click', function () {
+            var ascending = directions[index] === undefined ? !numeric : !directions[index];
+            directions[index] = ascending;
+            var rows = Array.prototype.slice.call(body.rows);
+            rows.sort(function (a, b) {
+                var x = cellValue(a, index, numeric), y = cellValue(b, index, numeric);
+                var order = x < y ? -1 : (x > y ? 1 : 0);
+                return ascending ? order : -order;
+            });
+            // Re-render asynchronously, like the live site does after a click
+            setTimeout(function () {
+                var fragment = document.createDocumentFragment();
+                rows.forEach(function (row) { fragment.appendChild(row); });
+                body.appendChild(fragment);
+            }, 50);
+        });
+    });
+    var input = document.getElementById('thisIstheSearchBoxIdTag');
+    var results = document.getElementById('search-results');
+    input.addEventListener('input', function () {
+        var query = input.value.trim().toLowerCase();
+        results.innerHTML = '';
+        if (!query) { return; }
+        var matches = Array.prototype.filter.call(body.rows, function (row) {
+            return row.cells[0].textContent.toLowerCase().indexOf(query) !== -1;
+        }).slice(0, 10);
+        if (!matches.length) {
+            results.innerHTML = '<h3>No result found</h3>';
+            return;
+        }
+        matches.forEach(function (row) {
+            var item = document.createElement('div');
+            item.textContent = row.cells[0].textContent.trim();
+            results.appendChild(item);
+        });
+    });
+})();
+"""
+
+
+@lru_cache(maxsize=8)
+def render_temperature_page(rows=DEFAULT_ROWS, seed=0):
+    """Synthetic country-list page with `rows` deterministic rows (names repeat with a suffix past 199)."""
+    rnd = random.Random(seed)
+    countries = [country for names in REGION_MAP.values() for country in names]
+    body = []
+    for i in range(rows):
+        country = countries[i % len(countries)]
+        if i >= len(countries):
+            country = f"{country} {i // len(countries) + 1}"
+        last = rnd.uniform(-25, 35)
+        previous = last + rnd.uniform(-3, 3)
+        # Occasional thousands separator, like the live site's larger indicators
+        last_text = f"{last * 100:,.2f}" if i % 97 == 0 else f"{last:.2f}"
+        slug = html.escape(country.lower().replace(' ', '-'), quote=True)
+        body.append(
+            f'<tr><td><a href="/{slug}/temperature">{html.escape(country)}</a></td>'
+            f'<td>{last_text}</td><td>{previous:.2f}</td><td>Dec/24</td><td>celsius</td></tr>'
+        )
+    return f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Average Temperature by Country</title></head>
+<body>
+<h1>Average Temperature by Country</h1>
+<input id="thisIstheSearchBoxIdTag" type="text" placeholder="Search" autocomplete="off">
+<div id="search-results"></div>
+<table class="table table-hover table-striped table-heatmap">
+<thead><tr><th>Country</th><th>Last</th><th>Previous</th><th>Reference</th><th>Unit</th></tr></thead>
+<tbody>
+{chr(10).join(body)}
+</tbody>
+</table>
+<script>{PAGE_SCRIPT}</script>
+</body>
+</html>
+"""
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves files without logging every request to stderr."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureSiteHandler(QuietHandler):
+    """Static fixtures plus the synthetic, scalable temperature page."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != SYNTHETIC_PAGE_PATH:
+            return super().do_GET()
+        try:
+            rows = int(parse_qs(url.query).get('rows', [DEFAULT_ROWS])[0])
+        except ValueError:
+            return self.send_error(400, "rows must be an integer")
+        if not 0 <= rows <= MAX_ROWS:
+            return self.send_error(400, f"rows must be between 0 and {MAX_ROWS}")
+        payload = render_temperature_page(rows).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@contextmanager
+def _serve(handler, host, port):
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@contextmanager
+def serve_directory(directory=FIXTURES_DIR, host='127.0.0.1', port=0):
+    """Serves `directory` on a background thread and yields its base URL."""
+    with _serve(partial(QuietHandler, directory=directory), host, port) as base_url:
+        yield base_url
+
+
+@contextmanager
+def serve_fixture_site(host='127.0.0.1', port=0):
+    """Serves the fixtures plus the synthetic page; yields the base URL."""
+    with _serve(partial(FixtureSiteHandler, directory=FIXTURES_DIR), host, port) as base_url:
+        yield base_url
+
+
+def fixture_page_url(base_url, rows=DEFAULT_ROWS):
+    """URL of the synthetic temperature page with `rows` rows."""
+    return f"{base_url}{SYNTHETIC_PAGE_PATH}?rows={rows}"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the offline fixture site.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+    with serve_fixture_site(args.host, args.port) as base_url:
+        print(f"Serving fixtures at {base_url} (synthetic page: {fixture_page_url(base_url)})")
+        threading.Event().wait()
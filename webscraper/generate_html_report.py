@@ -1,47 +1,239 @@
+"""
+Builds an HTML report from one or more JUnit XML files.
+
+Inputs can be XML files or directories (searched recursively for *.xml),
+e.g. every per-day folder under test_results/. XML files in the same
+directory are shards of one run; runs are ordered by directory path, so
+date-named folders come out oldest first. Test cases are streamed with
+iterparse and folded into per-test statistics in a single pass (pass rate,
+flakiness, duration mean/min/max and trend, mean waiting and active time
+from the trace properties), and the HTML is written in
+chunks, so memory depends on the number of distinct tests, not on the number
+of test cases read.
+
+Usage:
+    python generate_html_report.py test_results/2025-01-10/test_report.xml
+    python generate_html_report.py test_results/ --output test_results/trends.html
+"""
+import argparse
+from collections import deque
+from datetime import datetime
+import html
 import os
 import xml.etree.ElementTree as ET
-from datetime import datetime
-import sys
-
-def generate_html_report(xml_path):
-    """Generates an HTML report from the latest XML test report."""
-    
-    # --- 1. Determine output directory based on XML path ---
-    output_base_dir = os.path.dirname(xml_path)
-    
-    # --- 2. Parse the XML report ---
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-    
-    test_cases = []
-    for i, testcase in enumerate(root.iter('testcase')):
-        test_name = testcase.get('name')
-        test_description = testcase.get('doc') or test_name
-        
+
+# Durations kept per test for the sparkline; everything else is running totals
+TREND_RUNS = 10
+# HTML rows buffered before each write
+WRITE_CHUNK_ROWS = 500
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def iter_testcases(xml_path):
+    """
+    Yields one dict per <testcase> in `xml_path` without building the whole tree.
+    Each finished element is detached from its parent, so memory stays flat.
+    """
+    stack = []
+    for event, elem in ET.iterparse(xml_path, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        if elem.tag != 'testcase':
+            continue
         status = 'Pass'
-        if testcase.find('failure') is not None:
+        if elem.find('failure') is not None:
             status = 'Fail'
-        elif testcase.find('error') is not None:
+        elif elem.find('error') is not None:
             status = 'Error'
-            
-        screenshot_path = f"{test_name}.png"
-        
-        test_cases.append({
-            'number': i + 1,
-            'name': test_name,
-            'description': test_description,
+        elif elem.find('skipped') is not None:
+            status = 'Skipped'
+        properties = {prop.get('name'): prop.get('value') for prop in elem.iter('property')}
+        # Trace properties written by conftest.py (absent when tracing is off)
+        wait, active = properties.get('trace_wait'), properties.get('trace_active')
+        yield {
+            'name': elem.get('name'),
+            'classname': elem.get('classname') or '',
+            'description': elem.get('doc') or elem.get('name'),
+            'time': float(elem.get('time') or 0),
             'status': status,
-            'screenshot': screenshot_path
-        })
-        
-    # --- 3. Generate the HTML report ---
-    now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    report_filename = f"test_report_{now}.html"
-    
-    html = f"""
-    <!DOCTYPE html>
+            'commands': properties.get('trace_commands', ''),
+            'wait': float(wait) if wait else None,
+            'active': float(active) if active else None,
+        }
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+
+def find_reports(paths):
+    """Expands files and directories into JUnit XML paths, grouped into runs: [(run_dir, [xml, ...])]."""
+    runs = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                # Per-worker shards of a parallel run are merged into the run directory already
+                dirnames[:] = sorted(d for d in dirnames if d != 'workers')
+                for filename in sorted(filenames):
+                    if filename.endswith('.xml'):
+                        runs.setdefault(dirpath, []).append(os.path.join(dirpath, filename))
+        else:
+            runs.setdefault(os.path.dirname(path), []).append(path)
+    return sorted(runs.items())
+
+
+class CaseStats:
+    """Running statistics for one test across runs; constant size per test."""
+
+    __slots__ = ('name', 'description', 'runs', 'passed', 'failed', 'skipped', 'flips', 'last_status',
+                 'last_run_dir', 'last_commands', 'total_time', 'min_time', 'max_time',
+                 'traced_runs', 'total_wait', 'total_active', 'sum_x', 'sum_xx', 'sum_xy', 'recent')
+
+    def __init__(self, name, description):
+        self.name = name
+        self.description = description
+        self.runs = self.passed = self.failed = self.skipped = self.flips = 0
+        self.last_status = None
+        self.last_run_dir = None
+        self.last_commands = ''
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = None
+        # Runs with trace properties, and their waiting/active seconds
+        self.traced_runs = 0
+        self.total_wait = self.total_active = 0.0
+        # Sums for a least-squares duration slope over the run index
+        self.sum_x = self.sum_xx = self.sum_xy = 0.0
+        self.recent = deque(maxlen=TREND_RUNS)
+
+    def add(self, case, run_index, run_dir):
+        self.runs += 1
+        if case['status'] == 'Skipped':
+            self.skipped += 1
+        else:
+            if case['status'] == 'Pass':
+                self.passed += 1
+            else:
+                self.failed += 1
+            outcome = case['status'] == 'Pass'
+            if self.last_status is not None and self.last_status != 'Skipped' \
+                    and (self.last_status == 'Pass') != outcome:
+                self.flips += 1
+        self.last_status = case['status']
+        self.last_run_dir = run_dir
+        self.last_commands = case['commands']
+        seconds = case['time']
+        self.total_time += seconds
+        self.min_time = seconds if self.min_time is None else min(self.min_time, seconds)
+        self.max_time = seconds if self.max_time is None else max(self.max_time, seconds)
+        if case['wait'] is not None and case['active'] is not None:
+            self.traced_runs += 1
+            self.total_wait += case['wait']
+            self.total_active += case['active']
+        self.sum_x += run_index
+        self.sum_xx += run_index * run_index
+        self.sum_xy += run_index * seconds
+        self.recent.append(seconds)
+
+    @property
+    def executed(self):
+        return self.passed + self.failed
+
+    @property
+    def pass_rate(self):
+        return self.passed / self.executed if self.executed else None
+
+    @property
+    def flakiness(self):
+        """Share of consecutive executions whose outcome flipped between pass and fail."""
+        return self.flips / (self.executed - 1) if self.executed > 1 else 0.0
+
+    @property
+    def mean_time(self):
+        return self.total_time / self.runs if self.runs else 0.0
+
+    @property
+    def mean_wait(self):
+        return self.total_wait / self.traced_runs if self.traced_runs else None
+
+    @property
+    def mean_active(self):
+        return self.total_active / self.traced_runs if self.traced_runs else None
+
+    @property
+    def slope(self):
+        """Change in duration per run (seconds), 0 when there is nothing to compare."""
+        denominator = self.runs * self.sum_xx - self.sum_x ** 2
+        if self.runs < 2 or denominator == 0:
+            return 0.0
+        return (self.runs * self.sum_xy - self.sum_x * self.total_time) / denominator
+
+    def sparkline(self):
+        if not self.recent:
+            return ''
+        low, high = min(self.recent), max(self.recent)
+        span = (high - low) or 1.0
+        return ''.join(SPARK_CHARS[int((value - low) / span * (len(SPARK_CHARS) - 1))] for value in self.recent)
+
+
+def aggregate(paths):
+    """Single pass over every test case of every input; returns (stats by test id, run dirs, test case count)."""
+    stats = {}
+    runs = find_reports(paths)
+    cases = 0
+    for run_index, (run_dir, xml_paths) in enumerate(runs):
+        for xml_path in xml_paths:
+            for case in iter_testcases(xml_path):
+                cases += 1
+                key = f"{case['classname']}::{case['name']}"
+                test = stats.get(key)
+                if test is None:
+                    test = stats[key] = CaseStats(case['name'], case['description'])
+                test.add(case, run_index, run_dir)
+    return stats, [run_dir for run_dir, _ in runs], cases
+
+
+def _percent(value):
+    return '' if value is None else f"{value:.0%}"
+
+
+def _seconds(value):
+    return '' if value is None else f"{value:.3f}"
+
+
+def _row(number, test, output_dir):
+    status_class = f"status-{test.last_status.lower()}"
+    screenshot = os.path.relpath(os.path.join(test.last_run_dir, f"{test.name}.png"), output_dir)
+    trend = f"{test.slope:+.3f}s/run" if test.runs > 1 else ''
+    return f"""
+            <tr>
+                <td>{number}</td>
+                <td>{html.escape(test.description)}</td>
+                <td class="{status_class}">{test.last_status}</td>
+                <td>{test.runs}</td>
+                <td>{_percent(test.pass_rate)}</td>
+                <td>{_percent(test.flakiness)}</td>
+                <td>{test.mean_time:.3f}</td>
+                <td>{test.min_time:.3f} / {test.max_time:.3f}</td>
+                <td><span class="spark">{test.sparkline()}</span> {trend}</td>
+                <td>{_seconds(test.mean_wait)}</td>
+                <td>{_seconds(test.mean_active)}</td>
+                <td>{html.escape(str(test.last_commands))}</td>
+                <td><a href="{html.escape(screenshot, quote=True)}" target="_blank">View Screenshot</a></td>
+            </tr>"""
+
+
+def write_report(stats, runs, cases, report_path):
+    """Writes the report table to `report_path`, WRITE_CHUNK_ROWS rows per write."""
+    output_dir = os.path.dirname(os.path.abspath(report_path))
+    flaky = sum(1 for test in stats.values() if test.flips)
+    failing = sum(1 for test in stats.values() if test.last_status in ('Fail', 'Error'))
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(f"""<!DOCTYPE html>
     <html>
     <head>
+        <meta charset="utf-8">
         <title>Test Report</title>
         <style>
             body {{ font-family: sans-serif; }}
@@ -51,47 +243,67 @@ def generate_html_report(xml_path):
             .status-pass {{ color: green; }}
             .status-fail {{ color: red; }}
             .status-error {{ color: orange; }}
+            .status-skipped {{ color: gray; }}
+            .spark {{ font-family: monospace; }}
         </style>
     </head>
     <body>
         <h1>Test Report</h1>
         <p>Generated on: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        
+        <p>{cases} test cases from {len(runs)} run(s); {len(stats)} distinct tests, {failing} failing in their
+           latest run, {flaky} flaky.</p>
+
         <table>
             <tr>
                 <th>Test Case #</th>
                 <th>Test Case Description</th>
-                <th>Status</th>
+                <th>Latest Status</th>
+                <th>Runs</th>
+                <th>Pass Rate</th>
+                <th>Flakiness</th>
+                <th>Mean Duration (s)</th>
+                <th>Min / Max (s)</th>
+                <th>Duration Trend (last {TREND_RUNS})</th>
+                <th>Mean Waiting (s)</th>
+                <th>Mean Active (s)</th>
+                <th>WebDriver Commands</th>
                 <th>Screenshot</th>
-            </tr>
-    """
-    
-    for tc in test_cases:
-        status_class = f"status-{tc['status'].lower()}"
-        html += f"""
-            <tr>
-                <td>{tc['number']}</td>
-                <td>{tc['description']}</td>
-                <td class="{status_class}">{tc['status']}</td>
-                <td><a href="{tc['screenshot']}" target="_blank">View Screenshot</a></td>
-            </tr>
-        """
-        
-    html += """
+            </tr>""")
+        chunk = []
+        for number, test in enumerate(stats.values(), start=1):
+            chunk.append(_row(number, test, output_dir))
+            if len(chunk) >= WRITE_CHUNK_ROWS:
+                f.write(''.join(chunk))
+                chunk = []
+        f.write(''.join(chunk))
+        f.write("""
         </table>
     </body>
     </html>
+""")
+
+
+def generate_html_report(xml_paths, output_path=None):
     """
-    
-    report_path = os.path.join(output_base_dir, report_filename)
-    with open(report_path, 'w') as f:
-        f.write(html)
-        
-    print(f"HTML report generated at: {report_path}")
+    Generates an HTML report from one or more JUnit XML files or directories.
+    By default the report goes next to the first input, as test_report_<timestamp>.html.
+    """
+    if isinstance(xml_paths, (str, os.PathLike)):
+        xml_paths = [xml_paths]
+    stats, runs, cases = aggregate(xml_paths)
+    if output_path is None:
+        first = xml_paths[0]
+        output_base_dir = first if os.path.isdir(first) else os.path.dirname(first)
+        now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        output_path = os.path.join(output_base_dir, f"test_report_{now}.html")
+    write_report(stats, runs, cases, output_path)
+    print(f"HTML report generated at: {output_path}")
+    return output_path
+
 
 if __name__ == '__main__':
-    if len(sys.argv) > 1:
-        xml_report_path = sys.argv[1]
-        generate_html_report(xml_report_path)
-    else:
-        print("Usage: python generate_html_report.py <path_to_xml_report>")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='+', help='JUnit XML files or directories containing them')
+    parser.add_argument('--output', default=None, help='where to write the HTML report')
+    args = parser.parse_args()
+    generate_html_report(args.inputs, args.output)
@@ -0,0 +1,155 @@
+"""
+Persistent history of scraped observations in an embedded SQLite database.
+
+One row per (indicator, country, scrape_time), with indexes for the common
+"one country over time" and "one region over time" queries. Writes are
+batched upserts inside a single transaction, so re-importing the same run
+updates rows instead of duplicating them.
+
+Usage:
+    store = HistoryStore('test_results/history.sqlite3')
+    store.write(scraped_data, indicator='temperature')
+    emea = store.query(start='2024-09-01', region='EMEA')
+"""
+from datetime import datetime
+import glob
+import os
+import re
+import sqlite3
+
+import pandas as pd
+
+from .exporters import to_typed_frame
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    indicator   TEXT NOT NULL,
+    country     TEXT NOT NULL,
+    region      TEXT,
+    scrape_time TEXT NOT NULL,
+    last        REAL,
+    previous    REAL,
+    unit        TEXT,
+    PRIMARY KEY (indicator, country, scrape_time)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_observations_country_time ON observations (country, scrape_time);
+CREATE INDEX IF NOT EXISTS idx_observations_region_time ON observations (region, scrape_time);
+"""
+
+UPSERT = """
+INSERT INTO observations (indicator, country, region, scrape_time, last, previous, unit)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (indicator, country, scrape_time) DO UPDATE SET
+    region = excluded.region, last = excluded.last, previous = excluded.previous, unit = excluded.unit
+"""
+
+# Daily result folders written by the test suite, e.g. test_results/2024-12-01
+DATE_DIR_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _as_time(value):
+    """ISO-8601 text (sorts chronologically in SQLite) from a datetime, date or string."""
+    if value is None:
+        return None
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(timespec='seconds') if isinstance(value, datetime) else value.isoformat()
+    return str(value)
+
+
+class HistoryStore:
+    """SQLite-backed store of scraped observations with a small query API."""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, data, indicator='temperature', scrape_time=None, batch_size=10000):
+        """Upserts scraped rows (HomePage row dicts) in one transaction; returns the number of rows."""
+        scrape_time = _as_time(scrape_time or datetime.now())
+        typed = to_typed_frame(data, indicator, scrape_date=datetime.fromisoformat(scrape_time).date())
+        columns = typed[['Country', 'Region', 'Last', 'Previous', 'Unit']].astype(object)
+        # NaN (unparseable number, unknown region) is stored as NULL
+        columns = columns.where(columns.notna(), None)
+        records = (
+            (indicator, country, region, scrape_time, last, previous, unit)
+            for country, region, last, previous, unit in columns.itertuples(index=False, name=None)
+        )
+        return self.write_records(records, batch_size)
+
+    def write_records(self, records, batch_size=10000):
+        """Upserts (indicator, country, region, scrape_time, last, previous, unit) tuples in one transaction."""
+        written = 0
+        batch = []
+        with self.conn:
+            for record in records:
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    self.conn.executemany(UPSERT, batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany(UPSERT, batch)
+                written += len(batch)
+        return written
+
+    def query(self, start=None, end=None, countries=None, region=None, indicator=None,
+              columns=('indicator', 'country', 'region', 'scrape_time', 'last', 'previous', 'unit')):
+        """
+        Observations as a DataFrame, ordered by country and time. `start`/`end`
+        bound scrape_time (inclusive start, exclusive end); `countries` is a
+        list of names; `region` and `indicator` are exact matches.
+        """
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("scrape_time >= ?")
+            params.append(_as_time(start))
+        if end is not None:
+            clauses.append("scrape_time < ?")
+            params.append(_as_time(end))
+        if countries:
+            clauses.append(f"country IN ({', '.join('?' * len(countries))})")
+            params.extend(countries)
+        if region is not None:
+            clauses.append("region = ?")
+            params.append(region)
+        if indicator is not None:
+            clauses.append("indicator = ?")
+            params.append(indicator)
+
+        unknown = set(columns) - {'indicator', 'country', 'region', 'scrape_time', 'last', 'previous', 'unit'}
+        if unknown:
+            raise ValueError(f"Unknown history columns: {sorted(unknown)}")
+        sql = f"SELECT {', '.join(columns)} FROM observations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY country, scrape_time"
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def import_csv_dirs(self, base_dir='test_results', filename='scraped_temperature_data.csv', indicator='temperature'):
+        """
+        Bulk-imports the daily CSVs the test suite leaves in <base_dir>/<YYYY-MM-DD>/.
+        Each file is stored at midnight of its folder's date. Returns the number of rows imported.
+        """
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(base_dir, '*', filename))):
+            day = os.path.basename(os.path.dirname(path))
+            if not DATE_DIR_PATTERN.match(day):
+                continue
+            rows = pd.read_csv(path, dtype=str, keep_default_na=False).to_dict('records')
+            imported += self.write(rows, indicator=indicator, scrape_time=f"{day}T00:00:00")
+        return imported
@@ -0,0 +1,119 @@
+"""
+Incremental scraping: only write what changed since the last run.
+
+Two levels of fingerprints are kept in a small JSON state file:
+
+  * the whole table, as reported by page.table_fingerprint() (two 32-bit
+    hashes and the row count, computed in the page without extraction). If
+    it matches the last run, nothing is scraped or written at all.
+  * one hash per row, keyed by Country. When the table did change, only
+    inserted, updated and removed rows go to a delta CSV.
+
+Usage:
+    home_page.load()
+    summary = incremental_scrape(home_page, 'state/temperature.json', 'deltas/')
+"""
+import csv
+from datetime import datetime
+import hashlib
+import json
+import os
+
+STATE_VERSION = 1
+
+
+def row_hash(row):
+    """Short stable hash of one scraped row."""
+    payload = json.dumps(row, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def load_state(state_path):
+    """Returns the saved state, or an empty one if there is none yet."""
+    try:
+        with open(state_path, encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return {'version': STATE_VERSION, 'table_fingerprint': None, 'rows': {}}
+    if state.get('version') != STATE_VERSION:
+        raise ValueError(f"Unsupported incremental state version in {state_path}: {state.get('version')!r}")
+    return state
+
+
+def save_state(state_path, state):
+    """Writes the state atomically so an interrupted run never leaves half a file."""
+    directory = os.path.dirname(state_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+
+def diff_rows(previous_hashes, rows, key='Country'):
+    """
+    Compares rows with the per-row hashes of the last run.
+    Returns (inserted, updated, removed_keys, current_hashes).
+    """
+    inserted, updated = [], []
+    current_hashes = {}
+    for row in rows:
+        row_key = row[key]
+        digest = row_hash(row)
+        current_hashes[row_key] = digest
+        previous = previous_hashes.get(row_key)
+        if previous is None:
+            inserted.append(row)
+        elif previous != digest:
+            updated.append(row)
+    removed_keys = [row_key for row_key in previous_hashes if row_key not in current_hashes]
+    return inserted, updated, removed_keys, current_hashes
+
+
+def write_delta(delta_path, inserted, updated, removed_keys, key='Country'):
+    """Writes the changed rows with a leading Change column (insert/update/delete)."""
+    fieldnames = ['Change', key]
+    for row in inserted + updated:
+        fieldnames.extend(name for name in row if name not in fieldnames)
+
+    os.makedirs(os.path.dirname(delta_path) or '.', exist_ok=True)
+    with open(delta_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for change, changed_rows in (('insert', inserted), ('update', updated)):
+            for row in changed_rows:
+                writer.writerow({'Change': change, **row})
+        for row_key in removed_keys:
+            writer.writerow({'Change': 'delete', key: row_key})
+
+
+def incremental_scrape(page, state_path, delta_dir, key='Country'):
+    """
+    Scrapes a loaded page incrementally. Returns a summary dict with
+    status ('unchanged' or 'changed'), the inserted/updated/removed counts
+    and the delta file path (None when nothing was written).
+    """
+    state = load_state(state_path)
+    fingerprint = page.table_fingerprint()
+    summary = {'status': 'unchanged', 'inserted': 0, 'updated': 0, 'removed': 0, 'delta_path': None}
+
+    if fingerprint is not None and fingerprint == state['table_fingerprint']:
+        print("Table unchanged since last run, skipping extraction.")
+        return summary
+
+    # The fingerprint is of the live table, so the rows must be too: a cached
+    # snapshot could be up to the cache TTL old and would be saved as current
+    rows = page.extract_table_data(use_cache=False)
+    inserted, updated, removed_keys, current_hashes = diff_rows(state['rows'], rows, key)
+    summary.update(status='changed', inserted=len(inserted), updated=len(updated), removed=len(removed_keys))
+
+    if inserted or updated or removed_keys:
+        delta_name = f"delta_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.csv"
+        summary['delta_path'] = os.path.join(delta_dir, delta_name)
+        write_delta(summary['delta_path'], inserted, updated, removed_keys, key)
+        print(f"Delta written to {summary['delta_path']}: {len(inserted)} inserted, "
+              f"{len(updated)} updated, {len(removed_keys)} removed.")
+
+    save_state(state_path, {'version': STATE_VERSION, 'table_fingerprint': fingerprint, 'rows': current_hashes})
+    return summary
@@ -0,0 +1,225 @@
+"""
+Lightweight tracing for page objects and WebDriver sessions.
+
+Every traced call opens a span. Spans nest per thread and record wall time,
+time spent waiting (WebDriverWait, re-render waits, sleeps) versus active
+time, the number of WebDriver commands sent and bytes written by exports.
+Cost per span is two perf_counter() calls and a deque append, and only the
+last MAX_SPANS finished spans are kept (flush_jsonl() writes them out
+before they are dropped), so tracing is on by default, also in long-running
+processes; set SCRAPER_TRACING=0 to turn it off.
+
+Usage:
+    instrument_driver(driver)                 # count commands on this session
+    with TRACER.span('nightly-run'):
+        home_page.load()                      # HomePage methods are traced
+    TRACER.write_jsonl('trace.jsonl')
+"""
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+import itertools
+import json
+import os
+import threading
+import time
+
+# Finished spans a Tracer keeps by default; older ones are dropped
+MAX_SPANS = 10000
+
+
+class Span:
+    """One timed call; counters include everything done by nested spans."""
+
+    __slots__ = ('id', 'parent_id', 'name', 'depth', 'thread', 'start', 'duration',
+                 'wait', 'commands', 'bytes_written', 'attributes')
+
+    def __init__(self, span_id, parent_id, name, depth, attributes):
+        self.id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.depth = depth
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.duration = None
+        self.wait = 0.0
+        self.commands = 0
+        self.bytes_written = 0
+        self.attributes = attributes
+
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'depth': self.depth,
+            'thread': self.thread,
+            'duration': self.duration,
+            'wait': self.wait,
+            'active': None if self.duration is None else max(self.duration - self.wait, 0.0),
+            'commands': self.commands,
+            'bytes_written': self.bytes_written,
+            **self.attributes,
+        }
+
+
+class Tracer:
+    """
+    Collects the last `max_spans` finished spans; counters are added to every open span
+    of the calling thread. With retain=False finished spans are not kept at all, for
+    processes that only read the counters of the span they opened.
+    """
+
+    def __init__(self, enabled=True, retain=True, max_spans=MAX_SPANS):
+        self.enabled = enabled
+        self.retain = retain
+        self.spans = deque(maxlen=max_spans)
+        # Spans finished so far, including dropped and flushed ones; marks count in these
+        self._finished = 0
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name, **attributes):
+        if not self.enabled:
+            yield None
+            return
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        span = Span(next(self._ids), parent.id if parent else None, name, len(stack), attributes)
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            span.duration = time.perf_counter() - span.start
+            stack.pop()
+            if self.retain:
+                with self._lock:
+                    self.spans.append(span)
+                    self._finished += 1
+
+    def add_commands(self, count=1):
+        for span in self._stack():
+            span.commands += count
+
+    def add_wait(self, seconds):
+        for span in self._stack():
+            span.wait += seconds
+
+    def add_bytes(self, count):
+        for span in self._stack():
+            span.bytes_written += count
+
+    @contextmanager
+    def waiting(self):
+        """Counts the time spent inside the block as waiting."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_wait(time.perf_counter() - start)
+
+    def mark(self):
+        """Number of spans finished so far, for spans_since()."""
+        with self._lock:
+            return self._finished
+
+    def spans_since(self, mark):
+        """Spans finished after `mark` that are still kept (not dropped or flushed)."""
+        with self._lock:
+            count = min(self._finished - mark, len(self.spans))
+            return list(itertools.islice(self.spans, len(self.spans) - count, None))
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+
+    def flush_jsonl(self, path):
+        """Appends every kept span to `path` and forgets them, so none are dropped in long runs."""
+        with self._lock:
+            spans = list(self.spans)
+            self.spans.clear()
+        self.write_jsonl(path, spans)
+
+    def write_jsonl(self, path, spans=None):
+        """Appends spans (all finished spans by default) to a JSON-lines file."""
+        spans = self.spans_since(0) if spans is None else spans
+        with open(path, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.as_dict()) + '\n')
+
+
+def summarize(spans):
+    """
+    Totals for the spans recorded during one unit of work (e.g. one test).
+    Root spans carry the inclusive counters; `steps` aggregates their direct children by name.
+    """
+    ids = {span.id for span in spans}
+    roots = [span for span in spans if span.parent_id not in ids]
+    root_ids = {span.id for span in roots}
+    steps = {}
+    for span in spans:
+        if span.parent_id in root_ids:
+            step = steps.setdefault(span.name, {'calls': 0, 'seconds': 0.0, 'wait': 0.0, 'commands': 0})
+            step['calls'] += 1
+            step['seconds'] += span.duration
+            step['wait'] += span.wait
+            step['commands'] += span.commands
+    return {
+        'duration': sum(span.duration for span in roots),
+        'wait': sum(span.wait for span in roots),
+        'active': sum(max(span.duration - span.wait, 0.0) for span in roots),
+        'commands': sum(span.commands for span in roots),
+        'bytes_written': sum(span.bytes_written for span in roots),
+        'steps': steps,
+    }
+
+
+def format_summary(summary):
+    """Plain-text table of a summarize() result, for test reports."""
+    lines = [
+        f"total {summary['duration']:.3f}s (active {summary['active']:.3f}s, waiting {summary['wait']:.3f}s), "
+        f"{summary['commands']} WebDriver commands, {summary['bytes_written']} bytes written",
+        f"{'step':<34}{'calls':>6}{'seconds':>10}{'wait':>10}{'commands':>10}",
+    ]
+    for name, step in sorted(summary['steps'].items(), key=lambda item: -item[1]['seconds']):
+        lines.append(f"{name:<34}{step['calls']:>6}{step['seconds']:>10.3f}{step['wait']:>10.3f}{step['commands']:>10}")
+    return '\n'.join(lines)
+
+
+TRACER = Tracer(enabled=os.environ.get('SCRAPER_TRACING', '1') != '0')
+
+
+def traced(method):
+    """Decorator for page-object methods: one span per call, named Class.method."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        tracer = getattr(self, 'tracer', TRACER)
+        if not tracer.enabled:
+            return method(self, *args, **kwargs)
+        with tracer.span(f"{type(self).__name__}.{method.__name__}"):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def instrument_driver(driver, tracer=TRACER):
+    """Counts every WebDriver command of this session (WebElement calls included) in the open spans."""
+    if getattr(driver, '_traced_execute', False):
+        return driver
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        tracer.add_commands()
+        return original_execute(driver_command, params)
+
+    # WebElement methods go through driver.execute too, so the instance attribute catches them all
+    driver.execute = execute
+    driver._traced_execute = True
+    return driver
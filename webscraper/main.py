@@ -0,0 +1,302 @@
+"""
+Command-line entry point: one-shot scrapes, a warm-browser daemon and its client.
+
+    python -m webscraper.main scrape --indicator temperature --sort last --format csv
+    python -m webscraper.main scrape --indicator gdp --format parquet --validate
+    python -m webscraper.main serve --port 8765 --browsers 2
+    python -m webscraper.main submit --indicator temperature --format json
+
+Unsorted tables are read from the server-rendered HTML without a browser;
+sorted jobs, and pages whose table is not in the raw HTML, run in Chrome.
+pandas and Selenium are only imported once a job runs, so --help and
+--validate return straight away. The daemon imports everything and starts
+its browsers once, then runs browser jobs on a warm browser from the pool.
+Its HTTP API (localhost only by default):
+
+    POST /jobs    {"indicator": "temperature", "sort": "last", "format": "csv", "output": "output/..."}
+    GET  /health  pool size, browsers started and replaced, jobs run
+
+Job results include the browser's memory, CPU and open handles after the job.
+The daemon only writes below its output directory (output/ by default).
+"""
+import argparse
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from .backends import BackendUnavailable, HttpBackend, SeleniumBackend, scrape_table
+from .constants import COUNTRY_LIST_URL
+from .instrumentation import Tracer, instrument_driver
+
+SORTS = ('none', 'country', 'last')
+FORMATS = ('json', 'csv', 'parquet', 'history')
+INDICATOR_PATTERN = re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$')
+DEFAULT_OUTPUT_DIR = 'output'
+DEFAULT_PORT = 8765
+# Jobs waiting longer than this for a free browser are rejected with 503
+LEASE_TIMEOUT = 120
+
+# Finished spans are not kept, so a long-running daemon does not grow; each
+# job reads the counters of its own root span.
+JOB_TRACER = Tracer(retain=False)
+
+
+class JobError(ValueError):
+    """A scrape job specification that cannot be run."""
+
+
+def default_output(indicator, fmt, output_dir=DEFAULT_OUTPUT_DIR, today=None):
+    """Where a job writes when no output is given: a CSV file, a Parquet dataset dir or the history DB."""
+    today = (today or date.today()).isoformat()
+    if fmt == 'csv':
+        return os.path.join(output_dir, f"{indicator}_{today}.csv")
+    if fmt == 'parquet':
+        return os.path.join(output_dir, 'parquet')
+    if fmt == 'history':
+        return os.path.join(output_dir, 'history.sqlite3')
+    return None
+
+
+def parse_job(spec, output_dir=None):
+    """
+    Validates a job dict (from JSON or the command line) and returns it with defaults filled in.
+    With `output_dir` (the daemon's jobs come from the network) the output must resolve inside it.
+    """
+    unknown = set(spec) - {'indicator', 'sort', 'format', 'output'}
+    if unknown:
+        raise JobError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+    indicator = str(spec.get('indicator') or 'temperature').strip().lower()
+    if not INDICATOR_PATTERN.match(indicator):
+        raise JobError(f"Invalid indicator {indicator!r}: use the slug from the site's URL, e.g. 'inflation-rate'.")
+    sort = spec.get('sort') or 'none'
+    if sort not in SORTS:
+        raise JobError(f"Invalid sort {sort!r} (expected one of {', '.join(SORTS)}).")
+    fmt = spec.get('format') or 'csv'
+    if fmt not in FORMATS:
+        raise JobError(f"Invalid format {fmt!r} (expected one of {', '.join(FORMATS)}).")
+    output = spec.get('output') or default_output(indicator, fmt)
+    if fmt == 'json' and spec.get('output'):
+        raise JobError("The json format returns rows in the response and takes no output path.")
+    if output_dir is not None and output is not None:
+        base = os.path.realpath(output_dir)
+        # realpath() also resolves '..' and symlinks, so neither can lead outside
+        if os.path.commonpath([base, os.path.realpath(output)]) != base:
+            raise JobError(f"Invalid output {output!r}: jobs can only write below {output_dir}/.")
+    return {'indicator': indicator, 'sort': sort, 'format': fmt, 'output': output}
+
+
+def create_driver():
+    """Starts a lean headless Chrome for HomePage whose commands are counted per job."""
+    from .browser_profile import create_scraping_driver
+    from .pages.homepage import HomePage
+    return instrument_driver(create_scraping_driver(HomePage), JOB_TRACER)
+
+
+def create_pool(browsers=1, max_rss_mb=1500, max_pages=500):
+    """
+    Browser pool for jobs; importing it here keeps Selenium out of --help and --validate.
+    Browsers over `max_rss_mb` (whole process tree) or `max_pages` page loads are replaced.
+    """
+    from .browser_pool import BrowserPool
+    from .watchdog import BrowserWatchdog, ResourceLimits
+    watchdog = BrowserWatchdog(ResourceLimits(max_rss_mb=max_rss_mb, max_pages=max_pages))
+    return BrowserPool(create_driver, max_size=browsers, watchdog=watchdog)
+
+
+def warm_up(pool):
+    """Starts every browser of the pool up front so the first jobs do not pay for it."""
+    drivers = [pool.lease() for _ in range(pool.max_size)]
+    for driver in drivers:
+        pool.release(driver)
+
+
+def run_job(job, pool, lease_timeout=LEASE_TIMEOUT, url_template=COUNTRY_LIST_URL):
+    """
+    Scrapes one validated job and returns a JSON-serializable summary. Unsorted
+    tables come over plain HTTP; the pool is only leased from for the rest.
+    """
+    from .pages.homepage import HomePage
+
+    browser = SeleniumBackend(pool=pool, tracer=JOB_TRACER, lease_timeout=lease_timeout)
+    sort = None if job['sort'] == 'none' else job['sort']
+    with JOB_TRACER.span('job', indicator=job['indicator']) as span:
+        # The browser is back in the pool before the export starts
+        data, backend = scrape_table(url_template.format(indicator=job['indicator']), [HttpBackend(), browser],
+                                     sort=sort, indicator=job['indicator'])
+        if job['format'] != 'json':
+            output_dir = os.path.dirname(job['output'])
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            # Exporting needs no browser
+            HomePage(None, indicator=job['indicator'], tracer=JOB_TRACER).export(data, job['output'], job['format'])
+
+    # Browser memory, CPU and handles after the job (None for HTTP jobs or without a watchdog)
+    result = dict(job, rows=len(data), backend=backend, seconds=round(span.duration, 3), wait=round(span.wait, 3),
+                  commands=span.commands, resources=browser.resources)
+    if job['format'] == 'json':
+        result['data'] = data
+    return result
+
+
+class JobHandler(BaseHTTPRequestHandler):
+    """POST /jobs runs a scrape job; GET /health reports on the pool."""
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/health':
+            return self._send_json(404, {'error': 'Not found'})
+        pool = self.server.pool
+        self._send_json(200, {
+            'status': 'ok',
+            'browsers': pool.max_size,
+            'started': pool.created,
+            'recycled': pool.recycled,
+            'recycled_over_limits': pool.watchdog.recycled if pool.watchdog else 0,
+            'jobs': self.server.jobs_run,
+            'uptime': round(time.monotonic() - self.server.started_at, 1),
+        })
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/jobs':
+            return self._send_json(404, {'error': 'Not found'})
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            spec = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(spec, dict):
+                raise JobError("The job must be a JSON object.")
+            job = parse_job(spec, output_dir=self.server.output_dir)
+        except ValueError as e:
+            # Bad JSON and JobError alike
+            return self._send_json(400, {'error': str(e)})
+        try:
+            result = run_job(job, self.server.pool, self.server.lease_timeout)
+        except BackendUnavailable as e:
+            # Includes no browser becoming free within lease_timeout
+            return self._send_json(503, {'error': str(e)})
+        except Exception as e:
+            return self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+        with self.server.lock:
+            self.server.jobs_run += 1
+        self._send_json(200, result)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(pool, host='127.0.0.1', port=DEFAULT_PORT, lease_timeout=LEASE_TIMEOUT, verbose=True,
+                output_dir=DEFAULT_OUTPUT_DIR):
+    """HTTP job server bound to `pool`, writing only below `output_dir`; call serve_forever() on the result."""
+    server = ThreadingHTTPServer((host, port), JobHandler)
+    server.daemon_threads = True
+    server.pool = pool
+    server.output_dir = output_dir
+    server.lease_timeout = lease_timeout
+    server.verbose = verbose
+    server.jobs_run = 0
+    server.lock = threading.Lock()
+    server.started_at = time.monotonic()
+    return server
+
+
+def submit_job(job, host='127.0.0.1', port=DEFAULT_PORT, timeout=300):
+    """Sends a job to a running daemon and returns its JSON result (errors included)."""
+    request = urllib.request.Request(f"http://{host}:{port}/jobs", data=json.dumps(job).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)
+    except urllib.error.HTTPError as e:
+        return json.load(e)
+
+
+def _add_job_arguments(parser):
+    parser.add_argument('--indicator', default='temperature', help="country-list indicator slug (default: temperature)")
+    parser.add_argument('--sort', choices=SORTS, default='none', help='sort the table before scraping')
+    parser.add_argument('--format', choices=FORMATS, default='csv', help='output format (default: csv)')
+    parser.add_argument('--output', default=None, help=f"output path (default: under {DEFAULT_OUTPUT_DIR}/)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m webscraper.main', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scrape = commands.add_parser('scrape', help='run one scrape job in this process')
+    _add_job_arguments(scrape)
+    scrape.add_argument('--validate', action='store_true', help='check the arguments and exit without scraping')
+
+    serve = commands.add_parser('serve', help='run the warm-browser job daemon')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--browsers', type=int, default=1, help='warm browsers kept in the pool (default: 1)')
+    serve.add_argument('--max-rss-mb', type=float, default=1500,
+                       help='replace a browser whose processes use more memory than this (default: 1500)')
+    serve.add_argument('--max-pages', type=int, default=500,
+                       help='replace a browser after this many page loads (default: 500)')
+    serve.add_argument('--quiet', action='store_true', help='do not log every request')
+
+    submit = commands.add_parser('submit', help='send a job to a running daemon')
+    _add_job_arguments(submit)
+    submit.add_argument('--host', default='127.0.0.1')
+    submit.add_argument('--port', type=int, default=DEFAULT_PORT)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == 'serve':
+        pool = create_pool(args.browsers, args.max_rss_mb, args.max_pages)
+        print(f"Starting {args.browsers} browser(s)...")
+        warm_up(pool)
+        server = make_server(pool, args.host, args.port, verbose=not args.quiet)
+        print(f"Scraper daemon listening on http://{args.host}:{server.server_address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            pool.close()
+        return 0
+
+    spec = {'indicator': args.indicator, 'sort': args.sort, 'format': args.format, 'output': args.output}
+    if args.command == 'submit':
+        result = submit_job(spec, args.host, args.port)
+        print(json.dumps(result, indent=2))
+        return 1 if 'error' in result else 0
+
+    try:
+        job = parse_job(spec)
+    except JobError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if args.validate:
+        print(json.dumps(job))
+        return 0
+    pool = create_pool()
+    try:
+        result = run_job(job, pool)
+    finally:
+        pool.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Numeric normalization of scraped country tables.
+
+A scraped batch (list of row dicts or DataFrame) is turned into typed arrays
+in one vectorized pass over each column:
+
+    '1,234.5' -> 1234.5      thousands separators (also non-breaking/thin spaces)
+    '−3' / '-3' -> -3.0      Unicode minus and dashes as well as ASCII '-'
+    '' -> NaN                blanks are rejected with reason 'blank'
+    'n/a' -> NaN             anything else unparseable with reason 'invalid'
+
+Values in a known unit are converted to its canonical unit (Fahrenheit and
+Kelvin to Celsius); other units (e.g. 'USD Billion', 'percent') pass
+through unchanged. Nothing raises per row: callers get a validity mask and a
+list of rejects.
+
+Usage:
+    batch = normalize_batch(home_page.extract_table_data())
+    batch.values['Last']          # float64 array in Celsius
+    batch.valid                   # rows whose values all parsed
+    batch.rejects                 # [{'row': 3, 'Country': ..., 'column': 'Last', 'value': 'n/a', 'reason': 'invalid'}]
+"""
+import numpy as np
+import pandas as pd
+
+from .constants import indicator_label
+
+# Unit spellings seen on the site (after casefold, '°' and 'degrees' removed) -> unit name
+UNIT_ALIASES = {
+    'c': 'celsius', 'celsius': 'celsius', 'celcius': 'celsius',
+    'f': 'fahrenheit', 'fahrenheit': 'fahrenheit',
+    'k': 'kelvin', 'kelvin': 'kelvin',
+}
+# unit -> (canonical unit, scale, offset): canonical = value * scale + offset
+UNIT_CONVERSIONS = {
+    'celsius': ('celsius', 1.0, 0.0),
+    'fahrenheit': ('celsius', 5 / 9, -32 * 5 / 9),
+    'kelvin': ('celsius', 1.0, -273.15),
+}
+# Value columns of a scraped row, by their prefix before the indicator label
+VALUE_COLUMNS = ('Last', 'Previous')
+
+_GROUPING = "[,'\\s\u00a0\u2009\u202f]"
+_MINUS_SIGNS = "^[\u2212\u2012\u2013\u2014\ufe63\uff0d]"
+
+
+def parse_numbers(values):
+    """Scraped number strings ('1,234.5', '', ' −3 ') to float64, with NaN for anything unparseable."""
+    text = (pd.Series(values, dtype='string').str.strip()
+            .str.replace(_GROUPING, '', regex=True)
+            .str.replace(_MINUS_SIGNS, '-', regex=True))
+    return pd.to_numeric(text, errors='coerce').astype('float64')
+
+
+def canonical_unit(unit):
+    """Unit name used to look up conversions ('°F' -> 'fahrenheit'); unknown units come back casefolded."""
+    cleaned = ' '.join(str(unit).casefold().replace('°', ' ').replace('degrees', ' ').split())
+    return UNIT_ALIASES.get(cleaned, cleaned)
+
+
+class NormalizedBatch:
+    """Typed view of a scraped batch: one float64 array per value column plus masks and rejects."""
+
+    def __init__(self, countries, values, units, source_units, valid, rejects):
+        self.countries = countries
+        self.values = values
+        self.units = units
+        self.source_units = source_units
+        self.valid = valid
+        self.rejects = rejects
+
+    def __len__(self):
+        return len(self.countries)
+
+    @property
+    def invalid(self):
+        """Rejects other than blanks, i.e. values that are present but not numbers."""
+        return [reject for reject in self.rejects if reject['reason'] != 'blank']
+
+    def to_frame(self):
+        df = pd.DataFrame({'Country': pd.array(self.countries, dtype='string')})
+        for column, values in self.values.items():
+            df[column] = values
+        df['Unit'] = pd.Categorical(self.units)
+        return df
+
+
+def normalize_batch(data, indicator='temperature', convert_units=True):
+    """
+    Normalizes scraped rows of `indicator` ('Last_<Label>', 'Previous_<Label>', 'Unit' columns).
+    Every value column is parsed in one vectorized call; rows are never dropped.
+    """
+    label = indicator_label(indicator)
+    df = pd.DataFrame(data)
+    n = len(df)
+    countries = df['Country'].to_numpy(dtype=object) if 'Country' in df else np.full(n, None, dtype=object)
+    source_units = df['Unit'].fillna('').astype(str).to_numpy(dtype=object) if 'Unit' in df \
+        else np.full(n, '', dtype=object)
+
+    # Factorize units so each distinct spelling is resolved once
+    codes, distinct = pd.factorize(pd.Series(source_units, dtype=object))
+    names = [canonical_unit(unit) for unit in distinct]
+    # Units without a conversion keep their scraped spelling
+    conversions = [UNIT_CONVERSIONS[name] if convert_units and name in UNIT_CONVERSIONS
+                   else (str(unit).strip(), 1.0, 0.0) for name, unit in zip(names, distinct)]
+    scale = np.array([c[1] for c in conversions] + [1.0])[codes]
+    offset = np.array([c[2] for c in conversions] + [0.0])[codes]
+    units = np.array([c[0] for c in conversions] + [''], dtype=object)[codes]
+
+    values = {}
+    valid = np.ones(n, dtype=bool)
+    rejects = []
+    for column in VALUE_COLUMNS:
+        source = f'{column}_{label}'
+        raw = df[source] if source in df else pd.Series([None] * n, dtype=object)
+        parsed = parse_numbers(raw).to_numpy()
+        ok = ~np.isnan(parsed)
+        values[column] = parsed * scale + offset
+        valid &= ok
+        if not ok.all():
+            raw_text = raw.astype('string').str.strip().fillna('')
+            for row in np.flatnonzero(~ok):
+                value = raw_text.iat[row]
+                rejects.append({'row': int(row), 'Country': countries[row], 'column': column,
+                                'value': value, 'reason': 'blank' if value == '' else 'invalid'})
+    rejects.sort(key=lambda reject: reject['row'])
+    return NormalizedBatch(countries, values, units, source_units, valid, rejects)
@@ -0,0 +1,86 @@
+"""
+asyncio API for HomePage.
+
+Selenium's WebDriver client is blocking, so every page operation still runs
+the regular HomePage method, just on a worker thread. What this adds is the
+async surface: one process can drive many browser sessions concurrently
+under a shared semaphore, each call gets a timeout, and a cancelled or
+timed-out call never overlaps with the next command sent to the same browser.
+
+Every page needs its own driver. Tabs of one session share the driver's
+current window, so pages on the same driver would interleave their commands.
+
+Usage:
+    semaphore = asyncio.Semaphore(8)
+    pages = [AsyncHomePage(HomePage(driver), semaphore) for driver in drivers]
+    results = await asyncio.gather(*(page.scrape() for page in pages))
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+class AsyncHomePage:
+    """Awaitable wrapper around one HomePage (one browser session)."""
+
+    def __init__(self, page, semaphore=None, timeout=60, executor=None):
+        self.page = page
+        self.semaphore = semaphore or asyncio.Semaphore(1)
+        self.timeout = timeout
+        self.executor = executor
+        # The blocking call still running for this page, if an await was abandoned
+        self._inflight = None
+
+    async def _call(self, method, *args, timeout=None, **kwargs):
+        """Runs a blocking HomePage method on a worker thread under the semaphore and a timeout."""
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            if self._inflight is not None and not self._inflight.done():
+                # A previous call timed out or was cancelled but the browser is
+                # still busy with it; WebDriver sessions run one command at a time.
+                await asyncio.wait([self._inflight])
+            self._inflight = loop.run_in_executor(self.executor, partial(method, *args, **kwargs))
+            # shield(): a timeout/cancel abandons the await, not the running command
+            return await asyncio.wait_for(asyncio.shield(self._inflight), timeout or self.timeout)
+
+    async def load(self, timeout=None):
+        return await self._call(self.page.load, timeout=timeout)
+
+    async def get_header_text(self, timeout=None):
+        return await self._call(self.page.get_header_text, timeout=timeout)
+
+    async def click_country_header(self, timeout=None):
+        return await self._call(self.page.click_country_header, timeout=timeout)
+
+    async def click_last_temperature_header(self, timeout=None):
+        return await self._call(self.page.click_last_temperature_header, timeout=timeout)
+
+    async def search_country(self, country_name, timeout=None):
+        return await self._call(self.page.search_country, country_name, timeout=timeout)
+
+    async def extract_table_data(self, timeout=None, **kwargs):
+        return await self._call(self.page.extract_table_data, timeout=timeout, **kwargs)
+
+    async def scrape(self, timeout=None):
+        """load() followed by extract_table_data()."""
+        await self.load(timeout=timeout)
+        return await self.extract_table_data(timeout=timeout)
+
+
+async def scrape_pages(pages, concurrency=4, timeout=60):
+    """
+    Loads and scrapes every HomePage concurrently, at most `concurrency` at a time.
+    Returns one entry per page: its rows, or the exception that page raised.
+    """
+    drivers = [id(page.driver) for page in pages if getattr(page, 'driver', None) is not None]
+    if len(drivers) != len(set(drivers)):
+        raise ValueError("Every page needs its own driver; pages sharing one would interleave commands.")
+    semaphore = asyncio.Semaphore(concurrency)
+    # Not a `with` block: its shutdown(wait=True) would block the event loop until
+    # calls that already timed out come back from the browser
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='async-homepage')
+    try:
+        async_pages = [AsyncHomePage(page, semaphore, timeout, executor) for page in pages]
+        return await asyncio.gather(*(page.scrape() for page in async_pages), return_exceptions=True)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -3,10 +3,45 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
 import pandas as pd
-import time # Used sparingly, only to demonstrate a pause after search
+from ..backends import TemperatureTableParser
+from ..browser_profile import collect_network_report
+from ..constants import COUNTRY_ALIAS_KEYS, COUNTRY_LIST_URL, country_lookup_key, indicator_label
+from ..exporters import write_csv_chunks, write_parquet_dataset
+from ..history import HistoryStore
+from ..table_checks import MAX_OFFENDERS, build_checks, check_rows
+from ..instrumentation import TRACER, traced
+import os
+import time
+
+def disk_usage(*paths):
+    """Bytes taken by files and directory trees; missing paths count as 0."""
+    total = 0
+    for path in paths:
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+        for root, _, files in os.walk(path):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def parse_header_text(snapshot):
+    """Reads the <h1> text out of a cached page snapshot."""
+    parser = TemperatureTableParser()
+    parser.feed(snapshot)
+    return parser.header_text
+
 
 class HomePage:
+    """
+    Page object for a tradingeconomics.com country-list table.
+
+    Defaults to the temperature list; any other indicator with the same
+    layout works too, e.g. HomePage(driver, indicator='gdp'). Rows are keyed
+    Country, Last_<Label>, Previous_<Label> and Unit, where <Label> comes from
+    the indicator ('Temperature', 'Gdp', 'Inflation_Rate', ...).
+    """
     
     # --- LOCATORS (Centralized & Using XPath where specified) ---
     
@@ -30,98 +65,579 @@ class HomePage:
     
     # Locator for the 'Last' temperature table header
     LAST_TEMPERATURE_HEADER = (By.XPATH, "//th[contains(text(),'Last')]")
+
+    # Cookie consent button (only shown to some visitors)
+    COOKIE_ACCEPT_BUTTON = (By.XPATH, "//*[contains(text(), 'ACCEPT') or contains(text(), 'AGREE')]")
+
+    # Upper bound for a sort re-render; matches the fixed sleep this replaced
+    RERENDER_TIMEOUT = 3
+    # Quiet period after the last DOM mutation before the re-render counts as finished
+    RERENDER_SETTLE = 0.15
+
+    # --- NETWORK PROFILE (see webscraper/browser_profile.py) ---
+
+    # Third-party requests the table never needs; host-scoped so they cannot hit the site's own scripts
+    BLOCKED_URL_PATTERNS = [
+        '*://*google-analytics.com/*', '*://*googletagmanager.com/*', '*://*doubleclick.net/*',
+        '*://*googlesyndication.com/*', '*://adservice.google.*/*', '*://*amazon-adsystem.com/*',
+        '*://*facebook.net/*', '*://*hotjar.com/*', '*://*quantserve.com/*', '*://*scorecardresearch.com/*',
+        '*://fonts.googleapis.com/*', '*://fonts.gstatic.com/*', '*://code.highcharts.com/*',
+    ]
+    # Stylesheets stay: visibility checks (is_displayed, hidden rows) depend on them
+    BLOCKED_RESOURCE_TYPES = ('image', 'font', 'media')
+    # The page itself and its own scripts (sorting and search are client-side)
+    ALLOWED_URL_PATTERNS = [
+        '*://tradingeconomics.com/country-list/*',
+        '*://tradingeconomics.com/*.js*',
+    ]
+
+    # --- SCRIPTS ---
+
+    # Reads the table rows [start, end) in a single WebDriver round trip
+    # (the whole table when end is null) and returns them with the total <tr> count.
+    # Mirrors the per-element path below: rows with fewer than 5 cells or no
+    # country link are skipped, and cells that are not rendered read as ''
+    # (the same thing WebElement.text returns for hidden elements).
+    EXTRACT_TABLE_SCRIPT = """
+        var table = arguments[0], start = arguments[1] || 0, end = arguments[2], fields = arguments[3];
+        // Field index (0 country, 1 last, 2 previous, 3 unit) -> <td> index
+        var CELLS = [0, 1, 2, 4];
+        function visibleText(el) {
+            if (!el || !el.getClientRects().length) { return ''; }
+            return (el.innerText || '').replace(/\\s+/g, ' ').trim();
+        }
+        var data = [];
+        var rows = table.querySelectorAll(':scope > tbody > tr');
+        var stop = (end === null || end === undefined) ? rows.length : Math.min(end, rows.length);
+        for (var i = start; i < stop; i++) {
+            var cols = rows[i].querySelectorAll(':scope > td');
+            if (cols.length < 5) { continue; }
+            var link = cols[0].querySelector('a');
+            if (!link) { continue; }
+            if (!fields) {
+                data.push([visibleText(link), visibleText(cols[1]), visibleText(cols[2]), visibleText(cols[4])]);
+                continue;
+            }
+            // Projection: only the requested cells are read and sent back
+            data.push(fields.map(function (field) {
+                return field === 0 ? visibleText(link) : visibleText(cols[CELLS[field]]);
+            }));
+        }
+        return {rows: data, total: rows.length};
+    """
+
+    # Evaluates table_checks.build_checks() output in the page; returns the
+    # same verdict as table_checks.check_rows() without sending the rows back
+    CHECK_TABLE_SCRIPT = """
+        var table = arguments[0], checks = arguments[1], fields = arguments[2];
+        var CELLS = [0, 1, 2, 4];
+        function visibleText(el) {
+            if (!el || !el.getClientRects().length) { return ''; }
+            return (el.innerText || '').replace(/\\s+/g, ' ').trim();
+        }
+        function cellText(cols, link, field) {
+            return field === 0 ? visibleText(link) : visibleText(cols[CELLS[field]]);
+        }
+        function toNumber(text) {
+            var cleaned = text.replace(/[,'\\s\\u00a0\\u2009\\u202f]/g, '')
+                .replace(/^[\\u2212\\u2012\\u2013\\u2014\\ufe63\\uff0d]/, '-');
+            return cleaned === '' ? NaN : Number(cleaned);
+        }
+        var sort = checks.sorted_by, contains = checks.contains;
+        var offenders = [], previous = null, found = null, count = 0;
+        var rows = table.querySelectorAll(':scope > tbody > tr');
+        for (var i = 0; i < rows.length; i++) {
+            var cols = rows[i].querySelectorAll(':scope > td');
+            if (cols.length < 5) { continue; }
+            var link = cols[0].querySelector('a');
+            if (!link) { continue; }
+            var index = count++;
+            if (sort) {
+                var value = cellText(cols, link, fields[sort.column]);
+                var key = sort.numeric ? toNumber(value) : value;
+                if (!(sort.numeric && isNaN(key))) {
+                    if (previous !== null) {
+                        var outOfOrder = sort.descending ? key > previous[1] : key < previous[1];
+                        if (outOfOrder && offenders.length < checks.max_offenders) {
+                            offenders.push({row: index, previous: previous[0], value: value});
+                        }
+                    }
+                    previous = [value, key];
+                }
+            }
+            if (contains && found === null && cellText(cols, link, fields[contains.column]) === contains.value) {
+                found = index;
+            }
+        }
+        var verdict = {ok: true, rows: count, checks: {}};
+        if (sort) {
+            verdict.checks.sorted_by = {ok: offenders.length === 0, column: sort.column,
+                                        descending: sort.descending, offenders: offenders};
+        }
+        if (contains) {
+            verdict.checks.contains = {ok: found !== null, column: contains.column, value: contains.value, row: found};
+        }
+        if (checks.min_rows !== undefined) {
+            verdict.checks.min_rows = {ok: count >= checks.min_rows, min_rows: checks.min_rows, rows: count};
+        }
+        for (var name in verdict.checks) {
+            if (!verdict.checks[name].ok) { verdict.ok = false; }
+        }
+        return verdict;
+    """
+
+    # Clicks a header and resolves once the table's DOM stops changing.
+    # Watches the table's parent so a re-render that replaces the whole
+    # <table> element is seen as well. Resolves after `timeout` even if
+    # nothing changed (e.g. the table was already in that order).
+    CLICK_AND_WAIT_FOR_TABLE_CHANGE_SCRIPT = """
+        var header = arguments[0], table = arguments[1];
+        var settleMs = arguments[2], timeoutMs = arguments[3];
+        var done = arguments[arguments.length - 1];
+        var start = performance.now(), changed = false, finished = false, settleTimer = null;
+        var observer = new MutationObserver(function () {
+            changed = true;
+            clearTimeout(settleTimer);
+            settleTimer = setTimeout(finish, settleMs);
+        });
+        var timeoutTimer = setTimeout(finish, timeoutMs);
+        function finish() {
+            if (finished) { return; }
+            finished = true;
+            observer.disconnect();
+            clearTimeout(settleTimer);
+            clearTimeout(timeoutTimer);
+            done({changed: changed, elapsed: (performance.now() - start) / 1000});
+        }
+        observer.observe(table.parentNode || document.body, {childList: true, subtree: true, characterData: true});
+        header.click();
+    """
+
+    # constants.country_lookup_key() in JavaScript: same normalization, same alias map
+    COUNTRY_KEY_JS = """
+        function countryKey(name, aliases) {
+            var ascii = String(name).normalize('NFKD').replace(/[^\\x00-\\x7f]/g, '');
+            var words = ascii.toLowerCase().replace(/&/g, ' and ').replace(/[^0-9a-z]+/g, ' ').split(' ');
+            var key = words.filter(function (word) { return word; })
+                .map(function (word) { return word === 'saint' ? 'st' : word; }).join(' ');
+            return Object.prototype.hasOwnProperty.call(aliases, key) ? aliases[key] : key;
+        }
+    """
+
+    # Finds the rows for a set of country keys in one pass over the table and
+    # returns only those: {matches: {key: [country, last, previous, unit]}, total}
+    LOOKUP_COUNTRIES_SCRIPT = COUNTRY_KEY_JS + """
+        var table = arguments[0], wanted = arguments[1], aliases = arguments[2];
+        function visibleText(el) {
+            if (!el || !el.getClientRects().length) { return ''; }
+            return (el.innerText || '').replace(/\\s+/g, ' ').trim();
+        }
+        var want = {};
+        wanted.forEach(function (key) { want[key] = true; });
+        var matches = {}, found = 0;
+        var rows = table.querySelectorAll(':scope > tbody > tr');
+        for (var i = 0; i < rows.length && found < wanted.length; i++) {
+            var cols = rows[i].querySelectorAll(':scope > td');
+            if (cols.length < 5) { continue; }
+            var link = cols[0].querySelector('a');
+            if (!link) { continue; }
+            var country = visibleText(link), key = countryKey(country, aliases);
+            if (want[key] && !matches[key]) {
+                matches[key] = [country, visibleText(cols[1]), visibleText(cols[2]), visibleText(cols[4])];
+                found++;
+            }
+        }
+        return {matches: matches, total: rows.length};
+    """
+
+    # Cheap content fingerprint of the table body: two independent 32-bit
+    # hashes of its text (FNV-1a and a Murmur-style mix), row count and length.
+    # incremental_scrape() skips extraction when it matches, so one 32-bit
+    # hash alone would let a collision hide a changed table.
+    TABLE_FINGERPRINT_SCRIPT = """
+        var table = document.evaluate(arguments[0], document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (!table) { return null; }
+        var body = table.tBodies[0] || table, text = body.textContent;
+        var fnv = 0x811c9dc5, murmur = 0x9747b28c;
+        for (var i = 0; i < text.length; i++) {
+            var code = text.charCodeAt(i);
+            fnv = Math.imul(fnv ^ code, 0x01000193);
+            murmur = Math.imul(murmur ^ code, 0x5bd1e995);
+            murmur ^= murmur >>> 15;
+        }
+        return (fnv >>> 0).toString(16) + '-' + (murmur >>> 0).toString(16) + ':' +
+            body.rows.length + ':' + text.length;
+    """
     
-    def __init__(self, driver):
+    def __init__(self, driver, cache=None, indicator="temperature", tracer=None, scheduler=None):
         self.driver = driver
-        self.url = "https://tradingeconomics.com/country-list/temperature"
+        # Spans for every public method (see webscraper/instrumentation.py)
+        self.tracer = tracer or TRACER
+        # Optional shared RequestScheduler: rate limit, retries and circuit breaker for page loads
+        if scheduler is not None and scheduler.request_timeout is not None:
+            # A timed-out attempt would keep driving this browser from the scheduler's helper thread
+            raise ValueError("HomePage needs a scheduler without request_timeout; "
+                             "page loads are bounded by HomePage.deadline instead.")
+        self.scheduler = scheduler
+        self.indicator = indicator
+        self.url = COUNTRY_LIST_URL.format(indicator=indicator)
+        self.value_label = indicator_label(indicator)
+        # Optional run-level PageCache shared between page objects
+        self.cache = cache
+        # Interactions applied since load(); None once the page was mutated in an uncacheable way
+        self.state = ()
+        # True while load() was answered from the cache and the browser has not navigated yet
+        self._navigation_pending = False
+        # Seconds spent waiting in the last call of each step, e.g. wait_times['click_country_header']
+        self.wait_times = {}
+        # Requests/bytes loaded and blocked during the last navigation (None without a scraping profile)
+        self.network_report = None
+        # time.monotonic() after which page loads and explicit waits give up (set by SeleniumBackend for timed jobs)
+        self.deadline = None
+        self._cookie_banner_handled = False
+
+    def _wait_until(self, timeout, condition, poll_frequency=0.5):
+        """WebDriverWait(...).until() with the time spent counted as waiting in the current trace span."""
+        if self.deadline is not None:
+            timeout = max(0, min(timeout, self.deadline - time.monotonic()))
+        with self.tracer.waiting():
+            return WebDriverWait(self.driver, timeout, poll_frequency=poll_frequency).until(condition)
 
+    @traced
     def load(self):
-        """Navigates to the home page URL."""
+        """Navigates to the home page URL (deferred if the unsorted page is already cached)."""
+        self.state = ()
+        if self.cache is not None and self.cache.get(self.url, self.state) is not None:
+            # Read-only callers are served from the snapshot; the browser only
+            # navigates if a live interaction (sort, search) is needed later.
+            self._navigation_pending = True
+            return
+        self._navigate()
+
+    def _ensure_loaded(self):
+        """Performs the navigation deferred by a cache hit in load()."""
+        if self._navigation_pending:
+            self._navigate()
+
+    def invalidate_cache(self):
+        """Drops every cached snapshot of this page, e.g. after the page was changed."""
+        if self.cache is not None:
+            self.cache.invalidate(self.url)
+
+    def _navigate(self):
+        self._navigation_pending = False
+        if self.scheduler is not None:
+            # A throttled or failed load is retried with backoff instead of failing the run
+            self.scheduler.run(self.url, self._open_page)
+        else:
+            self._open_page()
+
+        if not self._cookie_banner_handled:
+            self._accept_cookie_banner()
+        if not self._cookie_banner_handled:
+            print("No cookie banner found or could not be clicked.")
+
+        self.network_report = collect_network_report(self.driver, type(self))
+        if self.network_report:
+            print(f"Blocked {self.network_report['blocked_requests']} of {self.network_report['requests']} requests, "
+                  f"{self.network_report['bytes_loaded']} bytes loaded.")
+
+    def _open_page(self):
+        """One navigation attempt: get() plus the wait for the header."""
+        if self.deadline is not None:
+            # The browser stops the load at the deadline; the scheduler sees a TimeoutException
+            self.driver.set_page_load_timeout(max(0, self.deadline - time.monotonic()))
         self.driver.get(self.url)
-        
+        self._cookie_banner_handled = False
+        self.wait_times['cookie_banner'] = 0.0
+
+        # Wait until the main header is present to confirm the page has started loading.
+        # The cookie banner is checked on every poll instead of blocking for it up front.
+        start = time.perf_counter()
+        self._wait_until(20, self._header_present_or_accept_banner)
+        self.wait_times['load'] = time.perf_counter() - start
+
+    def _header_present_or_accept_banner(self, driver):
+        """WebDriverWait condition: accepts the cookie banner if shown, then checks for the header."""
+        if not self._cookie_banner_handled:
+            self._accept_cookie_banner()
+        headers = driver.find_elements(*self.HEADER_TEXT)
+        return headers[0] if headers else False
+
+    def _accept_cookie_banner(self):
+        """Clicks the cookie banner if it is on screen right now; never waits for it."""
+        start = time.perf_counter()
+        try:
+            for button in self.driver.find_elements(*self.COOKIE_ACCEPT_BUTTON):
+                if button.is_displayed() and button.is_enabled():
+                    button.click()
+                    self._cookie_banner_handled = True
+                    print("Cookie banner accepted.")
+                    break
+        except WebDriverException:
+            pass
+        self.wait_times['cookie_banner'] += time.perf_counter() - start
+
+    @traced
+    def table_fingerprint(self):
+        """Returns a 64-bit hash plus row count of the table body, or None if the table is not on the page."""
+        self._ensure_loaded()
+        return self.driver.execute_script(self.TABLE_FINGERPRINT_SCRIPT, self.TABLE_BODY_ROWS[1])
+
+    def _click_and_wait_for_rerender(self, header_locator):
+        """
+        Clicks a sort header and returns as soon as the table has re-rendered; returns the wait in seconds.
+        A click after which the table did not change within RERENDER_TIMEOUT is reported.
+        """
+        header = self._wait_until(10, EC.presence_of_element_located(header_locator))
+        table = self.driver.find_element(*self.TABLE_BODY_ROWS)
+        start = time.perf_counter()
         try:
-            accept_button = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//*[contains(text(), 'ACCEPT') or contains(text(), 'AGREE')]"))
+            result = self.driver.execute_async_script(
+                self.CLICK_AND_WAIT_FOR_TABLE_CHANGE_SCRIPT, header, table,
+                int(self.RERENDER_SETTLE * 1000), int(self.RERENDER_TIMEOUT * 1000)
             )
-            accept_button.click()
-            print("Cookie banner accepted.")
-        except:
-            print("No cookie banner found or could not be clicked.")
-        
-        # Wait until the main header is present to confirm the page has started loading
-        WebDriverWait(self.driver, 20).until(
-            EC.presence_of_element_located(self.HEADER_TEXT)
-        )
+        except TimeoutException:
+            # Script timeout: the click went through, the page just never reported back
+            elapsed = time.perf_counter() - start
+            self.tracer.add_wait(elapsed)
+            print(f"Table re-render after clicking {header_locator[1]} was not reported within "
+                  f"{elapsed:.1f}s; reading the table as it is.")
+            return elapsed
+        except JavascriptException:
+            # The script failed before clicking: poll the content fingerprint instead
+            return self._click_and_poll_fingerprint(header, header_locator)
+        # The script spends nearly all of its time waiting for the DOM to settle
+        self.tracer.add_wait(result['elapsed'])
+        if not result['changed']:
+            self._report_unchanged_table(header_locator)
+        return result['elapsed']
+
+    def _click_and_poll_fingerprint(self, header, header_locator):
+        before = self.table_fingerprint()
+        start = time.perf_counter()
+        self.driver.execute_script("arguments[0].click();", header)
+        try:
+            self._wait_until(self.RERENDER_TIMEOUT, lambda driver: self.table_fingerprint() != before,
+                             poll_frequency=self.RERENDER_SETTLE)
+        except TimeoutException:
+            self._report_unchanged_table(header_locator)
+        return time.perf_counter() - start
+
+    def _report_unchanged_table(self, header_locator):
+        # Usually a click that never reached the header; a table already in that order looks the same
+        print(f"Warning: the table did not change within {self.RERENDER_TIMEOUT}s of clicking {header_locator[1]}.")
 
+    @traced
     def click_country_header(self):
         """Clicks the 'Country' table header to sort the table."""
-        header = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(self.COUNTRY_HEADER)
-        )
-        self.driver.execute_script("arguments[0].click();", header)
-        # Add a small delay to allow the table to re-render
-        time.sleep(3)
+        self._ensure_loaded()
+        self.wait_times['click_country_header'] = self._click_and_wait_for_rerender(self.COUNTRY_HEADER)
+        self._record_interaction('sort:country')
         
+    @traced
     def click_last_temperature_header(self):
         """Clicks the 'Last' temperature table header to sort the table."""
-        header = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located(self.LAST_TEMPERATURE_HEADER)
-        )
-        self.driver.execute_script("arguments[0].click();", header)
-        # Add a small delay to allow the table to re-render
-        time.sleep(3)
+        self._ensure_loaded()
+        self.wait_times['click_last_temperature_header'] = self._click_and_wait_for_rerender(self.LAST_TEMPERATURE_HEADER)
+        self._record_interaction('sort:last')
 
+    def _record_interaction(self, interaction):
+        """Extends the cache state key; stays None once the page is uncacheable."""
+        if self.state is not None:
+            self.state = self.state + (interaction,)
+
+    @traced
     def is_no_results_message_displayed(self):
         """Checks if the 'No results found' message is displayed."""
+        self._ensure_loaded()
         try:
-            message_element = WebDriverWait(self.driver, 5).until(
-                EC.visibility_of_element_located(self.NO_RESULTS_MESSAGE)
-            )
+            message_element = self._wait_until(5, EC.visibility_of_element_located(self.NO_RESULTS_MESSAGE))
             # Add debug print to show the actual text found
             print(f"DEBUG: Text found in 'no results' element: '{message_element.text.strip()}'")
             return True
         except:
             return False
 
+    @traced
     def get_header_text(self):
         """Gets the main header text for positive assertion."""
+        if self._navigation_pending:
+            entry = self.cache.get(self.url, self.state)
+            header_text = parse_header_text(entry.snapshot) if entry is not None else None
+            if header_text:
+                return header_text
+            self._ensure_loaded()
+
         # Note: We rely on the wait in the load method, but we wait again to ensure visibility
-        WebDriverWait(self.driver, 5).until(
-            EC.visibility_of_element_located(self.HEADER_TEXT)
-        )
+        self._wait_until(5, EC.visibility_of_element_located(self.HEADER_TEXT))
         return self.driver.find_element(*self.HEADER_TEXT).text
 
+    @traced
     def search_country(self, country_name):
-        """Simulates a user searching for a country and waits for results."""
+        """
+        Simulates a user searching for a country and waits for results. To check
+        which countries are in the table, lookup_countries() is far cheaper.
+        """
+        self._ensure_loaded()
+        # The filtered table depends on what was typed, so never cache it
+        self.state = None
+
         # First, click on the search input to activate it
-        search_box = WebDriverWait(self.driver, 30).until(
-            EC.element_to_be_clickable(self.SEARCH_INPUT)
-        )
+        search_box = self._wait_until(30, EC.element_to_be_clickable(self.SEARCH_INPUT))
         search_box.click()
         search_box.clear()
         search_box.send_keys(country_name)
         
         # Use a brief pause to allow the JavaScript filtering to complete
         # Wait for either the table rows to update or the no results message to appear
-        WebDriverWait(self.driver, 10).until(
-            EC.any_of(
-                EC.presence_of_element_located(self.TABLE_BODY_ROWS),
-                EC.presence_of_element_located(self.NO_RESULTS_MESSAGE)
-            )
-        )
+        self._wait_until(10, EC.any_of(
+            EC.presence_of_element_located(self.TABLE_BODY_ROWS),
+            EC.presence_of_element_located(self.NO_RESULTS_MESSAGE)
+        ))
 
-    def extract_table_data(self):
-        """Scrapes all visible data rows from the table."""
-        data = []
-        
+    @traced
+    def lookup_countries(self, names, use_cache=True):
+        """
+        Answers "which of these countries are in the table, and with what values" in one call,
+        without touching the search box. Returns {name: row or None} in the order given; names
+        match across case, accents and known aliases ('USA' finds 'United States'). Served from
+        the cached rows when this page state is cached, otherwise by one script in the page.
+        """
+        keys = {name: country_lookup_key(name) for name in names}
+        if use_cache and self.cache is not None and self.state is not None:
+            entry = self.cache.get(self.url, self.state)
+            if entry is not None:
+                index = {}
+                for row in entry.rows:
+                    index.setdefault(country_lookup_key(row['Country']), row)
+                return {name: dict(index[key]) if key in index else None for name, key in keys.items()}
+
+        self._ensure_loaded()
+        table = self._wait_until(20, EC.presence_of_element_located(self.TABLE_BODY_ROWS))
+        result = self.driver.execute_script(self.LOOKUP_COUNTRIES_SCRIPT, table,
+                                            sorted(set(keys.values())), COUNTRY_ALIAS_KEYS)
+        matches = result['matches']
+        return {name: self._make_row(*matches[key]) if key in matches else None for name, key in keys.items()}
+
+    @traced
+    def extract_table_data(self, use_script=True, use_cache=True, columns=None):
+        """
+        Scrapes all visible data rows from the table (served from the cache when possible).
+        `columns`, e.g. ['Country'], limits each row to those keys; only they are read in the page.
+        """
+        # Rejects unknown columns before the cache or the browser is touched
+        self._field_indexes(columns)
+        cacheable = self.cache is not None and self.state is not None
+        if cacheable and use_cache:
+            entry = self.cache.get(self.url, self.state)
+            if entry is not None:
+                if columns is not None:
+                    return [{column: row[column] for column in columns} for row in entry.rows]
+                return [dict(row) for row in entry.rows]
+
+        self._ensure_loaded()
+        data = self._scrape_table(use_script, columns)
+        # Only complete rows are worth caching
+        if cacheable and columns is None:
+            self.cache.put(self.url, self.state, self.driver.page_source, data)
+        return data
+
+    def _scrape_table(self, use_script=True, columns=None):
+        """Reads every row of the live table in the browser."""
+        return [row for batch in self.iter_table_batches(None, use_script, columns) for row in batch]
+
+    def _column_names(self):
+        """Row keys in field order: 0 country, 1 last, 2 previous, 3 unit (as in the page scripts)."""
+        return ['Country', f'Last_{self.value_label}', f'Previous_{self.value_label}', 'Unit']
+
+    def _field_indexes(self, columns):
+        """Field indexes of the requested row keys, or None for whole rows."""
+        if columns is None:
+            return None
+        names = self._column_names()
+        unknown = [column for column in columns if column not in names]
+        if unknown:
+            raise ValueError(f"Unknown columns {unknown} (expected some of {names})")
+        return [names.index(column) for column in columns]
+
+    @traced
+    def check_table(self, sorted_by=None, descending=False, contains=None, min_rows=None,
+                    max_offenders=MAX_OFFENDERS, use_cache=True):
+        """
+        Checks the table without scraping it: sorted by a column, contains (column, value),
+        at least `min_rows` rows. Runs in the page (or over cached rows) and returns only
+        the verdict and up to `max_offenders` offending rows per check; see table_checks.py.
+        """
+        checks = build_checks(sorted_by, descending, contains, min_rows, max_offenders)
+        columns = [column for column in (sorted_by, contains[0] if contains else None) if column is not None]
+        self._field_indexes(columns)
+
+        if use_cache and self.cache is not None and self.state is not None:
+            entry = self.cache.get(self.url, self.state)
+            if entry is not None:
+                return check_rows(entry.rows, checks)
+
+        self._ensure_loaded()
+        table = self._wait_until(20, EC.presence_of_element_located(self.TABLE_BODY_ROWS))
+        fields = {name: index for index, name in enumerate(self._column_names())}
+        return self.driver.execute_script(self.CHECK_TABLE_SCRIPT, table, checks, fields)
+
+    def iter_table_rows(self, batch_size=500, use_script=True):
+        """Yields rows as they are read from the live table, one WebDriver round trip per batch."""
+        for batch in self.iter_table_batches(batch_size, use_script):
+            yield from batch
+
+    def iter_table_batches(self, batch_size=500, use_script=True, columns=None):
+        """
+        Yields the live table's rows in lists of at most `batch_size` rows
+        (the whole table in one list when batch_size is None), so large
+        tables can be written out before the last row has been read.
+        """
+        fields = self._field_indexes(columns)
+        self._ensure_loaded()
         # Wait for the table to ensure data has loaded 
-        table = WebDriverWait(self.driver, 20).until(
-            EC.presence_of_element_located(self.TABLE_BODY_ROWS)
-        )
-        
+        table = self._wait_until(20, EC.presence_of_element_located(self.TABLE_BODY_ROWS))
+
+        # Index of the first <tr> not yet returned, so a fallback resumes where the script stopped
+        start = 0
+        if use_script:
+            # Fast path: one execute_script call per batch
+            try:
+                while True:
+                    end = start + batch_size if batch_size else None
+                    if fields is None:
+                        result = self.driver.execute_script(self.EXTRACT_TABLE_SCRIPT, table, start, end)
+                        batch = [self._make_row(*row) for row in result['rows']]
+                    else:
+                        result = self.driver.execute_script(self.EXTRACT_TABLE_SCRIPT, table, start, end, fields)
+                        batch = [dict(zip(columns, row)) for row in result['rows']]
+                    total = result['total']
+                    if batch:
+                        yield batch
+                    if end is None or end >= total:
+                        return
+                    start = end
+            except (WebDriverException, KeyError, TypeError, ValueError) as e:
+                print(f"In-page extraction failed, falling back to per-element scraping: {e}")
+
+        batch = []
+        for row in self._iter_rows_by_element(table, start):
+            if columns is not None:
+                row = {column: row[column] for column in columns}
+            batch.append(row)
+            if batch_size and len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _iter_rows_by_element(self, table, start=0):
+        """Scrapes the table one WebDriver call per row and cell, from the `start`-th <tr> on (slow fallback path)."""
         rows = table.find_elements(By.XPATH, "./tbody/tr")
         
-        for row in rows:
+        for row in rows[start:]:
             # Locate all <td> elements within the current row
             # We use XPath here to get the list of columns within the current row element
             cols = row.find_elements(By.XPATH, "./td")
@@ -136,19 +652,54 @@ class HomePage:
                     # Column 5: Unit (e.g., 'Celsius')
                     unit = cols[4].text 
                     
-                    data.append({
-                        'Country': country,
-                        'Last_Temperature': last,
-                        'Previous_Temperature': previous,
-                        'Unit': unit
-                    })
+                    yield self._make_row(country, last, previous, unit)
                 except Exception as e:
                     # Skip row if any expected element is missing (e.g., if a row is empty)
                     # print(f"Skipping row due to missing element: {e}")
                     continue
-                    
-        return data
         
+    def _make_row(self, country, last, previous, unit):
+        """Builds one output row; keys follow the indicator (Last_Temperature for the default page)."""
+        return {
+            'Country': country,
+            f'Last_{self.value_label}': last,
+            f'Previous_{self.value_label}': previous,
+            'Unit': unit
+        }
+
+    @traced
+    def export(self, data, path, fmt='csv'):
+        """
+        Exports rows as 'csv' (a file at path), 'parquet' (appended to the
+        dataset directory at path) or 'history' (upserted into the SQLite
+        history store at path).
+        """
+        if fmt == 'csv':
+            return self.export_to_csv(data, path)
+        if fmt == 'parquet':
+            # New files only: earlier runs' files in the dataset are not rewritten
+            before = disk_usage(path)
+            count = write_parquet_dataset(data, path, indicator=self.indicator)
+            self.tracer.add_bytes(disk_usage(path) - before)
+            return count
+        if fmt == 'history':
+            # Growth of the database and its write-ahead log (upserts in place add nothing)
+            before = disk_usage(path, path + '-wal')
+            with HistoryStore(path) as store:
+                count = store.write(data, indicator=self.indicator)
+            self.tracer.add_bytes(max(0, disk_usage(path, path + '-wal') - before))
+            return count
+        raise ValueError(f"Unknown export format: {fmt!r} (expected 'csv', 'parquet' or 'history')")
+
+    @traced
+    def stream_to_csv(self, filename, batch_size=500):
+        """Streams the live table straight to a CSV file, batch by batch; returns the number of rows written."""
+        count = write_csv_chunks(self.iter_table_rows(batch_size), filename, chunk_size=batch_size)
+        self.tracer.add_bytes(os.path.getsize(filename))
+        print(f"Successfully streamed {count} rows to the file named: {filename}")
+        return count
+
+    @traced
     def export_to_csv(self, data, filename):
         """Exports the list of dictionaries to a CSV file."""
         if not data:
@@ -158,4 +709,5 @@ class HomePage:
         df = pd.DataFrame(data)
         # Export to the root directory for easy access
         df.to_csv(filename, index=False)
+        self.tracer.add_bytes(os.path.getsize(filename))
         print(f"Successfully exported {len(data)} rows to the file named: {filename}")
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Regional partitioning of scraped country tables.
+
+The whole table is mapped to regions in one pass: names are factorized so
+each distinct country is normalized and looked up in
+constants.COUNTRY_TO_REGION only once, and all regional files are written
+from a single groupby. Countries missing from REGION_MAP are reported
+instead of silently dropped.
+"""
+import os
+
+import pandas as pd
+
+from .constants import COUNTRY_TO_REGION, REGION_MAP, indicator_label, normalize_country_name
+from .normalize import normalize_batch
+
+
+def assign_regions(data, country_column='Country'):
+    """Returns a copy of the rows (list of dicts or DataFrame) with a categorical 'Region' column."""
+    df = pd.DataFrame(data).copy()
+    if df.empty:
+        df['Region'] = pd.Categorical([], categories=list(REGION_MAP))
+        return df
+    codes, names = pd.factorize(df[country_column])
+    # One lookup per distinct name; the trailing None is what code -1 (missing name) picks
+    regions = pd.Series([COUNTRY_TO_REGION.get(normalize_country_name(name)) for name in names] + [None], dtype=object)
+    df['Region'] = pd.Categorical(regions.to_numpy()[codes], categories=list(REGION_MAP))
+    return df
+
+
+def export_by_region(data, output_dir, filename_template="{region}_temperature_data.csv", country_column='Country',
+                     numeric=False, indicator='temperature'):
+    """
+    Writes one CSV per region and returns (written, unmatched): a dict of
+    region -> (file path, row count), and the sorted country names that are
+    not in REGION_MAP. With numeric=True the value columns are written as
+    normalized numbers in the canonical unit instead of the scraped strings.
+    """
+    df = assign_regions(data, country_column)
+    if numeric and not df.empty:
+        label = indicator_label(indicator)
+        batch = normalize_batch(df, indicator)
+        df[f'Last_{label}'] = batch.values['Last']
+        df[f'Previous_{label}'] = batch.values['Previous']
+        df['Unit'] = batch.units
+    unmatched = sorted(df.loc[df['Region'].isna(), country_column].unique()) if not df.empty else []
+    if unmatched:
+        print(f"WARNING: {len(unmatched)} countries have no region: {', '.join(unmatched)}")
+
+    written = {}
+    for region, group in df.groupby('Region', observed=True):
+        path = os.path.join(output_dir, filename_template.format(region=region.lower()))
+        group.drop(columns='Region').to_csv(path, index=False)
+        written[region] = (path, len(group))
+    return written, unmatched
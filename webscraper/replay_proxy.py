@@ -0,0 +1,263 @@
+"""
+Record/replay HTTP(S) proxy for deterministic, offline browser sessions.
+
+In record mode the proxy forwards every request the browser makes and saves
+the response (status, headers, body) into an archive directory. In replay
+mode it answers only from the archive: recorded responses come back at
+local-disk speed, and requests that were never recorded get a 404 and are
+listed in `missing` instead of going to the network.
+
+HTTPS goes through CONNECT; the proxy terminates TLS itself with a
+self-signed certificate generated with the openssl command-line tool, so the
+browser has to run with --ignore-certificate-errors (see
+browser_profile.create_scraping_driver).
+
+Usage:
+    with run_proxy('archives/homepage', mode='record') as proxy:
+        driver = create_scraping_driver(HomePage, proxy=proxy.address)
+        ...
+    with run_proxy('archives/homepage', mode='replay') as proxy:
+        ...
+        print(proxy.missing)
+"""
+from contextlib import contextmanager
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+# Connection-level headers that must not be copied between the two legs
+HOP_BY_HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization', 'proxy-connection',
+    'te', 'trailers', 'transfer-encoding', 'upgrade', 'content-length',
+}
+
+
+class ArchiveError(RuntimeError):
+    """The archive or the TLS certificate could not be set up."""
+
+
+def request_key(method, url, body=b''):
+    """Archive key of a request: method and full URL, plus a body hash for requests that carry one."""
+    key = f"{method} {url}"
+    if body:
+        key += f" {hashlib.sha1(body).hexdigest()}"
+    return key
+
+
+class Archive:
+    """
+    Responses on disk: index.jsonl holds one line per response (key, status,
+    headers, body file) and bodies/ holds the raw, still encoded bodies.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = os.path.join(path, 'index.jsonl')
+        self.bodies_dir = os.path.join(path, 'bodies')
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    entry = json.loads(line)
+                    # Later recordings of the same request win
+                    self.entries[entry['key']] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Returns (status, headers, body) for `key`, or None if it was never recorded."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        with open(os.path.join(self.bodies_dir, entry['body']), 'rb') as f:
+            return entry['status'], entry['headers'], f.read()
+
+    def add(self, key, status, headers, body):
+        body_name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        entry = {'key': key, 'status': status, 'headers': headers, 'body': body_name}
+        with self._lock:
+            os.makedirs(self.bodies_dir, exist_ok=True)
+            with open(os.path.join(self.bodies_dir, body_name), 'wb') as f:
+                f.write(body)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+            self.entries[key] = entry
+
+
+def make_certificate(directory, common_name='webscraper-replay-proxy'):
+    """Creates a self-signed certificate and key with openssl; returns (cert_path, key_path)."""
+    if shutil.which('openssl') is None:
+        raise ArchiveError("The openssl command is needed to proxy HTTPS traffic.")
+    cert_path = os.path.join(directory, 'proxy-cert.pem')
+    key_path = os.path.join(directory, 'proxy-key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '30',
+         '-keyout', key_path, '-out', cert_path, '-subj', f"/CN={common_name}"],
+        check=True, capture_output=True,
+    )
+    return cert_path, key_path
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Hands redirects back to the browser instead of following them in the proxy."""
+
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_UPSTREAM = urllib.request.build_opener(urllib.request.ProxyHandler({}), _NoRedirect())
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Forward proxy: absolute-form requests for HTTP, CONNECT plus local TLS for HTTPS."""
+
+    protocol_version = 'HTTP/1.1'
+    tunnel_origin = None
+
+    def do_CONNECT(self):
+        if self.server.ssl_context is None:
+            self.send_error(501, "HTTPS is not available on this proxy")
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        host, _, port = self.path.partition(':')
+        self.tunnel_origin = f"https://{host}" if port in ('', '443') else f"https://{self.path}"
+        try:
+            tls = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        except (ssl.SSLError, OSError):
+            self.close_connection = True
+            return
+        # Keep reading requests, now from inside the tunnel
+        self.connection = tls
+        self.rfile = tls.makefile('rb', self.rbufsize)
+        self.wfile = tls.makefile('wb', 0)
+        self.close_connection = False
+
+    def _target_url(self):
+        if self.tunnel_origin:
+            return self.tunnel_origin + self.path
+        return self.path
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        url = self._target_url()
+        if not urlsplit(url).scheme:
+            self.send_error(400, "Not a proxy request")
+            return
+        key = request_key(self.command, url, body)
+        if self.server.mode == 'record':
+            status, headers, payload = self._fetch(url, body)
+            if status is None:
+                self.send_error(502, "Upstream request failed")
+                return
+            self.server.archive.add(key, status, headers, payload)
+        else:
+            recorded = self.server.archive.get(key)
+            if recorded is None:
+                self.server.report_missing(key)
+                self.send_error(404, "Not recorded")
+                return
+            status, headers, payload = recorded
+        self._respond(status, headers, payload)
+
+    def _fetch(self, url, body):
+        headers = {name: value for name, value in self.headers.items()
+                   if name.lower() not in HOP_BY_HOP_HEADERS and name.lower() != 'host'}
+        request = urllib.request.Request(url, data=body or None, headers=headers, method=self.command)
+        try:
+            with _UPSTREAM.open(request, timeout=self.server.upstream_timeout) as response:
+                return response.status, list(response.headers.items()), response.read()
+        except urllib.error.HTTPError as e:
+            # Error statuses and redirects are responses worth recording too
+            return e.code, list(e.headers.items()), e.read()
+        except (urllib.error.URLError, OSError):
+            return None, None, None
+
+    def _respond(self, status, headers, payload):
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() not in HOP_BY_HOP_HEADERS:
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = _handle
+
+    def finish(self):
+        super().finish()
+        # The TLS socket replaced the one socketserver knows about, so close it here
+        if self.tunnel_origin:
+            try:
+                self.connection.close()
+            except OSError:
+                pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordReplayProxy(ThreadingHTTPServer):
+    """Proxy server in 'record' or 'replay' mode over one archive directory."""
+
+    daemon_threads = True
+
+    def __init__(self, archive_path, mode='replay', host='127.0.0.1', port=0, https=True, upstream_timeout=30):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown proxy mode: {mode!r} (expected 'record' or 'replay')")
+        if mode == 'replay' and not os.path.exists(os.path.join(archive_path, 'index.jsonl')):
+            raise ArchiveError(f"No recorded archive at {archive_path}; record one first.")
+        super().__init__((host, port), ProxyHandler)
+        self.archive = Archive(archive_path)
+        self.mode = mode
+        self.upstream_timeout = upstream_timeout
+        self.missing = []
+        self._missing_lock = threading.Lock()
+        self.ssl_context = None
+        if https:
+            self._cert_dir = tempfile.TemporaryDirectory()
+            self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.ssl_context.load_cert_chain(*make_certificate(self._cert_dir.name))
+
+    @property
+    def address(self):
+        """host:port, as expected by Chrome's --proxy-server."""
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def report_missing(self, key):
+        with self._missing_lock:
+            if key not in self.missing:
+                self.missing.append(key)
+
+    def server_close(self):
+        super().server_close()
+        if self.ssl_context is not None:
+            self._cert_dir.cleanup()
+
+
+@contextmanager
+def run_proxy(archive_path, mode='replay', host='127.0.0.1', port=0, https=True):
+    """Runs a RecordReplayProxy on a background thread and yields it."""
+    proxy = RecordReplayProxy(archive_path, mode, host, port, https)
+    thread = threading.Thread(target=proxy.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield proxy
+    finally:
+        proxy.shutdown()
+        proxy.server_close()
+        thread.join()
@@ -0,0 +1,320 @@
+"""
+Shared request scheduler for page loads and crawl jobs.
+
+Every request names a URL; its host gets its own:
+
+    token bucket     - sustained rate (requests/second) with a small burst
+    adaptive limit   - concurrent requests, raised slowly while requests are
+                       fast and successful, halved on errors or slow responses
+                       (additive increase, multiplicative decrease)
+    circuit breaker  - after `failure_threshold` failures in a row the host is
+                       paused for `reset_timeout` seconds, then one trial
+                       request decides whether it opens again
+
+Failed attempts are retried with exponential backoff and full jitter.
+Errors outside `retry_on` (a missing table, a bug, no free local browser)
+say nothing about the host: they are raised at once and neither trip the
+breaker nor lower the limit.
+
+With a `request_timeout` (or run(..., timeout=...)) every attempt runs on a
+helper thread, and one that does not return in time counts as a failed
+attempt and gives its concurrency slot back. The call itself is abandoned,
+so this only suits work that is also told the deadline and owns what it
+touches; the crawler passes the job timeout to its backends. HomePage
+drives a shared browser session, so it refuses a scheduler with a
+request_timeout and bounds its loads in the browser instead (page load
+timeout and HomePage.deadline).
+metrics() returns per-host counters for tuning the rate and limits.
+
+Usage:
+    scheduler = RequestScheduler(rate=0.5, burst=2, max_concurrency=4)
+    home_page = HomePage(driver, scheduler=scheduler)   # load() goes through the scheduler
+    result = crawl_indicators(indicators, scheduler=scheduler)   # attempts limited to job_timeout
+    print(scheduler.metrics())
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+# Failures worth another attempt: network errors, timeouts and browser-side timeouts
+RETRYABLE_EXCEPTIONS = (OSError, TimeoutError, WebDriverException)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request to a host that is paused after repeated failures."""
+
+
+class RequestTimeout(TimeoutError):
+    """Raised when a request scheduled with a timeout has not returned in time."""
+
+
+class TokenBucket:
+    """`rate` tokens per second, at most `burst` saved up."""
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Takes one token and returns how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a queue: each caller waits for its own token
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class AdaptiveLimit:
+    """Concurrency limit that grows by about one per `limit` successes and shrinks by `backoff` on trouble."""
+
+    def __init__(self, initial=1, minimum=1, maximum=8, backoff=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, ok):
+        """Frees a slot; ok=None leaves the limit as it is (the outcome says nothing about the host)."""
+        with self._condition:
+            self.in_flight -= 1
+            if ok:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif ok is not None:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+            self._condition.notify_all()
+
+
+class CircuitBreaker:
+    """closed -> open after `failure_threshold` consecutive failures -> half-open after `reset_timeout`."""
+
+    def __init__(self, failure_threshold=5, reset_timeout=60.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = None
+        self.trips = 0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """True if a request may go out now; in half-open state only one trial at a time."""
+        with self._lock:
+            if self.state == 'open' and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = 'half-open'
+            if self.state == 'closed':
+                return True
+            if self.state == 'half-open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def release_trial(self):
+        """Ends a request without an outcome; a half-open circuit lets the next trial through."""
+        with self._lock:
+            self._trial_running = False
+
+    def record(self, ok):
+        with self._lock:
+            self._trial_running = False
+            if ok:
+                self.state = 'closed'
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == 'half-open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.trips += 1
+                self.state = 'open'
+                self.opened_at = self.clock()
+
+
+class HostState:
+    """Limiter, breaker and counters of one host."""
+
+    def __init__(self, scheduler):
+        self.bucket = TokenBucket(scheduler.rate, scheduler.burst, scheduler.clock)
+        self.limit = AdaptiveLimit(scheduler.initial_concurrency, scheduler.min_concurrency,
+                                   scheduler.max_concurrency, scheduler.backoff)
+        self.breaker = CircuitBreaker(scheduler.failure_threshold, scheduler.reset_timeout, scheduler.clock)
+        # Guards the counters below, which every worker thread updates
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.slow = 0
+        self.rejected = 0
+        self.throttle_wait = 0.0
+        self.backoff_wait = 0.0
+        self.latency_total = 0.0
+
+    def count(self, **increments):
+        """Adds to counters atomically, e.g. count(requests=1, throttle_wait=0.5)."""
+        with self.lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self):
+        with self.lock:
+            completed = self.successes + self.failures
+            return {
+                'requests': self.requests,
+                'successes': self.successes,
+                'failures': self.failures,
+                'retries': self.retries,
+                'slow': self.slow,
+                'rejected': self.rejected,
+                'error_rate': self.failures / completed if completed else 0.0,
+                'mean_latency': self.latency_total / completed if completed else 0.0,
+                'throttle_wait': self.throttle_wait,
+                'backoff_wait': self.backoff_wait,
+                'concurrency_limit': int(self.limit.limit),
+                'in_flight': self.limit.in_flight,
+                'circuit': self.breaker.state,
+                'circuit_trips': self.breaker.trips,
+            }
+
+
+class RequestScheduler:
+    """Thread-safe scheduler shared by every page object and crawl job of a run."""
+
+    def __init__(self, rate=1.0, burst=2, initial_concurrency=1, min_concurrency=1, max_concurrency=4,
+                 backoff=0.5, target_latency=15.0, retries=3, retry_base=1.0, retry_max=30.0,
+                 failure_threshold=5, reset_timeout=60.0, retry_on=RETRYABLE_EXCEPTIONS,
+                 request_timeout=None, clock=time.monotonic, sleep=time.sleep, rng=random.random):
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        # Responses slower than this count as a sign of throttling
+        self.target_latency = target_latency
+        self.retries = retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retry_on = retry_on
+        # Seconds one attempt may take before it counts as failed (None: no limit)
+        self.request_timeout = request_timeout
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url):
+        name = urlparse(url).netloc or url
+        with self._lock:
+            if name not in self._hosts:
+                self._hosts[name] = HostState(self)
+            return self._hosts[name]
+
+    def retry_delay(self, attempt):
+        """Full jitter: uniform between 0 and the capped exponential backoff."""
+        return self.rng() * min(self.retry_max, self.retry_base * 2 ** attempt)
+
+    def _call(self, fn, args, kwargs, timeout):
+        """
+        fn(*args, **kwargs), abandoned with RequestTimeout after `timeout` seconds.
+        With a timeout fn runs on another thread, so it must not share a browser session.
+        """
+        if timeout is None:
+            return fn(*args, **kwargs)
+        outcome = {}
+        done = threading.Event()
+
+        def target():
+            try:
+                outcome['result'] = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                done.set()
+
+        threading.Thread(target=target, name='scheduler-request', daemon=True).start()
+        if not done.wait(timeout):
+            raise RequestTimeout(f"no response after {timeout}s")
+        if 'error' in outcome:
+            raise outcome['error']
+        return outcome['result']
+
+    def run(self, url, fn, *args, retry_on=None, timeout=None, **kwargs):
+        """
+        Calls fn(*args, **kwargs) as a request to `url`'s host, retrying failures
+        in `retry_on` (default: RETRYABLE_EXCEPTIONS). Each attempt may take
+        `timeout` seconds (default: request_timeout). Raises CircuitOpenError
+        while the host is paused, or the last error once retries are used up.
+        """
+        retry_on = retry_on or self.retry_on
+        timeout = self.request_timeout if timeout is None else timeout
+        host = self.host(url)
+        for attempt in range(self.retries + 1):
+            if not host.breaker.allow():
+                host.count(rejected=1)
+                raise CircuitOpenError(f"{urlparse(url).netloc} is paused after {host.breaker.failures} failures")
+
+            wait = host.bucket.reserve()
+            if wait:
+                host.count(throttle_wait=wait)
+                self.sleep(wait)
+            host.limit.acquire()
+            host.count(requests=1)
+            start = self.clock()
+            try:
+                result = self._call(fn, args, kwargs, timeout)
+            except retry_on:
+                host.count(latency_total=self.clock() - start, failures=1)
+                host.limit.release(ok=False)
+                host.breaker.record(ok=False)
+                if attempt == self.retries:
+                    raise
+            except BaseException:
+                # Not a transport problem (bad input, bug, KeyboardInterrupt): no retry, and
+                # no verdict on the host either, so a half-open circuit stays half-open
+                host.limit.release(ok=None)
+                host.breaker.release_trial()
+                raise
+            else:
+                latency = self.clock() - start
+                slow = latency > self.target_latency
+                host.count(latency_total=latency, successes=1, slow=int(slow))
+                host.limit.release(ok=not slow)
+                host.breaker.record(ok=True)
+                return result
+
+            delay = self.retry_delay(attempt)
+            host.count(retries=1, backoff_wait=delay)
+            self.sleep(delay)
+
+    def metrics(self):
+        """Per-host counters: {host: {'requests': ..., 'error_rate': ..., 'circuit': ..., ...}}."""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {name: host.as_dict() for name, host in hosts.items()}
+
+    def print_report(self):
+        for name, m in self.metrics().items():
+            print(f"{name}: {m['successes']}/{m['requests']} ok, {m['retries']} retries, "
+                  f"error rate {m['error_rate']:.0%}, mean latency {m['mean_latency']:.2f}s, "
+                  f"limit {m['concurrency_limit']}, throttled {m['throttle_wait']:.1f}s, circuit {m['circuit']}")
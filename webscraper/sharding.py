@@ -0,0 +1,176 @@
+"""
+Splitting a pytest run across worker processes and merging what they write.
+
+Every worker is a separate pytest process with its own browser, and writes
+only below its own directory (SCRAPER_OUTPUT_DIR, named after
+SCRAPER_WORKER), which is emptied before the worker starts. Once all
+workers are done, merge_worker_outputs() combines their JUnit XML, trace
+files, CSVs and screenshots into the run directory, so nothing is ever
+written to a shared path concurrently.
+
+Tests are assigned longest-first to the least loaded worker, using
+durations from earlier JUnit reports when there are any, so the workers
+finish at about the same time.
+"""
+import glob
+import heapq
+import os
+import shutil
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+from .generate_html_report import iter_testcases
+
+WORKER_ENV = 'SCRAPER_WORKER'
+OUTPUT_DIR_ENV = 'SCRAPER_OUTPUT_DIR'
+WORKERS_DIRNAME = 'workers'
+JUNIT_FILENAME = 'test_report.xml'
+TRACE_FILENAME = 'trace.jsonl'
+
+
+def collect_tests(test_paths, extra_args=(), rootdir=None):
+    """
+    Node ids pytest would run for `test_paths` (nothing is executed), relative to
+    `rootdir` (default: the current directory), where run_shards() starts the workers.
+    """
+    rootdir = os.path.abspath(rootdir or os.getcwd())
+    test_paths = [os.path.abspath(path) for path in test_paths]
+    result = subprocess.run([sys.executable, '-m', 'pytest', '--collect-only', '-q', f"--rootdir={rootdir}",
+                             *extra_args, *test_paths],
+                            cwd=rootdir, capture_output=True, text=True)
+    node_ids = [line.strip() for line in result.stdout.splitlines() if '::' in line]
+    if not node_ids and result.returncode not in (0, 5):
+        raise RuntimeError(f"Test collection failed:\n{result.stdout}\n{result.stderr}")
+    return node_ids
+
+
+def load_durations(xml_paths):
+    """Latest duration per test name from earlier JUnit reports."""
+    durations = {}
+    for xml_path in sorted(xml_paths):
+        try:
+            for case in iter_testcases(xml_path):
+                durations[case['name']] = case['time']
+        except ET.ParseError:
+            continue
+    return durations
+
+
+def shard_tests(node_ids, workers, durations=None):
+    """
+    Splits node ids into `workers` lists of similar total duration (longest first
+    onto the least loaded worker). Unknown tests count as the mean known duration.
+    """
+    durations = durations or {}
+    known = [durations[node_id.rsplit('::', 1)[-1]] for node_id in node_ids
+             if node_id.rsplit('::', 1)[-1] in durations]
+    default = sum(known) / len(known) if known else 1.0
+
+    def duration(node_id):
+        return durations.get(node_id.rsplit('::', 1)[-1], default)
+
+    shards = [[] for _ in range(workers)]
+    loads = [(0.0, index) for index in range(workers)]
+    for node_id in sorted(node_ids, key=duration, reverse=True):
+        load, index = heapq.heappop(loads)
+        shards[index].append(node_id)
+        heapq.heappush(loads, (load + duration(node_id), index))
+    # Keep the collection order inside each shard
+    order = {node_id: position for position, node_id in enumerate(node_ids)}
+    return [sorted(shard, key=order.get) for shard in shards if shard]
+
+
+def worker_name(index):
+    return f"gw{index}"
+
+
+def prepare_worker_dir(run_dir, worker):
+    """Empty output directory for `worker`; leftovers of an earlier run on the same day are removed."""
+    worker_dir = os.path.join(run_dir, WORKERS_DIRNAME, worker)
+    shutil.rmtree(worker_dir, ignore_errors=True)
+    os.makedirs(worker_dir)
+    return worker_dir
+
+
+def run_shards(shards, run_dir, extra_args=(), rootdir=None):
+    """
+    Runs every shard in its own pytest process at the same time; returns {worker: exit code}.
+    Workers start in `rootdir`, the same one collect_tests() resolved the node ids against.
+    """
+    rootdir = os.path.abspath(rootdir or os.getcwd())
+    run_dir = os.path.abspath(run_dir)
+    processes = {}
+    for index, shard in enumerate(shards):
+        worker = worker_name(index)
+        worker_dir = prepare_worker_dir(run_dir, worker)
+        env = dict(os.environ, **{WORKER_ENV: worker, OUTPUT_DIR_ENV: worker_dir})
+        args = [sys.executable, '-m', 'pytest', f"--rootdir={rootdir}", *shard,
+                f"--junitxml={os.path.join(worker_dir, JUNIT_FILENAME)}",
+                f"--trace-file={os.path.join(worker_dir, TRACE_FILENAME)}",
+                *extra_args]
+        log = open(os.path.join(worker_dir, 'pytest.log'), 'w')
+        processes[worker] = (subprocess.Popen(args, cwd=rootdir, env=env, stdout=log, stderr=subprocess.STDOUT),
+                             log)
+        print(f"[{worker}] {len(shard)} tests")
+    exit_codes = {}
+    for worker, (process, log) in processes.items():
+        exit_codes[worker] = process.wait()
+        log.close()
+        print(f"[{worker}] finished with exit code {exit_codes[worker]}")
+    return exit_codes
+
+
+def merge_junit(xml_paths, output_path):
+    """Combines the <testsuite> elements of several JUnit reports into one <testsuites> file."""
+    merged = ET.Element('testsuites')
+    for xml_path in xml_paths:
+        root = ET.parse(xml_path).getroot()
+        suites = [root] if root.tag == 'testsuite' else list(root.iter('testsuite'))
+        for suite in suites:
+            merged.append(suite)
+    ET.ElementTree(merged).write(output_path, encoding='utf-8', xml_declaration=True)
+    return output_path
+
+
+def _append_csv(source, target):
+    """Appends a CSV's rows to an existing CSV with the same header."""
+    with open(source, encoding='utf-8') as src, open(target, 'a', encoding='utf-8') as dst:
+        next(src, None)
+        shutil.copyfileobj(src, dst)
+
+
+def merge_worker_outputs(run_dir, workers):
+    """
+    Merges the directories of `workers` (the ones this run started) into `run_dir` itself:
+    one JUnit XML, one trace file, CSVs (same-named files concatenated) and screenshots.
+    Directories of other workers, e.g. from an earlier run with more shards, are ignored.
+    Returns the merged JUnit path, or None when no worker wrote one.
+    """
+    worker_dirs = [os.path.join(run_dir, WORKERS_DIRNAME, worker) for worker in workers]
+    junit_paths = [os.path.join(d, JUNIT_FILENAME) for d in worker_dirs
+                   if os.path.exists(os.path.join(d, JUNIT_FILENAME))]
+
+    trace_path = os.path.join(run_dir, TRACE_FILENAME)
+    with open(trace_path, 'ab') as trace:
+        for worker_dir in worker_dirs:
+            worker_trace = os.path.join(worker_dir, TRACE_FILENAME)
+            if os.path.exists(worker_trace):
+                with open(worker_trace, 'rb') as f:
+                    shutil.copyfileobj(f, trace)
+
+    merged_csvs = set()
+    for worker_dir in worker_dirs:
+        for source in sorted(glob.glob(os.path.join(worker_dir, '*.csv'))):
+            target = os.path.join(run_dir, os.path.basename(source))
+            if target in merged_csvs:
+                _append_csv(source, target)
+            else:
+                shutil.copyfile(source, target)
+                merged_csvs.add(target)
+        for source in glob.glob(os.path.join(worker_dir, '*.png')):
+            shutil.copyfile(source, os.path.join(run_dir, os.path.basename(source)))
+
+    if not junit_paths:
+        return None
+    return merge_junit(junit_paths, os.path.join(run_dir, JUNIT_FILENAME))
@@ -0,0 +1,78 @@
+"""
+Table assertions evaluated where the data lives.
+
+HomePage.check_table() runs these checks inside the browser (one script
+call, only the verdict and offending rows come back) or, when the page state
+is cached, with check_rows() below over the cached rows. Both give the same
+result:
+
+    {'ok': False, 'rows': 199, 'checks': {
+        'sorted_by': {'ok': False, 'column': 'Country', 'descending': False,
+                      'offenders': [{'row': 17, 'previous': 'Peru', 'value': 'Chile'}]},
+        'contains':  {'ok': True, 'column': 'Country', 'value': 'Peru', 'row': 3},
+        'min_rows':  {'ok': True, 'min_rows': 100, 'rows': 199}}}
+
+Value columns (Last_*/Previous_*) compare as numbers; blank or unparseable
+cells are skipped, as a person reading the table would. Other columns
+compare as text.
+"""
+import math
+
+from .normalize import parse_numbers
+
+# Offending rows returned per check by default
+MAX_OFFENDERS = 10
+
+
+def is_numeric_column(column):
+    return column.startswith(('Last_', 'Previous_'))
+
+
+def build_checks(sorted_by=None, descending=False, contains=None, min_rows=None, max_offenders=MAX_OFFENDERS):
+    """Normalizes check arguments; `contains` is a (column, value) pair."""
+    checks = {'max_offenders': max_offenders}
+    if sorted_by is not None:
+        checks['sorted_by'] = {'column': sorted_by, 'descending': bool(descending),
+                               'numeric': is_numeric_column(sorted_by)}
+    if contains is not None:
+        column, value = contains
+        checks['contains'] = {'column': column, 'value': str(value)}
+    if min_rows is not None:
+        checks['min_rows'] = int(min_rows)
+    return checks
+
+
+def check_rows(rows, checks):
+    """Evaluates build_checks() output over scraped row dicts."""
+    verdict = {'ok': True, 'rows': len(rows), 'checks': {}}
+
+    sort = checks.get('sorted_by')
+    if sort:
+        values = [row.get(sort['column'], '') for row in rows]
+        keys = parse_numbers(values).tolist() if sort['numeric'] else values
+        offenders = []
+        previous = None
+        for index, (value, key) in enumerate(zip(values, keys)):
+            if sort['numeric'] and math.isnan(key):
+                continue
+            if previous is not None:
+                out_of_order = key > previous[1] if sort['descending'] else key < previous[1]
+                if out_of_order and len(offenders) < checks['max_offenders']:
+                    offenders.append({'row': index, 'previous': previous[0], 'value': value})
+            previous = (value, key)
+        verdict['checks']['sorted_by'] = {'ok': not offenders, 'column': sort['column'],
+                                          'descending': sort['descending'], 'offenders': offenders}
+
+    contains = checks.get('contains')
+    if contains:
+        row = next((index for index, row in enumerate(rows)
+                    if row.get(contains['column'], '') == contains['value']), None)
+        verdict['checks']['contains'] = {'ok': row is not None, 'column': contains['column'],
+                                         'value': contains['value'], 'row': row}
+
+    if 'min_rows' in checks:
+        verdict['checks']['min_rows'] = {'ok': len(rows) >= checks['min_rows'],
+                                         'min_rows': checks['min_rows'], 'rows': len(rows)}
+
+    verdict['ok'] = all(check['ok'] for check in verdict['checks'].values())
+    return verdict
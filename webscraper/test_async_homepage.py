@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from .pages.async_homepage import AsyncHomePage, scrape_pages
+
+
+class SleepyPage:
+    """HomePage stand-in whose blocking calls just sleep, tracking how many overlap."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+
+    def _work(self, name):
+        with SleepyPage.lock:
+            SleepyPage.active += 1
+            SleepyPage.peak = max(SleepyPage.peak, SleepyPage.active)
+        time.sleep(self.delay)
+        with SleepyPage.lock:
+            SleepyPage.active -= 1
+        self.calls.append(name)
+
+    def load(self):
+        self._work('load')
+
+    def extract_table_data(self):
+        self._work('extract')
+        return [{'Country': 'Peru'}]
+
+
+def test_pages_run_concurrently_under_the_semaphore():
+    SleepyPage.peak = 0
+    pages = [SleepyPage() for _ in range(6)]
+
+    start = time.perf_counter()
+    results = asyncio.run(scrape_pages(pages, concurrency=3))
+    elapsed = time.perf_counter() - start
+
+    assert results == [[{'Country': 'Peru'}]] * 6
+    assert SleepyPage.peak == 3
+    # 12 calls of 50 ms, three at a time, instead of 600 ms in a row
+    assert elapsed < 0.5
+
+
+def test_timed_out_call_does_not_overlap_the_next_command():
+    page = SleepyPage(delay=0.2)
+
+    async def run():
+        async_page = AsyncHomePage(page, timeout=5)
+        with pytest.raises(asyncio.TimeoutError):
+            await async_page.load(timeout=0.01)
+        return await async_page.extract_table_data()
+
+    assert asyncio.run(run()) == [{'Country': 'Peru'}]
+    assert page.calls == ['load', 'extract']
+
+
+def test_timeouts_do_not_block_the_event_loop():
+    pages = [SleepyPage(delay=1.0) for _ in range(2)]
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.ensure_future(ticker())
+        start = time.perf_counter()
+        results = await scrape_pages(pages, concurrency=2, timeout=0.1)
+        elapsed = time.perf_counter() - start
+        ticking.cancel()
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(run())
+
+    assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+    # Returns at the timeout, not when the hung calls finish, and the loop kept running meanwhile
+    assert elapsed < 0.5
+    assert ticks >= 5
+
+
+def test_pages_sharing_a_driver_are_rejected():
+    pages = [SleepyPage(), SleepyPage()]
+    pages[0].driver = pages[1].driver = object()
+    with pytest.raises(ValueError):
+        asyncio.run(scrape_pages(pages))
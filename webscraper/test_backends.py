@@ -0,0 +1,84 @@
+import os
+import tempfile
+
+import pytest
+
+from .backends import BackendUnavailable, HttpBackend, SeleniumBackend, parse_temperature_table, scrape_table
+from .browser_pool import BrowserPool
+from .fixture_server import serve_directory
+from .test_browser_pool import FakeDriver
+
+
+class RecordingBackend:
+    """Stand-in for the Selenium backend that records what it was asked to do."""
+
+    name = 'selenium'
+
+    def __init__(self):
+        self.calls = []
+
+    def extract(self, url, sort=None, search=None, indicator='temperature', timeout=None):
+        self.calls.append((url, sort, search))
+        return [{'Country': 'Browser', 'Last_Temperature': '1', 'Previous_Temperature': '2', 'Unit': 'celsius'}]
+
+
+def test_http_backend_reads_server_rendered_table():
+    """The HTTP backend extracts the same row shape as HomePage.extract_table_data."""
+    with serve_directory() as base_url:
+        rows, backend_name = scrape_table(f"{base_url}/temperature.html", [HttpBackend(), RecordingBackend()])
+
+    assert backend_name == 'http'
+    assert len(rows) == 199
+    assert list(rows[0]) == ['Country', 'Last_Temperature', 'Previous_Temperature', 'Unit']
+    assert rows[0]['Country'] == 'Aruba'
+    assert next(row for row in rows if row['Country'] == 'United States')['Last_Temperature'] != ''
+
+
+def test_falls_back_to_browser_when_table_missing():
+    """Pages without the server-rendered table are handed to the browser backend."""
+    browser = RecordingBackend()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, 'empty.html'), 'w') as f:
+            f.write("<html><body><h1>Average Temperature by Country</h1><div id='app'></div></body></html>")
+        with serve_directory(tmp_dir) as base_url:
+            rows, backend_name = scrape_table(f"{base_url}/empty.html", [HttpBackend(), browser])
+
+    assert backend_name == 'selenium'
+    assert browser.calls == [(f"{base_url}/empty.html", None, None)]
+    assert rows[0]['Country'] == 'Browser'
+
+
+def test_js_interactions_skip_http_backend():
+    """Sorting and search are JS-only, so they always go to the browser backend."""
+    browser = RecordingBackend()
+    rows, backend_name = scrape_table("http://127.0.0.1:1/unused", [HttpBackend(), browser], sort='country')
+
+    assert backend_name == 'selenium'
+    assert browser.calls == [("http://127.0.0.1:1/unused", 'country', None)]
+
+
+def test_no_backend_available_raises():
+    with pytest.raises(BackendUnavailable):
+        scrape_table("http://127.0.0.1:1/unused", [HttpBackend(timeout=1)])
+
+
+def test_busy_browser_pool_is_not_a_host_failure():
+    """No free local browser within the timeout is reported as BackendUnavailable, not TimeoutError."""
+    pool = BrowserPool(FakeDriver, max_size=1)
+    pool.lease()
+    with pytest.raises(BackendUnavailable, match='No driver became available'):
+        SeleniumBackend(pool=pool).extract("http://example.test/", sort='country', timeout=0.05)
+
+
+def test_parser_ignores_nested_tables_and_short_rows():
+    html = """
+    <table class="table table-hover table-striped table-heatmap"><tbody>
+      <tr><td><a href="#">Peru</a></td><td> 19.5 </td><td>19.1</td><td>Dec/24</td><td>celsius</td></tr>
+      <tr><td colspan="5">advert</td></tr>
+      <tr><td><table><tr><td><a>Nested</a></td></tr></table></td><td>1</td><td>2</td><td>3</td><td>4</td></tr>
+    </tbody></table>
+    """
+    assert parse_temperature_table(html) == [
+        {'Country': 'Peru', 'Last_Temperature': '19.5', 'Previous_Temperature': '19.1', 'Unit': 'celsius'}
+    ]
+    assert parse_temperature_table("<html><body>no table</body></html>") is None
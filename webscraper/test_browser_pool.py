@@ -0,0 +1,84 @@
+from .browser_pool import BrowserPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    """Minimal stand-in for a WebDriver session."""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+        self.visited = []
+        self.cookies_cleared = 0
+        self.window_size = {'width': 1920, 'height': 1080}
+        self.window_handles = ['main']
+        self.current_handle = 'main'
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_script(self, script, *args):
+        if not self.alive:
+            raise RuntimeError("browser crashed")
+        return 1
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_window_size(self):
+        return dict(self.window_size)
+
+    def set_window_size(self, width, height):
+        self.window_size = {'width': width, 'height': height}
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_released_driver_is_reset_and_reused():
+    pool = BrowserPool(FakeDriver)
+    driver = pool.lease()
+    driver.window_size = {'width': 800, 'height': 600}
+    driver.window_handles.append('popup')
+    pool.release(driver)
+
+    assert pool.lease() is driver
+    assert driver.visited[-1] == 'about:blank'
+    assert driver.cookies_cleared == 1
+    assert driver.window_size == {'width': 1920, 'height': 1080}
+    assert driver.window_handles == ['main']
+    assert pool.created == 1
+
+
+def test_unhealthy_driver_is_recycled_on_lease():
+    pool = BrowserPool(FakeDriver)
+    driver = pool.lease()
+    pool.release(driver)
+    driver.alive = False
+
+    replacement = pool.lease()
+    assert replacement is not driver
+    assert driver.quit_called
+    assert pool.created == 2 and pool.recycled == 1
+
+
+def test_close_quits_idle_and_late_released_drivers():
+    pool = BrowserPool(FakeDriver, max_size=2)
+    idle, leased = pool.lease(), pool.lease()
+    pool.release(idle)
+    pool.close()
+    assert idle.quit_called and not leased.quit_called
+
+    pool.release(leased)
+    assert leased.quit_called
@@ -0,0 +1,72 @@
+from fnmatch import fnmatchcase
+
+from selenium.webdriver.chrome.options import Options
+
+from .browser_profile import apply_scraping_profile, blocked_url_patterns, globs_overlap, summarize_network_events
+from .pages.homepage import HomePage
+
+
+class ChartPage:
+    BLOCKED_URL_PATTERNS = ['*://*doubleclick.net/*', '*://example.com/static/*', '*charts*']
+    BLOCKED_RESOURCE_TYPES = ('font',)
+    ALLOWED_URL_PATTERNS = ['*://example.com/static/table.js', '*://example.com/*.js*']
+
+
+def test_blocklist_combines_patterns_and_respects_allowlist():
+    patterns = blocked_url_patterns(ChartPage)
+
+    assert '*://*doubleclick.net/*' in patterns
+    assert '*.woff2*' in patterns
+    # Would block the allowlisted table script, so it is dropped
+    assert '*://example.com/static/*' not in patterns
+    # No host: also matches first-party scripts such as /js/charts.js
+    assert '*charts*' not in patterns
+
+
+def test_globs_overlap_finds_urls_matching_both_patterns():
+    assert globs_overlap('*/charts/*', '*.js*')
+    assert globs_overlap('a?c', '*c')
+    assert not globs_overlap('*doubleclick.net', 'example.com')
+    assert not globs_overlap('code.highcharts.com', '*example.com')
+
+
+def test_homepage_blocklist_keeps_first_party_scripts():
+    patterns = blocked_url_patterns(HomePage)
+    first_party = ['https://tradingeconomics.com/country-list/temperature',
+                   'https://tradingeconomics.com/charts/table.js',
+                   'https://tradingeconomics.com/js/highcharts-custom.js?v=2']
+    third_party = ['https://www.google-analytics.com/analytics.js',
+                   'https://securepubads.g.doubleclick.net/tag/js/gpt.js',
+                   'https://code.highcharts.com/highcharts.js']
+
+    # Every deny rule survives the allowlist resolution
+    assert set(HomePage.BLOCKED_URL_PATTERNS) <= set(patterns)
+    for url in first_party:
+        assert not any(fnmatchcase(url, pattern) for pattern in patterns), url
+    for url in third_party:
+        assert any(fnmatchcase(url, pattern) for pattern in patterns), url
+
+
+def test_scraping_profile_uses_eager_page_loads():
+    options = apply_scraping_profile(Options(), ChartPage)
+
+    assert options.page_load_strategy == 'eager'
+    assert options.to_capabilities()['goog:loggingPrefs'] == {'performance': 'ALL'}
+
+
+def test_network_report_counts_blocked_requests_and_bytes():
+    events = [
+        {'method': 'Network.requestWillBeSent', 'params': {'requestId': '1', 'request': {'url': 'https://example.com/page'}}},
+        {'method': 'Network.loadingFinished', 'params': {'requestId': '1', 'encodedDataLength': 1500}},
+        {'method': 'Network.requestWillBeSent', 'params': {'requestId': '2', 'request': {'url': 'https://ad.doubleclick.net/x.js'}}},
+        {'method': 'Network.loadingFailed', 'params': {'requestId': '2', 'type': 'Script', 'blockedReason': 'inspector'}},
+        {'method': 'Network.requestWillBeSent', 'params': {'requestId': '3', 'request': {'url': 'https://example.com/static/table.js'}}},
+        {'method': 'Network.loadingFailed', 'params': {'requestId': '3', 'type': 'Script', 'blockedReason': 'inspector'}},
+    ]
+    report = summarize_network_events(events, ChartPage.ALLOWED_URL_PATTERNS)
+
+    assert report['requests'] == 3
+    assert report['blocked_requests'] == 2
+    assert report['blocked_by_type'] == {'Script': 2}
+    assert report['bytes_loaded'] == 1500
+    assert report['blocked_allowed_urls'] == ['https://example.com/static/table.js']
@@ -0,0 +1,55 @@
+from .cache import PageCache
+from .fakes import FakeClock, NoNavigationDriver
+from .pages.homepage import HomePage
+
+ROWS = [{'Country': 'Peru', 'Last_Temperature': '19.5', 'Previous_Temperature': '19.1', 'Unit': 'celsius'}]
+SNAPSHOT = "<html><body><h1>Average Temperature by Country</h1></body></html>"
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = PageCache(ttl=10, clock=clock)
+    cache.put('url', (), SNAPSHOT, ROWS)
+
+    clock.now = 9
+    assert cache.get('url').rows == ROWS
+    clock.now = 11
+    assert cache.get('url') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PageCache(max_entries=2)
+    cache.put('url', (), SNAPSHOT, ROWS)
+    cache.put('url', ('sort:country',), SNAPSHOT, ROWS)
+    cache.get('url', ())
+    cache.put('url', ('sort:last',), SNAPSHOT, ROWS)
+
+    assert cache.get('url', ('sort:country',)) is None
+    assert cache.get('url', ()) is not None
+    assert len(cache) == 2
+
+
+def test_invalidate_drops_every_state_of_a_url():
+    cache = PageCache()
+    cache.put('url', (), SNAPSHOT, ROWS)
+    cache.put('url', ('sort:country',), SNAPSHOT, ROWS)
+    cache.put('other', (), SNAPSHOT, ROWS)
+    cache.invalidate('url')
+
+    assert len(cache) == 1 and cache.get('other') is not None
+
+
+def test_read_only_page_is_served_without_navigation():
+    cache = PageCache()
+    home_page = HomePage(NoNavigationDriver(), cache=cache)
+    cache.put(home_page.url, (), SNAPSHOT, ROWS)
+
+    home_page.load()
+    assert home_page.get_header_text() == "Average Temperature by Country"
+    data = home_page.extract_table_data()
+    assert data == ROWS
+
+    # Callers get their own copies, so mutating them cannot poison the cache
+    data[0]['Country'] = 'Changed'
+    assert home_page.extract_table_data() == ROWS
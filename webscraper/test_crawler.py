@@ -0,0 +1,63 @@
+import threading
+
+from .backends import BackendUnavailable, HttpBackend
+from .crawler import crawl_indicators
+from .fixture_server import serve_directory
+
+
+class SlowBackend:
+    """Never answers for the stuck indicators (until its timeout), answers instantly for the others."""
+
+    name = 'slow'
+
+    def __init__(self, *stuck_indicators):
+        self.stuck_indicators = stuck_indicators
+        self.release = threading.Event()
+
+    def extract(self, url, sort=None, search=None, indicator='temperature', timeout=None):
+        if indicator in self.stuck_indicators:
+            self.release.wait(5 if timeout is None else min(5, timeout))
+            raise BackendUnavailable("gave up")
+        return [{'Country': 'Peru', 'Last_Gdp': '1', 'Previous_Gdp': '2', 'Unit': 'USD Billion'}]
+
+
+def test_crawl_merges_indicators_and_reports_failures():
+    with serve_directory() as base_url:
+        result = crawl_indicators(['temperature', 'missing'], backends=[HttpBackend(timeout=5)],
+                                  url_template=base_url + '/{indicator}.html')
+
+    statuses = {job.indicator: job.status for job in result.jobs}
+    assert statuses == {'temperature': 'ok', 'missing': 'failed'}
+    assert result.data[('temperature', 'Peru')]['Indicator'] == 'temperature'
+    assert set(result.data[('temperature', 'Peru')]) == {'Indicator', 'Country', 'Last', 'Previous', 'Unit'}
+    assert all(timing['seconds'] is not None for timing in result.timings())
+    assert result.to_dataframe().loc[('temperature', 'Peru'), 'Unit'] == 'celsius'
+
+
+def test_slow_indicator_does_not_stall_the_batch():
+    backend = SlowBackend('stuck')
+    try:
+        result = crawl_indicators(['stuck', 'gdp'], backends=[backend], max_workers=2,
+                                  job_timeout=0.3, url_template='http://example.test/{indicator}')
+    finally:
+        backend.release.set()
+
+    statuses = {job.indicator: job.status for job in result.jobs}
+    assert statuses == {'stuck': 'timeout', 'gdp': 'ok'}
+    assert result.seconds < 5
+    assert list(result.data) == [('gdp', 'Peru')]
+
+
+def test_stuck_jobs_give_back_their_host_slots():
+    # Default limits: more stuck jobs than per_host_limit must not hold up the rest
+    backend = SlowBackend('stuck1', 'stuck2', 'stuck3')
+    try:
+        result = crawl_indicators(['stuck1', 'stuck2', 'stuck3', 'gdp'], backends=[backend],
+                                  job_timeout=0.3, url_template='http://example.test/{indicator}')
+    finally:
+        backend.release.set()
+
+    statuses = {job.indicator: job.status for job in result.jobs}
+    assert statuses == {'stuck1': 'timeout', 'stuck2': 'timeout', 'stuck3': 'timeout', 'gdp': 'ok'}
+    # Two rounds of 0.3 s on the host's two slots, not the backend's 5 s
+    assert result.seconds < 2
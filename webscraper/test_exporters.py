@@ -0,0 +1,43 @@
+from datetime import date
+import tempfile
+
+import pandas as pd
+import pytest
+
+from .exporters import read_dataset, to_typed_frame, write_parquet_dataset
+from .normalize import parse_numbers
+
+ROWS = [
+    {'Country': 'United States', 'Last_Temperature': '1,234.5', 'Previous_Temperature': '12.1', 'Unit': 'celsius'},
+    {'Country': 'Japan', 'Last_Temperature': ' -3 ', 'Previous_Temperature': '', 'Unit': 'celsius'},
+    {'Country': 'Germany', 'Last_Temperature': '9.5', 'Previous_Temperature': '9.4', 'Unit': 'celsius'},
+]
+
+
+def test_numbers_are_parsed_to_floats():
+    assert parse_numbers(['1,234.5', ' -3 ', '']).tolist()[:2] == [1234.5, -3.0]
+    assert parse_numbers(['n/a']).isna().all()
+
+
+def test_typed_frame_has_float_and_categorical_columns():
+    typed = to_typed_frame(ROWS, scrape_date=date(2024, 12, 1))
+
+    assert typed['Last'].dtype == 'float64'
+    assert isinstance(typed['Unit'].dtype, pd.CategoricalDtype)
+    assert isinstance(typed['Region'].dtype, pd.CategoricalDtype)
+    assert typed['scrape_date'].unique().tolist() == ['2024-12-01']
+
+
+def test_parquet_dataset_appends_and_filters_by_partition():
+    pytest.importorskip('pyarrow')
+    with tempfile.TemporaryDirectory() as dataset_dir:
+        write_parquet_dataset(ROWS, dataset_dir, scrape_date=date(2024, 12, 1))
+        write_parquet_dataset(ROWS, dataset_dir, scrape_date=date(2024, 12, 2))
+        write_parquet_dataset(ROWS, dataset_dir, scrape_date=date(2024, 12, 2))
+
+        assert len(read_dataset(dataset_dir)) == 9
+        december_2 = read_dataset(dataset_dir, columns=['Country', 'Last'],
+                                  filters=[('scrape_date', '==', '2024-12-02'), ('Region', '==', 'EMEA')])
+        assert list(december_2.columns) == ['Country', 'Last']
+        assert december_2['Country'].tolist() == ['Germany', 'Germany']
+        assert december_2['Last'].tolist() == [9.5, 9.5]
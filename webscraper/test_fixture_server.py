@@ -0,0 +1,28 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from .backends import fetch_html, parse_temperature_table
+from .fixture_server import fixture_page_url, serve_fixture_site
+
+
+def test_synthetic_page_scales_to_requested_row_count():
+    with serve_fixture_site() as base_url:
+        rows = parse_temperature_table(fetch_html(fixture_page_url(base_url, 1000)))
+
+    assert len(rows) == 1000
+    assert len({row['Country'] for row in rows}) == 1000
+    # Same markup as the live table, including a thousands separator now and then
+    assert any(',' in row['Last_Temperature'] for row in rows)
+
+
+def test_static_fixtures_are_still_served():
+    with serve_fixture_site() as base_url:
+        assert len(parse_temperature_table(fetch_html(f"{base_url}/temperature.html"))) == 199
+
+
+def test_invalid_row_count_is_rejected():
+    with serve_fixture_site() as base_url:
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base_url}/country-list/temperature?rows=lots")
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import tracemalloc
+
+from .generate_html_report import aggregate, generate_html_report, iter_testcases
+
+
+def write_junit(path, cases):
+    """cases: [(name, seconds, status)] with status 'pass', 'fail' or 'error'; a quarter of each test is waiting."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?><testsuites><testsuite name="pytest">')
+        for name, seconds, status in cases:
+            body = {'pass': '', 'fail': '<failure message="boom"/>', 'error': '<error message="boom"/>'}[status]
+            f.write(f'<testcase classname="webscraper.test_scraper" name="{name}" time="{seconds}">'
+                    f'<properties><property name="trace_commands" value="7"/>'
+                    f'<property name="trace_wait" value="{seconds / 4:.3f}"/>'
+                    f'<property name="trace_active" value="{seconds * 3 / 4:.3f}"/></properties>{body}</testcase>')
+        f.write('</testsuite></testsuites>')
+
+
+def test_runs_are_merged_with_trends_and_flakiness():
+    with tempfile.TemporaryDirectory() as results:
+        # Two shards on the first day, one file on each of the next two days
+        write_junit(os.path.join(results, '2025-01-01', 'shard0.xml'), [('test_a', 1.0, 'pass')])
+        write_junit(os.path.join(results, '2025-01-01', 'shard1.xml'), [('test_b', 2.0, 'pass')])
+        write_junit(os.path.join(results, '2025-01-02', 'report.xml'), [('test_a', 2.0, 'fail'), ('test_b', 2.0, 'pass')])
+        write_junit(os.path.join(results, '2025-01-03', 'report.xml'), [('test_a', 3.0, 'pass'), ('test_b', 2.0, 'pass')])
+
+        stats, runs, cases = aggregate([results])
+        report_path = generate_html_report([results], os.path.join(results, 'report.html'))
+        with open(report_path, encoding='utf-8') as f:
+            report = f.read()
+
+    assert (len(runs), cases) == (3, 6)
+    test_a = stats['webscraper.test_scraper::test_a']
+    test_b = stats['webscraper.test_scraper::test_b']
+    assert (test_a.runs, test_a.passed, test_a.failed) == (3, 2, 1)
+    assert test_a.flakiness == 1.0 and test_b.flakiness == 0.0
+    assert abs(test_a.slope - 1.0) < 1e-9 and test_b.slope == 0.0
+    assert test_a.last_status == 'Pass' and test_a.last_commands == '7'
+    assert (test_a.mean_wait, test_a.mean_active) == (0.5, 1.5)
+    assert '<th>Mean Waiting (s)</th>' in report and '<td>0.500</td>' in report
+    assert report.count('<tr>') == 3
+    assert '2025-01-03/test_a.png' in report
+
+
+def test_test_cases_are_streamed_in_bounded_memory():
+    with tempfile.TemporaryDirectory() as results:
+        path = os.path.join(results, 'big', 'report.xml')
+        write_junit(path, [(f"test_{i % 50}", 0.01, 'pass') for i in range(100000)])
+
+        tracemalloc.start()
+        count = sum(1 for _ in iter_testcases(path))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    assert count == 100000
+    # The file itself is ~15 MB; a parsed tree would take far more than this
+    assert peak < 5 * 1024 * 1024
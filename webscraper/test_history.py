@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+from .history import HistoryStore
+
+ROWS = [
+    {'Country': 'Germany', 'Last_Temperature': '9.5', 'Previous_Temperature': '9.4', 'Unit': 'celsius'},
+    {'Country': 'Japan', 'Last_Temperature': '15.2', 'Previous_Temperature': '', 'Unit': 'celsius'},
+]
+
+
+def test_write_is_an_upsert_and_query_filters_by_region_and_time():
+    with tempfile.TemporaryDirectory() as tmp_dir, HistoryStore(os.path.join(tmp_dir, 'history.sqlite3')) as store:
+        store.write(ROWS, scrape_time='2024-12-01T06:00:00')
+        store.write(ROWS, scrape_time='2024-12-02T06:00:00')
+        store.write([dict(ROWS[0], Last_Temperature='10.0')], scrape_time='2024-12-02T06:00:00')
+
+        emea = store.query(start='2024-12-02', region='EMEA')
+        assert emea[['country', 'last']].values.tolist() == [['Germany', 10.0]]
+
+        japan = store.query(countries=['Japan'])
+        assert japan['scrape_time'].tolist() == ['2024-12-01T06:00:00', '2024-12-02T06:00:00']
+        assert japan['previous'].isna().all()
+
+
+def test_import_csv_dirs_reads_daily_result_folders():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for day in ('2024-11-30', '2024-12-01', 'not-a-date'):
+            os.makedirs(os.path.join(tmp_dir, day))
+            with open(os.path.join(tmp_dir, day, 'scraped_temperature_data.csv'), 'w') as f:
+                f.write("Country,Last_Temperature,Previous_Temperature,Unit\nPeru,19.5,19.1,celsius\n")
+
+        with HistoryStore(os.path.join(tmp_dir, 'history.sqlite3')) as store:
+            assert store.import_csv_dirs(tmp_dir) == 2
+            assert store.query(columns=('scrape_time',))['scrape_time'].tolist() == [
+                '2024-11-30T00:00:00', '2024-12-01T00:00:00'
+            ]
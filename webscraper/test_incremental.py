@@ -0,0 +1,115 @@
+import csv
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+from .cache import PageCache
+from .incremental import incremental_scrape
+from .pages.homepage import HomePage
+
+
+class FakePage:
+    """Page stand-in whose fingerprint is derived from its live rows; reads the cache like HomePage."""
+
+    url = 'https://example.test/country-list/temperature'
+
+    def __init__(self, rows, cache=None):
+        self.rows = rows
+        self.cache = cache
+        self.extractions = 0
+
+    def table_fingerprint(self):
+        return str(hash(tuple(tuple(sorted(row.items())) for row in self.rows)))
+
+    def extract_table_data(self, use_cache=True):
+        self.extractions += 1
+        if use_cache and self.cache is not None:
+            entry = self.cache.get(self.url)
+            if entry is not None:
+                return [dict(row) for row in entry.rows]
+        return [dict(row) for row in self.rows]
+
+
+def row(country, last):
+    return {'Country': country, 'Last_Temperature': last, 'Previous_Temperature': '1.0', 'Unit': 'celsius'}
+
+
+def read_delta(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(line['Change'], line['Country'], line['Last_Temperature']) for line in csv.DictReader(f)]
+
+
+def test_first_run_writes_every_row_as_insert():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'state.json')
+        summary = incremental_scrape(FakePage([row('Peru', '19.5'), row('Chile', '12.0')]), state_path, tmp_dir)
+
+        assert summary['inserted'] == 2
+        assert read_delta(summary['delta_path']) == [('insert', 'Peru', '19.5'), ('insert', 'Chile', '12.0')]
+        assert os.path.exists(state_path)
+
+
+def test_unchanged_table_skips_extraction_and_writes_nothing():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'state.json')
+        incremental_scrape(FakePage([row('Peru', '19.5')]), state_path, tmp_dir)
+
+        page = FakePage([row('Peru', '19.5')])
+        summary = incremental_scrape(page, state_path, tmp_dir)
+
+        assert summary['status'] == 'unchanged'
+        assert page.extractions == 0
+        assert len([name for name in os.listdir(tmp_dir) if name.startswith('delta_')]) == 1
+
+
+def test_delta_contains_only_changed_rows():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'state.json')
+        incremental_scrape(FakePage([row('Peru', '19.5'), row('Chile', '12.0'), row('Cuba', '26.0')]),
+                           state_path, tmp_dir)
+
+        summary = incremental_scrape(FakePage([row('Peru', '19.5'), row('Chile', '12.4'), row('Fiji', '25.1')]),
+                                     state_path, tmp_dir)
+
+        assert (summary['inserted'], summary['updated'], summary['removed']) == (1, 1, 1)
+        assert read_delta(summary['delta_path']) == [
+            ('insert', 'Fiji', '25.1'), ('update', 'Chile', '12.4'), ('delete', 'Cuba', '')
+        ]
+
+
+def test_cached_snapshot_is_not_saved_with_the_live_fingerprint():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        state_path = os.path.join(tmp_dir, 'state.json')
+        incremental_scrape(FakePage([row('Peru', '19.5')]), state_path, tmp_dir)
+        # The cache still holds the old table while the live page has changed
+        cache = PageCache()
+        cache.put(FakePage.url, (), '<html></html>', [row('Peru', '19.5')])
+
+        summary = incremental_scrape(FakePage([row('Peru', '20.1')], cache), state_path, tmp_dir)
+
+        assert summary['updated'] == 1
+        assert read_delta(summary['delta_path']) == [('update', 'Peru', '20.1')]
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is needed to run the page script")
+def test_table_fingerprint_survives_a_32_bit_collision():
+    # Same length and the same 32-bit FNV-1a hash: a single hash called these tables equal
+    texts = ['Peru 19.039599', 'Peru 19.222382']
+    code = (
+        "var XPathResult = {FIRST_ORDERED_NODE_TYPE: 9};"
+        "function fingerprint(text) {"
+        "  var document = {evaluate: function () {"
+        "    return {singleNodeValue: {tBodies: [{textContent: text, rows: {length: 1}}]}}; }};"
+        f"  return (function () {{ {HomePage.TABLE_FINGERPRINT_SCRIPT} }})('//table');"
+        "}"
+        f"console.log(JSON.stringify({json.dumps(texts)}.map(fingerprint)));"
+    )
+    output = subprocess.run(['node', '-e', code], capture_output=True, text=True, check=True).stdout
+    first, second = json.loads(output)
+
+    assert first.split('-')[0] == second.split('-')[0]
+    assert first != second and first.endswith(':1:14')
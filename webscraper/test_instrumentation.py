@@ -0,0 +1,103 @@
+import os
+import json
+import tempfile
+import time
+
+from .instrumentation import Tracer, instrument_driver, summarize
+from .pages.homepage import HomePage, disk_usage
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        return {'value': None}
+
+    def find_element(self, by, value):
+        self.execute('findElement')
+        return 'table'
+
+    def execute_script(self, script, *args):
+        self.execute('executeScript')
+        return {'rows': [["Country 1", "1.5", "1.0", "celsius"]], 'total': 1}
+
+
+def test_nested_spans_share_commands_and_waits():
+    tracer = Tracer()
+    with tracer.span('test'):
+        with tracer.span('step'):
+            tracer.add_commands(3)
+            with tracer.waiting():
+                time.sleep(0.01)
+        tracer.add_commands()
+
+    step, root = tracer.spans
+    assert (step.name, step.parent_id, step.commands) == ('step', root.id, 3)
+    assert root.commands == 4
+    assert root.wait >= 0.01 and root.wait == step.wait
+
+    summary = summarize(tracer.spans)
+    assert summary['commands'] == 4
+    assert summary['steps']['step']['calls'] == 1
+    assert summary['active'] <= summary['duration']
+
+
+def test_homepage_steps_count_driver_commands():
+    tracer = Tracer()
+    driver = instrument_driver(FakeDriver(), tracer)
+    page = HomePage(driver, tracer=tracer)
+
+    with tracer.span('test'):
+        assert len(page.extract_table_data()) == 1
+
+    summary = summarize(tracer.spans)
+    assert summary['commands'] == len(driver.commands) == 2
+    assert summary['steps']['HomePage.extract_table_data']['commands'] == 2
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span('test'):
+        tracer.add_commands()
+    assert list(tracer.spans) == []
+
+
+def test_flush_writes_jsonl_and_forgets_spans():
+    tracer = Tracer()
+    with tracer.span('export'):
+        tracer.add_bytes(42)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'trace.jsonl')
+        tracer.flush_jsonl(path)
+        with open(path) as f:
+            records = [json.loads(line) for line in f]
+    assert records[0]['name'] == 'export' and records[0]['bytes_written'] == 42
+    assert list(tracer.spans) == []
+
+
+def test_finished_spans_are_bounded_and_marks_stay_valid():
+    tracer = Tracer(max_spans=3)
+    for name in 'abcd':
+        with tracer.span(name):
+            pass
+    mark = tracer.mark()
+    with tracer.span('e'):
+        pass
+
+    assert [span.name for span in tracer.spans] == ['c', 'd', 'e']
+    assert [span.name for span in tracer.spans_since(mark)] == ['e']
+    assert [span.name for span in tracer.spans_since(0)] == ['c', 'd', 'e']
+
+
+def test_every_export_format_reports_bytes_written(tmp_path):
+    rows = [{'Country': 'Peru', 'Last_Temperature': '19.5', 'Previous_Temperature': '19.1', 'Unit': 'celsius'}]
+    page = HomePage(None, tracer=Tracer())
+    outputs = {'csv': tmp_path / 'rows.csv', 'parquet': tmp_path / 'dataset', 'history': tmp_path / 'history.sqlite3'}
+    for fmt, path in outputs.items():
+        page.export(rows, str(path), fmt)
+
+    written = [span.bytes_written for span in page.tracer.spans if span.name == 'HomePage.export']
+    assert written == [disk_usage(str(path)) for path in outputs.values()]
+    assert all(written)
@@ -0,0 +1,68 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from .cache import PageCache
+from .constants import COUNTRY_ALIAS_KEYS, country_lookup_key
+from .fakes import NoNavigationDriver
+from .pages.homepage import HomePage
+
+ROWS = [
+    {'Country': 'United States', 'Last_Temperature': '12.5', 'Previous_Temperature': '11.9', 'Unit': 'celsius'},
+    {'Country': "Côte d'Ivoire", 'Last_Temperature': '27.1', 'Previous_Temperature': '26.8', 'Unit': 'celsius'},
+    {'Country': 'Peru', 'Last_Temperature': '19.5', 'Previous_Temperature': '19.1', 'Unit': 'celsius'},
+]
+NAMES = ['USA', 'ivory coast', 'Atlantis']
+
+
+class LookupScriptDriver:
+    """Answers the lookup script the way the page would, from ROWS."""
+
+    def __init__(self):
+        self.scripts = 0
+
+    def find_element(self, by, value):
+        return 'table'
+
+    def execute_script(self, script, table, wanted, aliases):
+        self.scripts += 1
+        assert aliases == COUNTRY_ALIAS_KEYS
+        matches = {}
+        for row in ROWS:
+            key = country_lookup_key(row['Country'])
+            if key in wanted:
+                matches[key] = [row['Country'], row['Last_Temperature'], row['Previous_Temperature'], row['Unit']]
+        return {'matches': matches, 'total': len(ROWS)}
+
+
+def test_cached_rows_answer_without_the_browser():
+    cache = PageCache()
+    page = HomePage(NoNavigationDriver(), cache=cache)
+    cache.put(page.url, (), "<html></html>", ROWS)
+    page.load()
+
+    found = page.lookup_countries(NAMES)
+    assert list(found) == NAMES
+    assert found['USA'] == ROWS[0]
+    assert found['ivory coast']['Country'] == "Côte d'Ivoire"
+    assert found['Atlantis'] is None
+
+
+def test_live_table_is_searched_with_one_script_call():
+    driver = LookupScriptDriver()
+    found = HomePage(driver).lookup_countries(NAMES)
+
+    assert driver.scripts == 1
+    assert found['USA'] == ROWS[0] and found['Atlantis'] is None
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is needed to run the page script")
+def test_page_script_builds_the_same_keys_as_python():
+    names = ["Côte d'Ivoire", 'Saint Lucia', 'Bosnia & Herzegovina', '  United   States ', 'USA', 'Türkiye', 'Peru']
+    code = HomePage.COUNTRY_KEY_JS + (
+        f"console.log(JSON.stringify({json.dumps(names)}.map(function (n) {{"
+        f" return countryKey(n, {json.dumps(COUNTRY_ALIAS_KEYS)}); }})));")
+    output = subprocess.run(['node', '-e', code], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output) == [country_lookup_key(name) for name in names]
@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import urllib.request
+
+import pytest
+
+from . import main
+from .fixture_server import serve_directory
+from .main import JobError, make_server, parse_job, run_job, submit_job
+
+
+def test_jobs_are_validated_and_defaulted():
+    job = parse_job({'indicator': ' Inflation-Rate ', 'format': 'parquet'})
+    assert job == {'indicator': 'inflation-rate', 'sort': 'none', 'format': 'parquet',
+                   'output': main.default_output('inflation-rate', 'parquet')}
+    for bad in ({'indicator': '../etc'}, {'sort': 'random'}, {'format': 'xlsx'},
+                {'format': 'json', 'output': 'x.json'}, {'colour': 'red'}):
+        with pytest.raises(JobError):
+            parse_job(bad)
+
+
+def test_daemon_jobs_only_write_below_the_output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'output').mkdir()
+    os.symlink(tmp_path, tmp_path / 'output' / 'escape')
+    assert parse_job({'output': 'output/gdp.csv'}, output_dir='output')['output'] == 'output/gdp.csv'
+    assert parse_job({'format': 'history'}, output_dir='output')['output'] == main.default_output('temperature', 'history')
+    for output in ('/etc/cron.d/job', '../gdp.csv', 'output/../gdp.csv', 'gdp.csv', 'output/escape/gdp.csv'):
+        with pytest.raises(JobError, match='only write below'):
+            parse_job({'output': output}, output_dir='output')
+    # The command line may still write anywhere
+    assert parse_job({'output': '/tmp/gdp.csv'})['output'] == '/tmp/gdp.csv'
+
+
+def test_validate_does_not_import_pandas_or_selenium():
+    code = ("import sys; from webscraper.main import main; main(['scrape', '--indicator', 'gdp', '--validate']); "
+            "print(sorted(m for m in ('pandas', 'selenium') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert json.loads(output.splitlines()[0])['indicator'] == 'gdp'
+    assert output.splitlines()[-1] == '[]'
+
+
+class FakePool:
+    max_size, created, recycled = 2, 2, 0
+    watchdog = None
+
+    def lease(self, timeout=None):
+        raise AssertionError("no browser should be started")
+
+
+def test_unsorted_jobs_do_not_lease_a_browser(tmp_path):
+    job = parse_job({'indicator': 'temperature', 'output': str(tmp_path / 'temperature.csv')})
+    with serve_directory() as base_url:
+        result = run_job(job, FakePool(), url_template=f"{base_url}/{{indicator}}.html")
+
+    assert (result['backend'], result['rows'], result['resources']) == ('http', 199, None)
+    assert (tmp_path / 'temperature.csv').read_text().startswith('Country,Last_Temperature')
+
+
+def test_daemon_runs_jobs_and_rejects_bad_ones(monkeypatch):
+    jobs = []
+    monkeypatch.setattr(main, 'run_job', lambda job, pool, timeout: jobs.append(job) or dict(job, rows=3))
+    server = make_server(FakePool(), port=0, verbose=False)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    try:
+        result = submit_job({'indicator': 'gdp', 'format': 'json'}, port=port)
+        rejected = submit_job({'indicator': 'gdp', 'sort': 'sideways'}, port=port)
+        outside = submit_job({'indicator': 'gdp', 'output': '/etc/gdp.csv'}, port=port)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/health") as response:
+            health = json.load(response)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert result['rows'] == 3 and jobs[0]['indicator'] == 'gdp'
+    assert 'Invalid sort' in rejected['error'] and len(jobs) == 1
+    assert 'only write below' in outside['error']
+    assert health['jobs'] == 1 and health['browsers'] == 2
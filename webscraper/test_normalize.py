@@ -0,0 +1,43 @@
+import numpy as np
+
+from .exporters import to_typed_frame
+from .normalize import canonical_unit, normalize_batch, parse_numbers
+
+ROWS = [
+    {'Country': 'United States', 'Last_Temperature': '1,234.5', 'Previous_Temperature': '12.1', 'Unit': 'celsius'},
+    {'Country': 'Liberia', 'Last_Temperature': '212', 'Previous_Temperature': '32', 'Unit': '°F'},
+    {'Country': 'Japan', 'Last_Temperature': '−3', 'Previous_Temperature': '', 'Unit': 'celsius'},
+    {'Country': 'Atlantis', 'Last_Temperature': 'n/a', 'Previous_Temperature': '1 000', 'Unit': 'Celsius'},
+]
+
+
+def test_separators_minus_signs_and_blanks():
+    assert parse_numbers(['1,234.5', ' −3 ', '1 000', '']).tolist()[:3] == [1234.5, -3.0, 1000.0]
+    assert np.isnan(parse_numbers(['', 'n/a', None])).all()
+
+
+def test_batch_is_converted_to_celsius_with_mask_and_rejects():
+    batch = normalize_batch(ROWS)
+
+    assert batch.values['Last'][:3].tolist() == [1234.5, 100.0, -3.0]
+    assert batch.values['Previous'][1] == 0.0
+    assert batch.units.tolist() == ['celsius'] * 4
+    assert normalize_batch(ROWS, convert_units=False).units.tolist()[1] == '°F'
+    assert batch.valid.tolist() == [True, True, False, False]
+    assert [(r['Country'], r['column'], r['reason']) for r in batch.rejects] == [
+        ('Japan', 'Previous', 'blank'), ('Atlantis', 'Last', 'invalid')]
+    assert [r['value'] for r in batch.invalid] == ['n/a']
+
+
+def test_unknown_units_pass_through_unconverted():
+    rows = [{'Country': 'Peru', 'Last_Gdp': '268.24', 'Previous_Gdp': '242.63', 'Unit': 'USD Billion'}]
+    batch = normalize_batch(rows, indicator='gdp')
+    assert batch.values['Last'].tolist() == [268.24]
+    assert batch.units.tolist() == ['USD Billion']
+    assert canonical_unit(' Degrees Fahrenheit ') == 'fahrenheit'
+
+
+def test_typed_export_shares_the_normalized_values():
+    typed = to_typed_frame(ROWS)
+    assert typed['Last'].tolist()[1] == 100.0
+    assert typed['Unit'].cat.categories.tolist() == ['celsius']
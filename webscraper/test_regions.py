@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+import pandas as pd
+
+from .constants import region_for_country
+from .regions import assign_regions, export_by_region
+
+ROWS = [
+    {'Country': 'United States', 'Last_Temperature': '12.5', 'Previous_Temperature': '12.1', 'Unit': 'celsius'},
+    {'Country': "Côte d'Ivoire", 'Last_Temperature': '27.0', 'Previous_Temperature': '26.8', 'Unit': 'celsius'},
+    {'Country': 'Japan ', 'Last_Temperature': '15.2', 'Previous_Temperature': '15.0', 'Unit': 'celsius'},
+    {'Country': 'Atlantis', 'Last_Temperature': '9.9', 'Previous_Temperature': '9.8', 'Unit': 'celsius'},
+]
+
+
+def test_country_index_normalizes_names_and_aliases():
+    assert region_for_country('Ivory Coast') == 'EMEA'
+    assert region_for_country("Côte d'Ivoire") == 'EMEA'
+    assert region_for_country('  united   STATES ') == 'Americas'
+    assert region_for_country('Saint Lucia') == 'Americas'
+    assert region_for_country('Atlantis') is None
+
+
+def test_assign_regions_keeps_unmatched_rows():
+    df = assign_regions(ROWS)
+
+    assert len(df) == len(ROWS)
+    assert list(df['Region'].iloc[:3]) == ['Americas', 'EMEA', 'Asia']
+    assert df['Region'].isna().iloc[3]
+    assert isinstance(df['Region'].dtype, pd.CategoricalDtype)
+
+
+def test_export_by_region_writes_each_region_once_and_reports_unmatched():
+    with tempfile.TemporaryDirectory() as output_dir:
+        written, unmatched = export_by_region(ROWS, output_dir)
+
+        assert unmatched == ['Atlantis']
+        assert {region: count for region, (path, count) in written.items()} == {'Americas': 1, 'EMEA': 1, 'Asia': 1}
+        emea = pd.read_csv(os.path.join(output_dir, 'emea_temperature_data.csv'))
+        assert list(emea.columns) == ['Country', 'Last_Temperature', 'Previous_Temperature', 'Unit']
+        assert emea['Country'].tolist() == ["Côte d'Ivoire"]
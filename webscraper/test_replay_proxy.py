@@ -0,0 +1,58 @@
+import shutil
+import ssl
+import tempfile
+import urllib.error
+import urllib.request
+
+import pytest
+
+from .fixture_server import serve_directory
+from .replay_proxy import ArchiveError, Archive, request_key, run_proxy
+
+
+def open_via(proxy, url, context=None):
+    handlers = [urllib.request.ProxyHandler({'http': f"http://{proxy.address}", 'https': f"http://{proxy.address}"})]
+    if context is not None:
+        handlers.append(urllib.request.HTTPSHandler(context=context))
+    return urllib.request.build_opener(*handlers).open(url, timeout=10)
+
+
+def test_recorded_responses_are_replayed_without_the_network():
+    with tempfile.TemporaryDirectory() as archive_dir:
+        with serve_directory() as base_url:
+            url = f"{base_url}/temperature.html"
+            with run_proxy(archive_dir, mode='record', https=False) as proxy:
+                with open_via(proxy, url) as response:
+                    live = response.read()
+
+        # The fixture server is gone now; replay must not need it
+        with run_proxy(archive_dir, mode='replay', https=False) as proxy:
+            with open_via(proxy, url) as response:
+                replayed = response.read()
+            with pytest.raises(urllib.error.HTTPError) as error:
+                open_via(proxy, f"{base_url}/not-recorded.html")
+
+    assert replayed == live and b'table-heatmap' in live
+    assert error.value.code == 404
+    assert proxy.missing == [f"GET {base_url}/not-recorded.html"]
+
+
+def test_replay_needs_an_archive():
+    with tempfile.TemporaryDirectory() as archive_dir:
+        with pytest.raises(ArchiveError):
+            with run_proxy(archive_dir, mode='replay', https=False):
+                pass
+
+
+@pytest.mark.skipif(shutil.which('openssl') is None, reason="openssl is needed for the proxy certificate")
+def test_https_is_replayed_through_connect():
+    with tempfile.TemporaryDirectory() as archive_dir:
+        url = 'https://tradingeconomics.example/country-list/temperature'
+        Archive(archive_dir).add(request_key('GET', url), 200, [['Content-Type', 'text/html']], b'<h1>ok</h1>')
+        # Like Chrome with --ignore-certificate-errors
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        with run_proxy(archive_dir, mode='replay') as proxy:
+            with open_via(proxy, url, context) as response:
+                assert response.read() == b'<h1>ok</h1>'
@@ -0,0 +1,145 @@
+import time
+
+import pytest
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from .fixture_server import fixture_page_url, serve_fixture_site
+from .instrumentation import Tracer
+from .pages.homepage import HomePage
+
+
+class SortableDriver:
+    """Table whose content changes when its header is clicked, through the observer script or a plain click."""
+
+    def __init__(self, async_result=None, async_error=None, rerenders=True, script_seconds=0):
+        self.async_result = async_result
+        self.async_error = async_error
+        self.rerenders = rerenders
+        self.script_seconds = script_seconds
+        self.version = 0
+        self.async_clicks = 0
+        self.plain_clicks = 0
+
+    def find_element(self, by, value):
+        return 'element'
+
+    def execute_async_script(self, script, *args):
+        assert script == HomePage.CLICK_AND_WAIT_FOR_TABLE_CHANGE_SCRIPT
+        time.sleep(self.script_seconds)
+        if self.async_error is not None:
+            raise self.async_error
+        self.async_clicks += 1
+        return self.async_result
+
+    def execute_script(self, script, *args):
+        if script == HomePage.TABLE_FINGERPRINT_SCRIPT:
+            return f"fingerprint-{self.version}"
+        self.plain_clicks += 1
+        if self.rerenders:
+            self.version += 1
+
+
+def make_page(driver):
+    page = HomePage(driver, tracer=Tracer())
+    page.RERENDER_TIMEOUT = 0.3
+    page.RERENDER_SETTLE = 0.05
+    return page
+
+
+def click_wait(page):
+    """Wait recorded by the traced click step (the header lookup included)."""
+    return next(span.wait for span in page.tracer.spans if span.name == 'HomePage.click_country_header')
+
+
+def test_observer_script_is_used_when_it_runs():
+    driver = SortableDriver(async_result={'changed': True, 'elapsed': 0.2})
+    page = make_page(driver)
+    page.click_country_header()
+
+    assert (driver.async_clicks, driver.plain_clicks) == (1, 0)
+    assert page.wait_times['click_country_header'] == 0.2
+    assert click_wait(page) >= 0.2
+
+
+def test_failed_script_falls_back_to_fingerprint_polling(capsys):
+    driver = SortableDriver(async_error=JavascriptException("MutationObserver is not defined"))
+    page = make_page(driver)
+    page.click_country_header()
+
+    assert (driver.async_clicks, driver.plain_clicks) == (0, 1)
+    assert page.wait_times['click_country_header'] < page.RERENDER_TIMEOUT
+    assert 'did not change' not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('fake_driver', [
+    SortableDriver(async_result={'changed': False, 'elapsed': 0.3}),
+    SortableDriver(async_error=JavascriptException("MutationObserver is not defined"), rerenders=False),
+], ids=['observer', 'fingerprint'])
+def test_click_that_changes_nothing_is_reported(fake_driver, capsys):
+    make_page(fake_driver).click_country_header()
+    assert 'the table did not change' in capsys.readouterr().out
+
+
+def test_script_timeout_is_counted_as_waiting():
+    driver = SortableDriver(async_error=TimeoutException("script timeout"), script_seconds=0.1)
+    page = make_page(driver)
+    page.click_country_header()
+
+    assert page.wait_times['click_country_header'] >= 0.1
+    assert click_wait(page) >= page.wait_times['click_country_header']
+
+
+class BannerDriver:
+    """The cookie banner shows up on the second poll for the header, the header itself on the third."""
+
+    def __init__(self):
+        self.polls = 0
+        self.banner_clicks = 0
+
+    def find_elements(self, by, value):
+        if (by, value) == HomePage.HEADER_TEXT:
+            self.polls += 1
+            return ['header'] if self.polls >= 3 else []
+        assert (by, value) == HomePage.COOKIE_ACCEPT_BUTTON
+        return [BannerButton(self)] if self.polls >= 1 else []
+
+
+class BannerButton:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def is_displayed(self):
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self.driver.banner_clicks += 1
+
+
+def test_late_cookie_banner_is_accepted_while_waiting_for_the_header():
+    driver = BannerDriver()
+    page = HomePage(driver)
+    page.wait_times['cookie_banner'] = 0.0
+
+    results = [page._header_present_or_accept_banner(driver) for _ in range(3)]
+
+    assert results == [False, False, 'header']
+    assert driver.banner_clicks == 1 and page._cookie_banner_handled
+
+
+def test_sort_waits_for_the_async_rerender(driver):
+    # The fixture page re-renders the sorted rows on a timer, 50 ms after the click
+    with serve_fixture_site() as base_url:
+        page = HomePage(driver)
+        page.url = fixture_page_url(base_url, 2000)
+        page.load()
+        page.click_country_header()
+        ascending = [row['Country'] for row in page.extract_table_data(use_cache=False)]
+        page.click_country_header()
+        descending = [row['Country'] for row in page.extract_table_data(use_cache=False)]
+
+    assert ascending == sorted(ascending)
+    assert descending == sorted(ascending, reverse=True)
+    assert page.wait_times['click_country_header'] >= 0.05
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+
+from .backends import BackendUnavailable
+from .crawler import crawl_indicators
+from .fakes import FakeClock
+from .pages.homepage import HomePage
+from .scheduler import CircuitOpenError, RequestScheduler, RequestTimeout, TokenBucket
+
+
+def make_scheduler(clock, **kwargs):
+    return RequestScheduler(clock=clock, sleep=clock.sleep, rng=lambda: 1.0, **kwargs)
+
+
+def test_token_bucket_spaces_requests_after_the_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_failures_are_retried_with_growing_backoff():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100, burst=100, retries=3, retry_base=1.0)
+    attempts = []
+
+    def flaky():
+        attempts.append(clock.now)
+        if len(attempts) < 3:
+            raise TimeoutError("header did not appear")
+        return 'ok'
+
+    assert scheduler.run('https://tradingeconomics.com/country-list/gdp', flaky) == 'ok'
+    assert clock.sleeps == [1.0, 2.0]
+    metrics = scheduler.metrics()['tradingeconomics.com']
+    assert (metrics['requests'], metrics['failures'], metrics['retries']) == (3, 2, 2)
+    assert metrics['circuit'] == 'closed'
+
+
+def test_circuit_opens_after_repeated_failures_and_recovers():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100, burst=100, retries=0, failure_threshold=2, reset_timeout=30)
+
+    def down():
+        raise OSError("connection reset")
+
+    for _ in range(2):
+        with pytest.raises(OSError):
+            scheduler.run('http://example.test/a', down)
+    with pytest.raises(CircuitOpenError):
+        scheduler.run('http://example.test/b', lambda: 'not sent')
+
+    clock.now += 30
+    assert scheduler.run('http://example.test/b', lambda: 'trial') == 'trial'
+    metrics = scheduler.metrics()['example.test']
+    assert (metrics['circuit'], metrics['circuit_trips'], metrics['rejected']) == ('closed', 1, 1)
+
+
+def test_concurrency_limit_grows_on_success_and_halves_on_trouble():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100, burst=100, initial_concurrency=4, max_concurrency=8,
+                               retries=0, target_latency=1.0)
+    scheduler.run('http://example.test/', lambda: None)
+    assert scheduler.metrics()['example.test']['concurrency_limit'] == 4
+
+    def slow():
+        clock.now += 5
+    scheduler.run('http://example.test/', slow)
+    assert scheduler.metrics()['example.test']['concurrency_limit'] == 2
+    assert scheduler.metrics()['example.test']['slow'] == 1
+
+
+def test_programming_errors_are_not_retried():
+    scheduler = make_scheduler(FakeClock(), retries=3)
+    with pytest.raises(KeyError):
+        scheduler.run('http://example.test/', lambda: {}['missing'])
+    assert scheduler.metrics()['example.test']['requests'] == 1
+
+
+def test_crawler_retries_jobs_through_the_scheduler():
+    calls = []
+
+    class ThrottledBackend:
+        name = 'throttled'
+
+        def extract(self, url, sort=None, search=None, indicator='temperature', timeout=None):
+            calls.append(indicator)
+            if len(calls) == 1:
+                raise ConnectionResetError("connection reset by peer")
+            return [{'Country': 'Peru', 'Last_Gdp': '1', 'Previous_Gdp': '2', 'Unit': 'USD Billion'}]
+
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100, burst=100)
+    result = crawl_indicators(['gdp'], backends=[ThrottledBackend()], scheduler=scheduler,
+                              url_template='http://example.test/{indicator}')
+
+    assert [job.status for job in result.jobs] == ['ok']
+    assert calls == ['gdp', 'gdp']
+    assert scheduler.metrics()['example.test']['retries'] == 1
+
+
+def test_missing_table_is_not_a_host_failure():
+    calls = []
+
+    class MissingTableBackend:
+        name = 'http'
+
+        def extract(self, url, sort=None, search=None, indicator='temperature', timeout=None):
+            calls.append(indicator)
+            raise BackendUnavailable("HTTP Error 404: Not Found")
+
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100, burst=100, initial_concurrency=2, failure_threshold=1)
+    result = crawl_indicators(['no-such-indicator'], backends=[MissingTableBackend()], scheduler=scheduler,
+                              url_template='http://example.test/{indicator}')
+
+    # Not retried, and the host stays open at full concurrency for the other indicators
+    assert [job.status for job in result.jobs] == ['failed']
+    assert calls == ['no-such-indicator']
+    metrics = scheduler.metrics()['example.test']
+    assert (metrics['circuit'], metrics['concurrency_limit'], metrics['failures']) == ('closed', 2, 0)
+
+
+def test_home_page_refuses_a_request_timeout():
+    # A timed-out load would keep driving the browser from the scheduler's helper thread
+    with pytest.raises(ValueError):
+        HomePage(driver=None, scheduler=RequestScheduler(request_timeout=5))
+    assert HomePage(driver=None, scheduler=RequestScheduler()).scheduler is not None
+
+
+def test_interrupted_trial_keeps_the_circuit_half_open():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100, burst=100, retries=0, failure_threshold=1, reset_timeout=30)
+
+    def down():
+        raise OSError("connection reset")
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(OSError):
+        scheduler.run('http://example.test/', down)
+    clock.now += 30
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.run('http://example.test/', interrupted)
+
+    # Neither a success nor a failure: the next request is the trial
+    assert scheduler.metrics()['example.test']['circuit'] == 'half-open'
+    assert scheduler.run('http://example.test/', lambda: 'trial') == 'trial'
+    assert scheduler.metrics()['example.test']['circuit'] == 'closed'
+
+
+def test_hung_request_times_out_and_frees_the_host():
+    scheduler = RequestScheduler(rate=100, burst=100, initial_concurrency=1, retries=0, request_timeout=0.2)
+    hung = threading.Event()
+    try:
+        start = time.monotonic()
+        with pytest.raises(RequestTimeout):
+            scheduler.run('http://example.test/a', hung.wait, 5)
+        # The only slot of the host is free again for the next request
+        assert scheduler.run('http://example.test/b', lambda: 'ok') == 'ok'
+        assert time.monotonic() - start < 1
+    finally:
+        hung.set()
+    metrics = scheduler.metrics()['example.test']
+    assert (metrics['failures'], metrics['successes'], metrics['in_flight']) == (1, 1, 0)
+
+
+def test_counters_are_exact_under_concurrent_requests():
+    scheduler = RequestScheduler(rate=10000, burst=10000, initial_concurrency=8, max_concurrency=8)
+
+    def worker():
+        for _ in range(200):
+            scheduler.run('http://example.test/', lambda: None)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    metrics = scheduler.metrics()['example.test']
+    assert metrics['requests'] == metrics['successes'] == 1600
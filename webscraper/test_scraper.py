@@ -11,16 +11,19 @@ from .pages.homepage import HomePage
 from selenium.webdriver.chrome.options import Options
 from selenium import webdriver
 from .constants import REGION_MAP
+from .regions import export_by_region
+from .normalize import normalize_batch
 # -----------------------------
 
 # Define base directory for test results and the current day's subdirectory
 TEST_RESULTS_BASE_DIR = "test_results"
 CURRENT_DAY_DIR = datetime.datetime.now().strftime("%Y-%m-%d")
-CURRENT_DAY_RESULTS_DIR = os.path.join(TEST_RESULTS_BASE_DIR, CURRENT_DAY_DIR)
+# Parallel workers (run_pytest.py --workers) write to their own directory, merged after the run
+CURRENT_DAY_RESULTS_DIR = os.environ.get("SCRAPER_OUTPUT_DIR") or os.path.join(TEST_RESULTS_BASE_DIR, CURRENT_DAY_DIR)
 
-def test_page_header_loads_correctly(driver):
+def test_page_header_loads_correctly(driver, page_cache):
     """Positive test case: Verify the main header text is correct."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 1: Positive Flow (Header Assertion)")
     expected_text = "AVERAGE TEMPERATURE BY COUNTRY"
@@ -32,31 +35,27 @@ def test_page_header_loads_correctly(driver):
     assert expected_text in actual_text.upper(), f"Header text assertion failed. Expected '{expected_text}' to be in '{actual_text}'."
     print(f"PASS: Header assertion successful. Found: {actual_text}")
 
-def test_sort_by_country_ascending(driver):
+def test_sort_by_country_ascending(driver, page_cache):
     """Positive test case: Verify that clicking the 'Country' header sorts the table."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 2: Positive Flow (Sort by Country)")
     
     # 1. Click the 'Country' header to sort the table
     home_page.click_country_header()
+    print(f"Table re-rendered after {home_page.wait_times['click_country_header']:.2f}s")
     
-    # 2. Scrape the data again after sorting
-    scraped_data = home_page.extract_table_data()
-    
-    # 3. Extract the country names from the scraped data
-    country_names = [row['Country'] for row in scraped_data]
+    # 2. Check the order inside the page; only the verdict and offending rows come back
+    verdict = home_page.check_table(sorted_by='Country')
     
-    # 4. Create a sorted version of the country names
-    sorted_country_names = sorted(country_names)
-    
-    # 5. Assert that the scraped country names are already sorted
-    assert country_names == sorted_country_names, "Assertion failed: Countries are not sorted in ascending order."
+    # 3. Assert that the country names are sorted
+    assert verdict['ok'], \
+        f"Assertion failed: Countries are not sorted in ascending order: {verdict['checks']['sorted_by']['offenders']}"
     print("PASS: Country sorting assertion successful.")
 
-def test_scrape_and_export_data(driver):
+def test_scrape_and_export_data(driver, page_cache):
     """Main scraping and export function, includes data quality assertions."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 3: Data Scraping and Export")
     
@@ -86,9 +85,9 @@ def test_scrape_and_export_data(driver):
     # Final Assertion: Verify the CSV file was created
     assert os.path.exists(output_filename), f"Assertion failed: CSV file '{output_filename}' was not created."
 
-def test_scrape_and_export_by_region(driver):
+def test_scrape_and_export_by_region(driver, page_cache):
     """Scrapes data and exports it into separate CSV files for each region."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 4: Data Scraping and Export by Region")
 
@@ -99,29 +98,20 @@ def test_scrape_and_export_by_region(driver):
     scraped_data = home_page.extract_table_data()
     assert len(scraped_data) > 10, "Assertion failed: Did not scrape at least 10 rows."
 
-    # 2. Segregate data by region
-    regional_data = {'Americas': [], 'EMEA': [], 'Asia': []}
-    for row in scraped_data:
-        country = row['Country']
-        for region, countries in REGION_MAP.items():
-            if country in countries:
-                regional_data[region].append(row)
-                break
-    
-    # 3. Export to CSV for each region
-    for region, data in regional_data.items():
-        if data:
-            output_filename = os.path.join(CURRENT_DAY_RESULTS_DIR, f"{region.lower()}_temperature_data.csv")
-            if os.path.exists(output_filename):
-                os.remove(output_filename)
-            
-            home_page.export_to_csv(data, output_filename)
-            assert os.path.exists(output_filename), f"Assertion failed: CSV file '{output_filename}' was not created."
-            print(f"Successfully exported {len(data)} rows to {output_filename}")
-
-def test_verify_specific_country_data(driver):
+    # 2. Map every row to its region and write one CSV per region in a single pass
+    written, unmatched = export_by_region(scraped_data, CURRENT_DAY_RESULTS_DIR)
+    
+    # 3. Verify a CSV was written for each region
+    assert set(written) == set(REGION_MAP), f"Assertion failed: Missing regional exports, got {sorted(written)}."
+    for region, (output_filename, row_count) in written.items():
+        assert os.path.exists(output_filename), f"Assertion failed: CSV file '{output_filename}' was not created."
+        print(f"Successfully exported {row_count} rows to {output_filename}")
+    if unmatched:
+        print(f"Countries without a region: {unmatched}")
+
+def test_verify_specific_country_data(driver, page_cache):
     """Test case: Verify specific country's data is present and not empty."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 5: Verify Specific Country Data")
     
@@ -136,29 +126,22 @@ def test_verify_specific_country_data(driver):
     
     print("PASS: Specific country data for 'United States' verified successfully.")
 
-def test_sort_by_temperature_descending(driver):
+def test_sort_by_temperature_descending(driver, page_cache):
     """Test case: Verify sorting by 'Last Temperature' in ascending order after one click."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 6: Sort by Temperature Ascending (Single Click)")
     
     # Click 'Last' temperature header once for ascending sort
     home_page.click_last_temperature_header() 
+    print(f"Table re-rendered after {home_page.wait_times['click_last_temperature_header']:.2f}s")
     
-    scraped_data = home_page.extract_table_data()
-    
-    temperatures = []
-    for row in scraped_data:
-        try:
-            temp_str = row['Last_Temperature'].replace(',', '').strip()
-            if temp_str:
-                temperatures.append(float(temp_str))
-        except ValueError:
-            continue 
+    # Checked inside the page: numbers as displayed, blank or unparseable cells skipped
+    verdict = home_page.check_table(sorted_by='Last_Temperature', descending=True)
 
     # Assert that temperatures are in descending order
-    assert all(temperatures[i] >= temperatures[i+1] for i in range(len(temperatures)-1)), \
-        "Assertion failed: Temperatures are not sorted in descending order."
+    assert verdict['ok'], \
+        f"Assertion failed: Temperatures are not sorted in descending order: {verdict['checks']['sorted_by']['offenders']}"
     print("PASS: Temperature sorting (ascending) assertion successful.")
 
 # def test_search_non_existent_country(driver):
@@ -178,6 +161,7 @@ def test_sort_by_temperature_descending(driver):
 
 def test_search_non_existent_country_table_unchanged(driver):
     """Negative test case: Verify table content remains unchanged after searching for a non-existent country."""
+    # Deliberately not using page_cache: both scrapes must come from the same live page
     home_page = HomePage(driver)
     home_page.load()
     print("\nRunning Test 7 (New): Search Non-Existent Country (Table Unchanged)")
@@ -196,9 +180,9 @@ def test_search_non_existent_country_table_unchanged(driver):
         f"Assertion failed: Table content changed unexpectedly after searching for non-existent country '{non_existent_country}'."
     print(f"PASS: Table content remained unchanged after searching for non-existent country '{non_existent_country}'.")
 
-def test_temperature_values_are_numeric(driver):
+def test_temperature_values_are_numeric(driver, page_cache):
     """Test case: Verify 'Last_Temperature' and 'Previous_Temperature' values are numeric."""
-    home_page = HomePage(driver)
+    home_page = HomePage(driver, cache=page_cache)
     home_page.load()
     print("\nRunning Test 8: Temperature Values Are Numeric")
     
@@ -206,22 +190,10 @@ def test_temperature_values_are_numeric(driver):
     
     assert len(scraped_data) > 0, "Assertion failed: No data scraped to validate."
     
-    for row in scraped_data:
-        last_temp_str = row.get('Last_Temperature', '').replace(',', '').strip()
-        prev_temp_str = row.get('Previous_Temperature', '').replace(',', '').strip()
-        
-        # Check Last_Temperature
-        if last_temp_str: # Only check if not empty
-            try:
-                float(last_temp_str)
-            except ValueError:
-                assert False, f"Assertion failed: Last_Temperature '{last_temp_str}' for '{row['Country']}' is not numeric."
-        
-        # Check Previous_Temperature
-        if prev_temp_str: # Only check if not empty
-            try:
-                float(prev_temp_str)
-            except ValueError:
-                assert False, f"Assertion failed: Previous_Temperature '{prev_temp_str}' for '{row['Country']}' is not numeric."
-                
+    # Empty cells are allowed; anything else that does not parse is reported
+    batch = normalize_batch(scraped_data)
+    assert not batch.invalid, \
+        "Assertion failed: non-numeric temperatures: " + \
+        ", ".join(f"{reject['column']} '{reject['value']}' for '{reject['Country']}'" for reject in batch.invalid)
+    
     print("PASS: All scraped 'Last_Temperature' and 'Previous_Temperature' values are numeric.")
\ No newline at end of file
@@ -0,0 +1,109 @@
+import csv
+import os
+import tempfile
+
+from .browser_pool import worker_id
+from .generate_html_report import aggregate
+from .sharding import collect_tests, merge_worker_outputs, prepare_worker_dir, run_shards, shard_tests
+from .test_generate_html_report import write_junit
+
+
+def test_shards_are_balanced_by_duration():
+    node_ids = [f"test_scraper.py::test_{name}" for name in 'abcdef']
+    durations = {'test_a': 10.0, 'test_b': 6.0, 'test_c': 4.0, 'test_d': 1.0}
+
+    shards = shard_tests(node_ids, 2, durations)
+
+    loads = [sum(durations.get(node_id.split('::')[1], 5.25) for node_id in shard) for shard in shards]
+    assert sorted(node_id for shard in shards for node_id in shard) == node_ids
+    assert abs(loads[0] - loads[1]) <= 1.0
+    # Collection order is kept within a shard
+    assert all(shard == sorted(shard) for shard in shards)
+    assert len(shard_tests(node_ids[:1], 4)) == 1
+
+
+def write_worker_outputs(run_dir, outputs):
+    """Fakes what each worker's pytest process writes: {worker: (test name, scraped country)}."""
+    for worker, (test, country) in outputs.items():
+        worker_dir = prepare_worker_dir(run_dir, worker)
+        write_junit(os.path.join(worker_dir, 'test_report.xml'), [(test, 1.0, 'pass')])
+        with open(os.path.join(worker_dir, 'scraped_temperature_data.csv'), 'w') as f:
+            f.write(f"Country,Last_Temperature\n{country},1.0\n")
+        with open(os.path.join(worker_dir, f"{test}.png"), 'wb') as f:
+            f.write(b'png')
+        with open(os.path.join(worker_dir, 'trace.jsonl'), 'w') as f:
+            f.write('{"name": "%s"}\n' % test)
+    return list(outputs)
+
+
+def test_worker_outputs_are_merged_into_the_run_directory():
+    with tempfile.TemporaryDirectory() as run_dir:
+        workers = write_worker_outputs(run_dir, {'gw0': ('test_a', 'Peru'), 'gw1': ('test_b', 'Chile')})
+
+        merged = merge_worker_outputs(run_dir, workers)
+        stats, runs, cases = aggregate([run_dir])
+        with open(os.path.join(run_dir, 'scraped_temperature_data.csv')) as f:
+            rows = list(csv.DictReader(f))
+        with open(os.path.join(run_dir, 'trace.jsonl')) as f:
+            traces = f.read().splitlines()
+        screenshots = sorted(name for name in os.listdir(run_dir) if name.endswith('.png'))
+
+    assert merged == os.path.join(run_dir, 'test_report.xml')
+    # The worker copies are not counted a second time
+    assert (len(runs), cases) == (1, 2)
+    assert [row['Country'] for row in rows] == ['Peru', 'Chile']
+    assert len(traces) == 2
+    assert screenshots == ['test_a.png', 'test_b.png']
+
+
+def test_second_run_on_the_same_day_merges_only_its_own_workers():
+    with tempfile.TemporaryDirectory() as run_dir:
+        merge_worker_outputs(run_dir, write_worker_outputs(
+            run_dir, {'gw0': ('test_a', 'Peru'), 'gw1': ('test_b', 'Chile')}))
+        # Fewer shards the second time: gw0 is emptied and rewritten, gw1 is left over
+        workers = write_worker_outputs(run_dir, {'gw0': ('test_c', 'Fiji')})
+        assert 'test_a.png' not in os.listdir(os.path.join(run_dir, 'workers', 'gw0'))
+
+        merge_worker_outputs(run_dir, workers)
+        stats, runs, cases = aggregate([os.path.join(run_dir, 'test_report.xml')])
+        with open(os.path.join(run_dir, 'scraped_temperature_data.csv')) as f:
+            rows = list(csv.DictReader(f))
+
+    assert cases == 1 and [key.rsplit('::', 1)[-1] for key in stats] == ['test_c']
+    assert [row['Country'] for row in rows] == ['Fiji']
+
+
+def test_sharded_run_from_another_directory(tmp_path, monkeypatch):
+    # A tiny project whose conftest, like ours, defines --trace-file
+    project = tmp_path / 'project'
+    (project / 'tests').mkdir(parents=True)
+    (project / 'conftest.py').write_text(
+        "def pytest_addoption(parser):\n"
+        "    parser.addoption('--trace-file', default=None)\n")
+    (project / 'tests' / 'test_tiny.py').write_text(
+        "import os\n"
+        "def test_one():\n    assert os.environ['SCRAPER_WORKER']\n"
+        "def test_two():\n    pass\n"
+        "def test_three():\n    pass\n")
+    # Started from the parent directory, as the baseline run_pytest.py is
+    monkeypatch.chdir(tmp_path)
+    run_dir = os.path.join('results', 'today')
+
+    node_ids = collect_tests([os.path.join('project', 'tests', 'test_tiny.py')], rootdir=project)
+    shards = shard_tests(node_ids, 2)
+    exit_codes = run_shards(shards, run_dir, rootdir=project)
+    merged = merge_worker_outputs(run_dir, list(exit_codes))
+
+    assert node_ids == [f"tests/test_tiny.py::test_{name}" for name in ('one', 'two', 'three')]
+    assert exit_codes == {'gw0': 0, 'gw1': 0}
+    stats, runs, cases = aggregate([merged])
+    assert cases == 3
+    assert os.path.exists(os.path.join(run_dir, 'trace.jsonl'))
+
+
+def test_worker_id_prefers_the_shard_name(monkeypatch):
+    monkeypatch.delenv('PYTEST_XDIST_WORKER', raising=False)
+    monkeypatch.delenv('SCRAPER_WORKER', raising=False)
+    assert worker_id() == 'main'
+    monkeypatch.setenv('SCRAPER_WORKER', 'gw3')
+    assert worker_id() == 'gw3'
@@ -0,0 +1,65 @@
+import csv
+import os
+import tempfile
+
+from selenium.common.exceptions import JavascriptException
+
+from .exporters import write_csv_chunks
+from .pages.homepage import HomePage
+
+TABLE = [[f"Country {i}", f"{i}.5", f"{i}.0", "celsius"] for i in range(10)]
+
+
+class ScriptTableDriver:
+    """Answers HomePage's extraction script from an in-memory table."""
+
+    def __init__(self, fail_after_calls=None):
+        self.calls = []
+        self.fail_after_calls = fail_after_calls
+
+    def find_element(self, by, value):
+        return 'table'
+
+    def execute_script(self, script, table, start, end):
+        if self.fail_after_calls is not None and len(self.calls) >= self.fail_after_calls:
+            raise JavascriptException("script blocked")
+        self.calls.append((start, end))
+        stop = len(TABLE) if end is None else min(end, len(TABLE))
+        return {'rows': TABLE[start:stop], 'total': len(TABLE)}
+
+
+def test_batches_are_read_one_script_call_each():
+    driver = ScriptTableDriver()
+    batches = list(HomePage(driver).iter_table_batches(batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert driver.calls == [(0, 4), (4, 8), (8, 12)]
+    assert batches[2][-1] == {'Country': 'Country 9', 'Last_Temperature': '9.5',
+                              'Previous_Temperature': '9.0', 'Unit': 'celsius'}
+
+
+def test_list_api_reads_the_whole_table_in_one_call():
+    driver = ScriptTableDriver()
+    assert len(HomePage(driver).extract_table_data()) == 10
+    assert driver.calls == [(0, None)]
+
+
+def test_script_failure_resumes_per_element_after_last_batch():
+    driver = ScriptTableDriver(fail_after_calls=1)
+    page = HomePage(driver)
+    resumed_from = []
+    page._iter_rows_by_element = lambda table, start=0: resumed_from.append(start) or iter([])
+
+    assert [len(batch) for batch in page.iter_table_batches(batch_size=4)] == [4]
+    assert resumed_from == [4]
+
+
+def test_chunked_csv_writer_consumes_a_generator():
+    rows = ({'Country': f"Country {i}", 'Last_Temperature': str(i)} for i in range(2500))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'stream.csv')
+        assert write_csv_chunks(rows, filename, chunk_size=1000) == 2500
+        with open(filename, newline='') as f:
+            written = list(csv.DictReader(f))
+    assert len(written) == 2500
+    assert written[-1] == {'Country': 'Country 2499', 'Last_Temperature': '2499'}
@@ -0,0 +1,87 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from .pages.homepage import HomePage
+from .table_checks import build_checks, check_rows
+
+ROWS = [
+    {'Country': 'Chile', 'Last_Temperature': '1,020.5', 'Previous_Temperature': '9.1', 'Unit': 'celsius'},
+    {'Country': 'Peru', 'Last_Temperature': '', 'Previous_Temperature': '19.1', 'Unit': 'celsius'},
+    {'Country': 'Japan', 'Last_Temperature': '−3', 'Previous_Temperature': '4.0', 'Unit': 'celsius'},
+    {'Country': 'Spain', 'Last_Temperature': '12.5', 'Previous_Temperature': '11.0', 'Unit': 'celsius'},
+]
+CHECKS = [
+    build_checks(sorted_by='Country'),
+    build_checks(sorted_by='Last_Temperature', descending=True, min_rows=5),
+    build_checks(sorted_by='Previous_Temperature', contains=('Country', 'Japan'), min_rows=4),
+    build_checks(contains=('Country', 'Atlantis'), max_offenders=1),
+]
+
+
+class ProjectingDriver:
+    """Answers the extraction script, honouring the optional field list."""
+
+    def __init__(self):
+        self.calls = []
+
+    def find_element(self, by, value):
+        return 'table'
+
+    def execute_script(self, script, table, start, end, fields=None):
+        self.calls.append(fields)
+        rows = [[row['Country'], row['Last_Temperature'], row['Previous_Temperature'], row['Unit']] for row in ROWS]
+        if fields is not None:
+            rows = [[row[field] for field in fields] for row in rows]
+        return {'rows': rows, 'total': len(rows)}
+
+
+def test_verdicts_carry_only_offending_rows():
+    sort_by_country, sort_by_last, sort_by_previous, missing = (check_rows(ROWS, checks) for checks in CHECKS)
+
+    assert not sort_by_country['ok']
+    assert sort_by_country['checks']['sorted_by']['offenders'] == [{'row': 2, 'previous': 'Peru', 'value': 'Japan'}]
+    # The blank cell is skipped; -3 is followed by 12.5
+    assert sort_by_last['checks']['sorted_by']['offenders'] == [{'row': 3, 'previous': '−3', 'value': '12.5'}]
+    assert not sort_by_last['checks']['min_rows']['ok']
+    assert sort_by_previous['checks']['contains'] == {'ok': True, 'column': 'Country', 'value': 'Japan', 'row': 2}
+    assert not sort_by_previous['ok']
+    assert missing == {'ok': False, 'rows': 4, 'checks': {
+        'contains': {'ok': False, 'column': 'Country', 'value': 'Atlantis', 'row': None}}}
+
+
+def test_projection_reads_only_the_requested_columns():
+    driver = ProjectingDriver()
+    page = HomePage(driver)
+
+    assert page.extract_table_data(columns=['Country'])[2] == {'Country': 'Japan'}
+    assert page.extract_table_data(columns=['Last_Temperature', 'Country'])[0] == \
+        {'Last_Temperature': '1,020.5', 'Country': 'Chile'}
+    assert driver.calls == [[0], [1, 0]]
+    with pytest.raises(ValueError):
+        page.extract_table_data(columns=['Population'])
+
+
+FAKE_DOM = """
+function cell(text) { return {innerText: text, getClientRects: function () { return [1]; }}; }
+function row(values) {
+    var cells = [values[0], values[1], values[2], 'Dec/24', values[3]].map(cell);
+    cells[0].querySelector = function () { return cell(values[0]); };
+    return {querySelectorAll: function () { return cells; }};
+}
+var table = {querySelectorAll: function () { return ROWS.map(row); }};
+"""
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is needed to run the page script")
+def test_page_script_agrees_with_python_checks():
+    rows = [[row['Country'], row['Last_Temperature'], row['Previous_Temperature'], row['Unit']] for row in ROWS]
+    fields = {'Country': 0, 'Last_Temperature': 1, 'Previous_Temperature': 2, 'Unit': 3}
+    code = f"var ROWS = {json.dumps(rows)};" + FAKE_DOM + "".join(
+        f"console.log(JSON.stringify((function () {{ {HomePage.CHECK_TABLE_SCRIPT} }})"
+        f".apply(null, [table, {json.dumps(checks)}, {json.dumps(fields)}])));"
+        for checks in CHECKS)
+    output = subprocess.run(['node', '-e', code], capture_output=True, text=True, check=True).stdout
+    assert [json.loads(line) for line in output.splitlines()] == [check_rows(ROWS, checks) for checks in CHECKS]
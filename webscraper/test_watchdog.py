@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from .browser_pool import BrowserPool
+from .test_browser_pool import FakeDriver
+from .watchdog import BrowserWatchdog, ResourceLimits, _proc_tree, sample_process_tree
+
+
+class FakeService:
+    def __init__(self, pid):
+        self.process = type('Process', (), {'pid': pid})()
+
+
+class PagedDriver(FakeDriver):
+    """FakeDriver whose navigation goes through execute(), like a real WebDriver."""
+
+    def __init__(self):
+        super().__init__()
+        self.service = FakeService(4242)
+
+    def execute(self, driver_command, params=None):
+        if driver_command == 'get':
+            self.visited.append(params['url'])
+
+    def get(self, url):
+        self.execute('get', {'url': url})
+
+
+def fake_sampler(samples):
+    return lambda pid: samples.pop(0) if samples else None
+
+
+def test_sample_process_tree_includes_children():
+    child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'])
+    try:
+        sample = sample_process_tree(os.getpid())
+        assert sample['processes'] >= 2
+        assert sample['rss'] > 0 and sample['handles'] > 0
+        if os.path.isdir('/proc'):
+            assert _proc_tree(os.getpid())['processes'] >= 2
+    finally:
+        child.kill()
+        child.wait()
+    assert sample_process_tree(None) is None
+
+
+def test_page_limit_moves_session_to_a_fresh_driver():
+    watchdog = BrowserWatchdog(ResourceLimits(max_rss_mb=None, max_pages=2), sampler=fake_sampler([]))
+    pool = BrowserPool(PagedDriver, watchdog=watchdog)
+
+    driver = pool.lease()
+    driver.get('https://example.com/a')
+    report = pool.release(driver)
+    assert report['pages'] == 1 and report['recycle'] is None
+    # The reset to about:blank does not count as a page
+    assert pool.lease() is driver
+    driver.get('https://example.com/b')
+    report = pool.release(driver)
+
+    assert report['pages'] == 2 and 'pages' in report['recycle']
+    assert driver.quit_called
+    replacement = pool.lease()
+    assert replacement is not driver
+    assert pool.created == 2 and watchdog.recycled == 1
+
+
+def test_memory_limit_and_cpu_percent():
+    samples = [{'processes': 3, 'rss': 500 * 2 ** 20, 'cpu_seconds': 1.0, 'handles': 80},
+               {'processes': 4, 'rss': 900 * 2 ** 20, 'cpu_seconds': 3.0, 'handles': 95}]
+    times = [10.0, 14.0]
+    watchdog = BrowserWatchdog(ResourceLimits(max_rss_mb=800), sampler=fake_sampler(samples),
+                               clock=lambda: times.pop(0))
+    pool = BrowserPool(PagedDriver, watchdog=watchdog)
+
+    driver = pool.lease()
+    first = pool.release(driver)
+    assert first['rss_mb'] == 500.0 and first['cpu_percent'] is None and first['recycle'] is None
+    second = pool.release(pool.lease())
+    assert second['cpu_percent'] == pytest.approx(50.0)
+    assert second['recycle'] == 'RSS 900.0 MB (limit 800 MB)'
+    assert driver.quit_called and pool.recycled == 1
@@ -0,0 +1,183 @@
+"""
+Resource watchdog for long-lived browser sessions.
+
+Between page operations (whenever a BrowserPool driver is released) the
+watchdog samples the chromedriver process and everything it started
+(browser, renderers, GPU and utility processes): total RSS, CPU time and
+open file handles. A driver that crosses one of the configured limits, or
+has loaded `max_pages` pages, is quit by the pool and the next lease gets a
+fresh browser, so callers never notice the switch.
+
+Sampling uses psutil when it is installed and reads /proc otherwise (Linux).
+Where neither works only the page limit applies.
+
+Usage:
+    watchdog = BrowserWatchdog(ResourceLimits(max_rss_mb=1500, max_pages=300))
+    pool = BrowserPool(create_driver, watchdog=watchdog)
+    ...
+    watchdog.reports[-1]   # {'pages': 12, 'rss_mb': 812.4, 'cpu_percent': 35.0, 'handles': 214, 'recycle': None, ...}
+"""
+from collections import deque
+import os
+import time
+
+try:
+    import psutil
+except ImportError:  # optional dependency
+    psutil = None
+
+# Reports kept in memory (one per release)
+MAX_REPORTS = 1000
+
+
+class ResourceLimits:
+    """Thresholds for recycling a driver; None disables a limit."""
+
+    def __init__(self, max_rss_mb=1500, max_handles=None, max_cpu_percent=None, max_pages=500):
+        self.max_rss_mb = max_rss_mb
+        self.max_handles = max_handles
+        self.max_cpu_percent = max_cpu_percent
+        self.max_pages = max_pages
+
+
+def driver_pid(driver):
+    """PID of the chromedriver process behind `driver`, or None for remote/unknown drivers."""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return getattr(process, 'pid', None)
+
+
+def _psutil_tree(pid):
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+    sample = {'processes': 0, 'rss': 0, 'cpu_seconds': 0.0, 'handles': 0}
+    for process in processes:
+        try:
+            with process.oneshot():
+                sample['rss'] += process.memory_info().rss
+                cpu = process.cpu_times()
+                sample['cpu_seconds'] += cpu.user + cpu.system
+                sample['handles'] += process.num_fds() if hasattr(process, 'num_fds') else process.num_handles()
+            sample['processes'] += 1
+        except psutil.Error:
+            # Renderers come and go; skip the ones that exited mid-sample
+            continue
+    return sample
+
+
+def _proc_children():
+    """Parent PID -> child PIDs, from /proc/<pid>/stat."""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; fields after ')' are fixed
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def _proc_tree(pid):
+    if not os.path.exists(f'/proc/{pid}'):
+        return None
+    children = _proc_children()
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    ticks = os.sysconf('SC_CLK_TCK')
+    sample = {'processes': 0, 'rss': 0, 'cpu_seconds': 0.0, 'handles': 0}
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        pending.extend(children.get(current, ()))
+        try:
+            with open(f'/proc/{current}/statm') as f:
+                sample['rss'] += int(f.read().split()[1]) * page_size
+            with open(f'/proc/{current}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            # utime and stime are fields 14 and 15 of stat, i.e. 11 and 12 after the name
+            sample['cpu_seconds'] += (int(fields[11]) + int(fields[12])) / ticks
+        except (OSError, IndexError, ValueError):
+            continue
+        try:
+            sample['handles'] += len(os.listdir(f'/proc/{current}/fd'))
+        except OSError:
+            pass
+        sample['processes'] += 1
+    return sample
+
+
+def sample_process_tree(pid):
+    """{'processes', 'rss' (bytes), 'cpu_seconds', 'handles'} summed over `pid` and its descendants, or None."""
+    if pid is None:
+        return None
+    if psutil is not None:
+        return _psutil_tree(pid)
+    if os.path.isdir('/proc'):
+        return _proc_tree(pid)
+    return None
+
+
+class BrowserWatchdog:
+    """Counts pages per driver, samples its process tree and decides when to recycle it."""
+
+    def __init__(self, limits=None, sampler=sample_process_tree, clock=time.monotonic):
+        self.limits = limits or ResourceLimits()
+        self.sampler = sampler
+        self.clock = clock
+        self.recycled = 0
+        self.reports = deque(maxlen=MAX_REPORTS)
+        self._drivers = {}
+
+    def watch(self, driver):
+        """Starts counting page loads of a new driver."""
+        state = {'pages': 0, 'cpu_seconds': None, 'sampled_at': None}
+        self._drivers[id(driver)] = state
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            # The pool's own reset to about:blank is not a page
+            if driver_command == 'get' and (params or {}).get('url') != 'about:blank':
+                state['pages'] += 1
+            return original_execute(driver_command, params)
+
+        driver.execute = execute
+        return driver
+
+    def forget(self, driver):
+        self._drivers.pop(id(driver), None)
+
+    def check(self, driver):
+        """Samples the driver and returns its report; report['recycle'] names the limit crossed, if any."""
+        state = self._drivers.get(id(driver))
+        if state is None:
+            state = self._drivers[id(driver)] = {'pages': 0, 'cpu_seconds': None, 'sampled_at': None}
+        now = self.clock()
+        sample = self.sampler(driver_pid(driver))
+        report = {'pages': state['pages'], 'processes': None, 'rss_mb': None,
+                  'cpu_seconds': None, 'cpu_percent': None, 'handles': None, 'recycle': None}
+        if sample is not None:
+            report.update(processes=sample['processes'], rss_mb=round(sample['rss'] / 2 ** 20, 1),
+                          cpu_seconds=round(sample['cpu_seconds'], 2), handles=sample['handles'])
+            if state['cpu_seconds'] is not None and now > state['sampled_at']:
+                busy = sample['cpu_seconds'] - state['cpu_seconds']
+                report['cpu_percent'] = round(100 * busy / (now - state['sampled_at']), 1)
+            state['cpu_seconds'], state['sampled_at'] = sample['cpu_seconds'], now
+
+        limits = self.limits
+        if limits.max_pages is not None and report['pages'] >= limits.max_pages:
+            report['recycle'] = f"{report['pages']} pages loaded (limit {limits.max_pages})"
+        elif limits.max_rss_mb is not None and (report['rss_mb'] or 0) > limits.max_rss_mb:
+            report['recycle'] = f"RSS {report['rss_mb']} MB (limit {limits.max_rss_mb} MB)"
+        elif limits.max_handles is not None and (report['handles'] or 0) > limits.max_handles:
+            report['recycle'] = f"{report['handles']} open handles (limit {limits.max_handles})"
+        elif limits.max_cpu_percent is not None and (report['cpu_percent'] or 0) > limits.max_cpu_percent:
+            report['recycle'] = f"CPU {report['cpu_percent']}% (limit {limits.max_cpu_percent}%)"
+        if report['recycle']:
+            self.recycled += 1
+        self.reports.append(report)
+        return report